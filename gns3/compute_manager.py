@@ -19,6 +19,7 @@ from .qt import QtCore
 
 from .compute import Compute
 from .controller import Controller
+from .http_scheduler import HTTPScheduler
 
 import sys
 import copy
@@ -58,12 +59,12 @@ class ComputeManager(QtCore.QObject):
         if self._controller.connected() and datetime.datetime.now().timestamp() - self._last_computes_refresh > 5:
             self._last_computes_refresh = datetime.datetime.now().timestamp()
             self._refreshingComputes = True
-            self._controller.get("/computes", self._listComputesCallback, showProgress=False, timeout=15)
+            self._controller.get("/computes", self._listComputesCallback, showProgress=False, timeout=15, priority=HTTPScheduler.BACKGROUND)
 
     def _controllerConnectedSlot(self):
         if self._controller.connected():
             self._refreshingComputes = True
-            self._controller.get("/computes", self._listComputesCallback, showProgress=False, timeout=15)
+            self._controller.get("/computes", self._listComputesCallback, showProgress=False, timeout=15, priority=HTTPScheduler.BACKGROUND)
 
     def _controllerDisconnectedSlot(self):
         for compute_id in list(self._computes):
@@ -29,6 +29,7 @@ import json
 from .node import Node
 from .qt import QtCore
 from .version import __version__
+from .http_stats import HTTPStats
 
 
 class ConsoleCmd(cmd.Cmd):
@@ -249,6 +250,30 @@ class ConsoleCmd(cmd.Cmd):
                     print("{}: no such device".format(node_name))
                     continue
 
+    def _show_http_stats(self, params):
+        """
+        Handles the 'show http-stats' command.
+
+        :param params: list of parameters
+        """
+
+        stats = HTTPStats.instance()
+        if len(params) == 1:
+            print(stats.format())
+        elif params[1] == "json":
+            print(stats.toJson())
+        elif params[1] == "reset":
+            stats.reset()
+            print("HTTP statistics reset")
+        elif params[1] == "dump" and len(params) == 3:
+            try:
+                stats.dump(params[2])
+                print("HTTP statistics written to {}".format(params[2]))
+            except OSError as e:
+                print("Can't write {}: {}".format(params[2], e))
+        else:
+            print(self.do_show.__doc__)
+
     def do_show(self, args):
         """
         Show detail information about every device in current lab:
@@ -256,6 +281,9 @@ class ConsoleCmd(cmd.Cmd):
 
         Show detail information about a device:
         show device <device_name>
+
+        Show the latency and throughput of the HTTP queries by route:
+        show http-stats [json|reset|dump <path>]
         """
 
         if '?' in args or args.strip() == "":
@@ -265,6 +293,8 @@ class ConsoleCmd(cmd.Cmd):
         params = args.split()
         if params[0] == "device":
             self._show_device(params)
+        elif params[0] == "http-stats":
+            self._show_http_stats(params)
         else:
             print(self.do_show.__doc__)
 
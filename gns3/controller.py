@@ -16,11 +16,11 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 import os
-import hashlib
-import tempfile
 
 from .qt import QtCore, QtGui, QtWidgets, qpartial, qslot
 from .symbol import Symbol
+from .static_cache import StaticCache
+from .http_scheduler import HTTPScheduler
 from .local_server_config import LocalServerConfig
 from .settings import LOCAL_SERVER_SETTINGS
 
@@ -37,11 +37,14 @@ class Controller(QtCore.QObject):
     connection_failed_signal = QtCore.Signal()
     project_list_updated_signal = QtCore.Signal()
 
+    # Delay in milliseconds before writing the index of the static cache
+    STATIC_CACHE_SAVE_DELAY = 1000
+
     def __init__(self, parent=None):
         super().__init__()
         self._connected = False
         self._connecting = False
-        self._cache_directory = tempfile.mkdtemp()
+        self._static_cache = None
         self._http_client = None
         # If it's the first error we display an alert box to the user
         self._first_error = True
@@ -52,6 +55,15 @@ class Controller(QtCore.QObject):
         # If we do multiple call in order to download the same symbol we queue them
         self._static_asset_download_queue = {}
 
+        # Decoded icons, by path of the cached file
+        self._symbol_icons = {}
+
+        # The index of the static cache is written once for a burst of downloads
+        self._static_cache_save_timer = QtCore.QTimer(self)
+        self._static_cache_save_timer.setSingleShot(True)
+        self._static_cache_save_timer.setInterval(self.STATIC_CACHE_SAVE_DELAY)
+        self._static_cache_save_timer.timeout.connect(self.saveStaticCache)
+
     def host(self):
         return self._http_client.host()
 
@@ -85,6 +97,9 @@ class Controller(QtCore.QObject):
         :param http_client: Instance of HTTP client to communicate with the server
         """
         self._http_client = http_client
+        if self._static_cache:
+            # The files could be different on the new controller
+            self._static_cache.clearValidated()
         if self._http_client:
             if self.isRemote():
                 self._http_client.setMaxTimeDifferenceBetweenQueries(120)
@@ -194,9 +209,6 @@ class Controller(QtCore.QObject):
         if self._http_client:
             return self._http_client.createHTTPQuery(method, path, *args, **kwargs)
 
-    def getSynchronous(self, endpoint, timeout=2):
-        return self._http_client.getSynchronous(endpoint, timeout)
-
     @staticmethod
     def instance():
         """
@@ -208,10 +220,33 @@ class Controller(QtCore.QObject):
             Controller._instance = Controller()
         return Controller._instance
 
+    def staticCache(self):
+        """
+        :returns: StaticCache instance, stored in the config directory
+        """
+
+        if self._static_cache is None:
+            from .local_config import LocalConfig
+            directory = os.path.join(LocalConfig.instance().configDirectory(), "cache", "static")
+            self._static_cache = StaticCache(directory)
+        return self._static_cache
+
+    def saveStaticCache(self):
+        """
+        Write the index of the static cache, called after a delay and before exiting.
+        """
+
+        self._static_cache_save_timer.stop()
+        if self._static_cache:
+            self._static_cache.save()
+
     def getStatic(self, url, callback):
         """
         Get a URL from the /static on controller and cache it on disk
 
+        A file cached by a previous session is checked once
+        with the controller before we use it.
+
         :param url: URL without the protocol and host part
         :param callback: Callback to call when file is ready
         """
@@ -219,37 +254,44 @@ class Controller(QtCore.QObject):
         if not self._http_client:
             return
 
-        m = hashlib.md5()
-        m.update(url.encode())
-        if ".svg" in url:
-            extension = ".svg"
-        else:
-            extension = ".png"
-        path = os.path.join(self._cache_directory, m.hexdigest() + extension)
-        if os.path.exists(path):
+        cache = self.staticCache()
+        path = cache.get(url)
+        if path and cache.isValidated(url):
             callback(path)
-        elif path in self._static_asset_download_queue:
-            self._static_asset_download_queue[path].append(callback)
+        elif url in self._static_asset_download_queue:
+            self._static_asset_download_queue[url].append(callback)
         else:
-            self._static_asset_download_queue[path] = [callback]
-            self._http_client.createHTTPQuery("GET", url, qpartial(self._getStaticCallback, url, path))
+            self._static_asset_download_queue[url] = [callback]
+            self._http_client.createHTTPQuery("GET", url, qpartial(self._getStaticCallback, url), headers=cache.validators(url), priority=HTTPScheduler.BACKGROUND)
 
-    def _getStaticCallback(self, url, path, result, error=False, raw_body=None, **kwargs):
+    def _getStaticCallback(self, url, result, error=False, raw_body=None, headers={}, **kwargs):
+        callbacks = self._static_asset_download_queue.pop(url, [])
+        cache = self.staticCache()
+        path = cache.get(url)
         if error:
             log.error("Error while downloading file: {}".format(url))
-            if path in self._static_asset_download_queue:
-                del self._static_asset_download_queue[path]
-            return
-        try:
-            with open(path, "wb+") as f:
-                f.write(raw_body)
-        except OSError as e:
-            log.error("Can't write to {}: {}".format(path, str(e)))
-            return
-        log.debug("File stored {} for {}".format(path, url))
-        for callback in self._static_asset_download_queue[path]:
+            if path is None:
+                return
+            # Better an old symbol than no symbol
+            log.debug("Use the cached file {} for {}".format(path, url))
+        elif not raw_body and path:
+            # Not modified since we cached it
+            cache.setValidated(url)
+        else:
+            if ".svg" in url:
+                extension = ".svg"
+            else:
+                extension = ".png"
+            try:
+                path = cache.store(url, raw_body, etag=headers.get("etag"), last_modified=headers.get("last-modified"), extension=extension)
+            except OSError as e:
+                log.error("Can't write to {}: {}".format(cache.directory(), str(e)))
+                return
+            log.debug("File stored {} for {}".format(path, url))
+        if cache.isDirty() and not self._static_cache_save_timer.isActive():
+            self._static_cache_save_timer.start()
+        for callback in callbacks:
             callback(path)
-        del self._static_asset_download_queue[path]
 
     def getSymbolIcon(self, symbol_id, callback):
         """
@@ -261,8 +303,11 @@ class Controller(QtCore.QObject):
         self.getStatic(Symbol(symbol_id).url(), qpartial(self._getIconCallback, callback))
 
     def _getIconCallback(self, callback, path):
-        icon = QtGui.QIcon()
-        icon.addFile(path)
+        icon = self._symbol_icons.get(path)
+        if icon is None:
+            icon = QtGui.QIcon()
+            icon.addFile(path)
+            self._symbol_icons[path] = icon
         callback(icon)
 
     def deleteProject(self, project_id, callback=None):
@@ -28,6 +28,7 @@ from ..registry.image import Image
 from ..utils import human_filesize
 from ..utils.wait_for_lambda_worker import WaitForLambdaWorker
 from ..utils.progress_dialog import ProgressDialog
+from ..utils.image_search_worker import ImageSearchWorker
 from ..compute_manager import ComputeManager
 from ..controller import Controller
 from ..local_config import LocalConfig
@@ -237,8 +238,16 @@ class ApplianceWizard(QtWidgets.QWizard, Ui_ApplianceWizard):
 
         self.uiFilesWizardPage.setSubTitle("The following versions are available for " + self._appliance["product_name"] + ".  Check the status of files required to install.")
 
-        worker = WaitForLambdaWorker(lambda: self._refreshDialogWorker())
-        progress_dialog = ProgressDialog(worker, "Add appliance", "Scanning directories for files...", None, busy=True, parent=self)
+        # Docker do not have versions
+        if "versions" not in self._appliance:
+            self._refreshing = False
+            return
+
+        images = [image for version in self._appliance["versions"] for image in version["images"].values()]
+        worker = ImageSearchWorker(self._registry, self._appliance.emulator(), images)
+        progress_dialog = ProgressDialog(worker, "Add appliance", "Scanning directories for files...", "Cancel", parent=self)
+        progress_dialog.accepted.connect(qpartial(self._imagesSearchedSlot, worker, images))
+        progress_dialog.canceled.connect(qpartial(self._imagesSearchedSlot, worker, images))
         progress_dialog.show()
 
     @qslot
@@ -305,24 +314,23 @@ class ApplianceWizard(QtWidgets.QWizard, Ui_ApplianceWizard):
             self.uiApplianceVersionTreeWidget.resizeColumnToContents(1)
         self._refreshing = False
 
-    def _refreshDialogWorker(self):
+    def _imagesSearchedSlot(self, worker, images, *args):
         """
-        Scan local directory in order to found the images on disk
+        Called when the scan of the local directories is finished or
+        cancelled, the images not searched are missing
         """
 
-        # Docker do not have versions
-        if "versions" not in self._appliance:
+        if not self._refreshing:
             return
-
-        for version in self._appliance["versions"]:
-            for image in version["images"].values():
-                img = self._registry.search_image_file(self._appliance.emulator(), image["filename"], image.get("md5sum"), image.get("filesize"))
-                if img:
-                    image["status"] = "Found"
-                    image["md5sum"] = img.md5sum
-                    image["filesize"] = img.filesize
-                else:
-                    image["status"] = "Missing"
+        results = worker.results()
+        for i, image in enumerate(images):
+            img = results.get(i)
+            if img:
+                image["status"] = "Found"
+                image["md5sum"] = img.md5sum
+                image["filesize"] = img.filesize
+            else:
+                image["status"] = "Missing"
         self._refreshing = False
         self.versions_changed_signal.emit()
 
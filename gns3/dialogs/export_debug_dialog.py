@@ -26,6 +26,7 @@ from gns3.qt import QtWidgets, QtCore
 from gns3.ui.export_debug_dialog_ui import Ui_ExportDebugDialog
 from gns3.local_config import LocalConfig
 from gns3.controller import Controller
+from gns3.local_server import LocalServer
 
 import logging
 log = logging.getLogger(__name__)
@@ -67,6 +68,8 @@ class ExportDebugDialog(QtWidgets.QDialog, Ui_ExportDebugDialog):
         try:
             with ZipFile(self._path, 'w') as zip:
                 zip.writestr("debug.txt", self._getDebugData())
+                # The last lines written by the local server, the log file doesn't have its crashes
+                zip.writestr("local_server_output.txt", LocalServer.instance().localServerOutput())
                 dir = LocalConfig.instance().configDirectory()
                 for filename in os.listdir(dir):
                     path = os.path.join(dir, filename)
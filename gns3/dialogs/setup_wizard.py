@@ -23,7 +23,6 @@ from gns3.qt import QtCore, QtWidgets, QtGui, QtNetwork, qslot
 from gns3.controller import Controller
 from gns3.local_server import LocalServer
 from gns3.utils.progress_dialog import ProgressDialog
-from gns3.utils.wait_for_connection_worker import WaitForConnectionWorker
 
 from ..settings import DEFAULT_LOCAL_SERVER_HOST
 from ..ui.setup_wizard_ui import Ui_SetupWizard
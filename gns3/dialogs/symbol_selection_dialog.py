@@ -23,11 +23,11 @@ import os
 import pathlib
 
 from ..qt import QtCore, QtGui, QtWidgets, qpartial
-from ..qt.qimage_svg_renderer import QImageSvgRenderer
 from ..ui.symbol_selection_dialog_ui import Ui_SymbolSelectionDialog
 from ..local_server import LocalServer
 from ..controller import Controller
 from ..symbol import Symbol
+from ..symbol_thumbnails import SymbolThumbnails
 
 
 import logging
@@ -67,6 +67,17 @@ class SymbolSelectionDialog(QtWidgets.QDialog, Ui_SymbolSelectionDialog):
         self.uiSymbolListWidget.setFocus()
         self.uiSymbolListWidget.setIconSize(QtCore.QSize(64, 64))
         self._symbol_items = []
+        # Path of a symbol file => items waiting for its thumbnail
+        self._thumbnail_items = {}
+
+        # Only the visible symbols are rendered, once the scrolling or the resizing is finished
+        self._render_timer = QtCore.QTimer(self)
+        self._render_timer.setSingleShot(True)
+        self._render_timer.setInterval(50)
+        self._render_timer.timeout.connect(self._renderVisibleSymbols)
+        self.uiSymbolListWidget.verticalScrollBar().valueChanged.connect(self._scheduleRender)
+        self.uiSymbolListWidget.viewport().installEventFilter(self)
+        SymbolThumbnails.instance().thumbnail_ready_signal.connect(self._thumbnailReadySlot)
 
         Controller.instance().get("/symbols", self._listSymbolsCallback)
 
@@ -76,6 +87,10 @@ class SymbolSelectionDialog(QtWidgets.QDialog, Ui_SymbolSelectionDialog):
             return
 
         self._symbol_items = []
+        image = QtGui.QImage(64, 64, QtGui.QImage.Format_ARGB32)
+        # Set the ARGB to 0 to prevent rendering artifacts
+        image.fill(0x00000000)
+        empty_icon = QtGui.QIcon(QtGui.QPixmap.fromImage(image))
         for symbol in result:
             symbol = Symbol(**symbol)
             name = os.path.splitext(symbol.filename())[0]
@@ -83,24 +98,63 @@ class SymbolSelectionDialog(QtWidgets.QDialog, Ui_SymbolSelectionDialog):
             item.setData(QtCore.Qt.UserRole, symbol)
             self._symbol_items.append(item)
             item.setText(name)
+            item.setIcon(empty_icon)
+        self.adjustSize()
+        self._scheduleRender()
 
-            image = QtGui.QImage(64, 64, QtGui.QImage.Format_ARGB32)
-            # Set the ARGB to 0 to prevent rendering artifacts
-            image.fill(0x00000000)
-            icon = QtGui.QIcon(QtGui.QPixmap.fromImage(image))
-            item.setIcon(icon)
+    def eventFilter(self, watched, event):
+        """
+        Renders the symbols made visible by a resize of the list.
+        """
 
-            def render(item, path):
-                svg_renderer = QImageSvgRenderer(path)
-                image = QtGui.QImage(64, 64, QtGui.QImage.Format_ARGB32)
-                # Set the ARGB to 0 to prevent rendering artifacts
-                image.fill(0x00000000)
-                svg_renderer.render(QtGui.QPainter(image))
-                icon = QtGui.QIcon(QtGui.QPixmap.fromImage(image))
-                item.setIcon(icon)
+        if watched is self.uiSymbolListWidget.viewport() and event.type() in (QtCore.QEvent.Resize, QtCore.QEvent.Show):
+            self._scheduleRender()
+        return super().eventFilter(watched, event)
 
-            Controller.instance().getStatic(symbol.url(), qpartial(render, item))
-        self.adjustSize()
+    def _scheduleRender(self, *args):
+
+        self._render_timer.start()
+
+    def _renderVisibleSymbols(self):
+        """
+        Requests the thumbnails of the symbols in the viewport.
+        """
+
+        if not self.uiSymbolListWidget.isVisible():
+            return
+        viewport = self.uiSymbolListWidget.viewport().rect()
+        for item in self._symbol_items:
+            if item.isHidden() or item.data(QtCore.Qt.UserRole + 1):
+                continue
+            if not self.uiSymbolListWidget.visualItemRect(item).intersects(viewport):
+                continue
+            # The thumbnail is requested only once
+            item.setData(QtCore.Qt.UserRole + 1, True)
+            symbol = item.data(QtCore.Qt.UserRole)
+            Controller.instance().getStatic(symbol.url(), qpartial(self._symbolDownloadedCallback, item))
+
+    def _symbolDownloadedCallback(self, item, path):
+
+        if self._thumbnail_items is None:
+            # The dialog is closed
+            return
+        image = SymbolThumbnails.instance().request(path)
+        if image is None:
+            self._thumbnail_items.setdefault(path, []).append(item)
+        else:
+            item.setIcon(QtGui.QIcon(QtGui.QPixmap.fromImage(image)))
+
+    def _thumbnailReadySlot(self, path):
+
+        if self._thumbnail_items is None:
+            return
+        image = SymbolThumbnails.instance().thumbnail(path)
+        items = self._thumbnail_items.pop(path, [])
+        if image is None or not items:
+            return
+        icon = QtGui.QIcon(QtGui.QPixmap.fromImage(image))
+        for item in items:
+            item.setIcon(icon)
 
     def _builtinSymbolOnlyToggledSlot(self, checked):
         self._filter()
@@ -121,6 +175,7 @@ class SymbolSelectionDialog(QtWidgets.QDialog, Ui_SymbolSelectionDialog):
                     item.setHidden(False)
                 else:
                     item.setHidden(True)
+        self._scheduleRender()
 
     def _customSymbolToggledSlot(self, checked):
         """
@@ -199,6 +254,9 @@ class SymbolSelectionDialog(QtWidgets.QDialog, Ui_SymbolSelectionDialog):
 
         if result and self._items and not self._applyPreferencesSlot():
             result = 0
+        if self._thumbnail_items is not None:
+            SymbolThumbnails.instance().thumbnail_ready_signal.disconnect(self._thumbnailReadySlot)
+            self._thumbnail_items = None
         super().done(result)
 
 
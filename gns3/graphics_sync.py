@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2017 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Send the graphics changes of the nodes to the controller by batch.
+"""
+
+import itertools
+import collections
+
+from .qt import QtCore, qpartial
+from .progress import Progress
+
+import logging
+log = logging.getLogger(__name__)
+
+
+class GraphicsSync(QtCore.QObject):
+
+    """
+    Collect the position, z value and label changes of the nodes.
+
+    The changes received during the debounce delay are merged by node
+    and sent with a limited number of queries in flight. A batch has a
+    single entry in the progress dialog whatever the number of nodes.
+
+    :param delay: Debounce delay in milliseconds
+    :param max_queries: Maximum number of queries in flight
+    """
+
+    DEFAULT_DELAY = 100
+    DEFAULT_MAX_QUERIES = 8
+
+    _batch_ids = itertools.count(1)
+
+    def __init__(self, delay=DEFAULT_DELAY, max_queries=DEFAULT_MAX_QUERIES):
+
+        super().__init__()
+        self._max_queries = max_queries
+
+        # Node identifier => (node, changes), waiting to be sent
+        self._pending = collections.OrderedDict()
+        # Node identifier => node, waiting for the controller
+        self._in_flight = {}
+
+        self._batch_id = None
+        self._batch_total = 0
+        self._batch_done = 0
+
+        self._timer = QtCore.QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(delay)
+        self._timer.timeout.connect(self.flush)
+
+    def push(self, node, changes):
+        """
+        Queue graphics changes of a node.
+
+        :param node: Node instance
+        :param changes: Dictionary of the changed settings
+        """
+
+        node_id = node.id()
+        if node_id in self._pending:
+            self._pending[node_id][1].update(changes)
+        else:
+            self._pending[node_id] = (node, dict(changes))
+            if self._batch_id is not None:
+                self._batch_total += 1
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def discard(self, node):
+        """
+        Forget the pending changes of a node (when the node is deleted).
+        """
+
+        if self._pending.pop(node.id(), None) is not None and self._batch_id is not None:
+            self._batch_total -= 1
+
+    def clear(self):
+        """
+        Forget all the pending changes.
+        """
+
+        self._timer.stop()
+        self._pending.clear()
+        self._in_flight.clear()
+        self._endBatch()
+
+    def pending(self):
+        """
+        :returns: Number of nodes with changes not yet sent
+        """
+
+        return len(self._pending)
+
+    def flush(self):
+        """
+        Send the pending changes now.
+        """
+
+        self._timer.stop()
+        if not self._pending:
+            return
+        if self._batch_id is None:
+            self._batch_id = "graphics-sync-{}".format(next(self._batch_ids))
+            self._batch_total = len(self._pending)
+            self._batch_done = 0
+            log.debug("Send the graphics changes of %d nodes", self._batch_total)
+            Progress.instance().add_query_signal.emit(self._batch_id, "Updating the nodes", None)
+        self._sendNext()
+
+    def _sendNext(self):
+
+        for node_id in list(self._pending):
+            if len(self._in_flight) >= self._max_queries:
+                break
+            if node_id in self._in_flight:
+                # Keep the order of the changes of a node
+                continue
+            node, changes = self._pending.pop(node_id)
+            if not node.initialized():
+                self._batch_done += 1
+                continue
+            self._in_flight[node_id] = node
+            node.updateGraphics(changes, qpartial(self._updateCallback, node_id))
+
+        if not self._pending and not self._in_flight:
+            self._endBatch()
+
+    def _updateCallback(self, node_id, result, error=False, **kwargs):
+
+        node = self._in_flight.pop(node_id, None)
+        if node is None:
+            # Cleared in the meantime
+            return
+        node.updateNodeCallback(result, error=error, **kwargs)
+        self._batch_done += 1
+        if self._batch_id is not None:
+            Progress.instance().progress_signal.emit(self._batch_id, self._batch_done, self._batch_total)
+        self._sendNext()
+
+    def _endBatch(self):
+
+        if self._batch_id is not None:
+            Progress.instance().remove_query_signal.emit(self._batch_id)
+            self._batch_id = None
+
+    @staticmethod
+    def instance():
+        """
+        Singleton to return only one instance of GraphicsSync.
+
+        :returns: instance of GraphicsSync
+        """
+
+        if not hasattr(GraphicsSync, "_instance") or GraphicsSync._instance is None:
+            GraphicsSync._instance = GraphicsSync()
+        return GraphicsSync._instance
@@ -22,9 +22,11 @@ Graphical view on the scene where items are drawn.
 import logging
 import os
 import sip
+import time
 import pickle
 
 from .qt import QtCore, QtGui, QtNetwork, QtWidgets, qpartial, qslot
+from .qt.level_of_detail import LevelOfDetail
 from .items.node_item import NodeItem
 from .dialogs.node_properties_dialog import NodePropertiesDialog
 from .link import Link
@@ -41,6 +43,9 @@ from .dialogs.console_command_dialog import ConsoleCommandDialog
 from .dialogs.file_editor_dialog import FileEditorDialog
 from .local_config import LocalConfig
 from .progress import Progress
+from .graphics_sync import GraphicsSync
+from .controller import Controller
+from .http_scheduler import HTTPScheduler
 from .utils.server_select import server_select
 from .compute_manager import ComputeManager
 
@@ -60,6 +65,13 @@ from .items.image_item import ImageItem
 
 log = logging.getLogger(__name__)
 
+QT_VIEWPORT_UPDATE_MODES = {
+    "minimal": QtWidgets.QGraphicsView.MinimalViewportUpdate,
+    "smart": QtWidgets.QGraphicsView.SmartViewportUpdate,
+    "bounding_rect": QtWidgets.QGraphicsView.BoundingRectViewportUpdate,
+    "full": QtWidgets.QGraphicsView.FullViewportUpdate
+}
+
 
 class GraphicsView(QtWidgets.QGraphicsView):
 
@@ -101,6 +113,10 @@ class GraphicsView(QtWidgets.QGraphicsView):
         self.setRenderHint(QtGui.QPainter.Antialiasing)
         self.setTransformationAnchor(QtWidgets.QGraphicsView.AnchorUnderMouse)
         self.setResizeAnchor(QtWidgets.QGraphicsView.AnchorViewCenter)
+        self._applyRenderingSettings()
+
+        # time spent to paint the frames
+        self.resetFrameTimeStats()
 
         # default directories for QFileDialog
         self._import_configs_from_dir = QtCore.QStandardPaths.writableLocation(QtCore.QStandardPaths.DocumentsLocation)
@@ -138,12 +154,20 @@ class GraphicsView(QtWidgets.QGraphicsView):
         Node.reset()
         Link.reset()
 
+        # drop the graphics changes of the previous project
+        GraphicsSync.instance().clear()
+
         # reset the topology
         self._topology.reset()
 
         # clear the topology summary
         self._main_window.uiTopologySummaryTreeWidget.clear()
 
+        # the scene doesn't notify the items it deletes
+        for item in self.scene().items():
+            if isinstance(item, NodeItem):
+                item.releaseRenderer()
+
         # clear all objects on the scene
         self.scene().clear()
 
@@ -173,6 +197,66 @@ class GraphicsView(QtWidgets.QGraphicsView):
         # save the settings
         self._settings.update(new_settings)
         LocalConfig.instance().saveSectionSettings(self.__class__.__name__, self._settings)
+        self._applyRenderingSettings()
+
+    def _applyRenderingSettings(self):
+        """
+        Applies the level of detail, viewport update mode and item cache settings.
+        """
+
+        LevelOfDetail.setEnabled(self._settings["level_of_detail"])
+        self.setViewportUpdateMode(QT_VIEWPORT_UPDATE_MODES.get(self._settings["viewport_update_mode"], QtWidgets.QGraphicsView.MinimalViewportUpdate))
+        for item in self.scene().items():
+            if isinstance(item, NodeItem):
+                item.setCacheMode(self._nodeItemCacheMode())
+        self.viewport().update()
+
+    def _nodeItemCacheMode(self):
+        """
+        :returns: Cache mode of the node items
+        """
+
+        if self._settings["node_item_cache"]:
+            return QtWidgets.QGraphicsItem.DeviceCoordinateCache
+        return QtWidgets.QGraphicsItem.NoCache
+
+    def paintEvent(self, event):
+        """
+        Paints the view and measures the time spent.
+
+        :param event: QPaintEvent instance
+        """
+
+        start = time.perf_counter()
+        super().paintEvent(event)
+        elapsed = time.perf_counter() - start
+
+        self._frame_count += 1
+        self._frame_time_total += elapsed
+        self._frame_time_max = max(self._frame_time_max, elapsed)
+        if self._frame_count % 500 == 0:
+            stats = self.frameTimeStats()
+            log.debug("Painted %d frames: average %.2f ms, maximum %.2f ms", stats["frames"], stats["average_ms"], stats["max_ms"])
+
+    def frameTimeStats(self):
+        """
+        :returns: Dictionary with the number of frames painted, the average and maximum time in milliseconds
+        """
+
+        average = 0
+        if self._frame_count:
+            average = self._frame_time_total / self._frame_count
+        return {
+            "frames": self._frame_count,
+            "average_ms": average * 1000,
+            "max_ms": self._frame_time_max * 1000
+        }
+
+    def resetFrameTimeStats(self):
+
+        self._frame_count = 0
+        self._frame_time_total = 0.0
+        self._frame_time_max = 0.0
 
     def addingLinkSlot(self, enabled):
         """
@@ -536,7 +620,11 @@ class GraphicsView(QtWidgets.QGraphicsView):
             for item in self.scene().selectedItems():
                 for child in item.childItems():
                     child.update()
-            super().mouseMoveEvent(event)
+            LinkItem.beginDeferredAdjust()
+            try:
+                super().mouseMoveEvent(event)
+            finally:
+                LinkItem.endDeferredAdjust()
 
     def mouseDoubleClickEvent(self, event):
         """
@@ -824,15 +912,35 @@ class GraphicsView(QtWidgets.QGraphicsView):
             delete_action.triggered.connect(self.deleteActionSlot)
             menu.addAction(delete_action)
 
+    # Actions on the nodes cancelling the queued queries of each other
+    NODE_ACTIONS = ("start", "stop", "suspend", "reload")
+
+    def _nodeAction(self, action):
+        """
+        Run an action on the selected nodes. The queries are sent as bulk
+        queries, the queued queries of the other actions are cancelled.
+
+        :param action: Name of the node method
+        """
+
+        http_client = Controller.instance().httpClient()
+        if http_client:
+            for other_action in self.NODE_ACTIONS:
+                if other_action != action:
+                    http_client.scheduler().cancelGroup("{} nodes".format(other_action), abort=False)
+
+        for item in self.scene().selectedItems():
+            if isinstance(item, NodeItem) and hasattr(item.node(), action) and item.node().initialized():
+                with HTTPScheduler.priority(HTTPScheduler.BULK, group="{} nodes".format(action), host=item.node().compute().id()):
+                    getattr(item.node(), action)()
+
     def startActionSlot(self):
         """
         Slot to receive events from the start action in the
         contextual menu.
         """
 
-        for item in self.scene().selectedItems():
-            if isinstance(item, NodeItem) and hasattr(item.node(), "start") and item.node().initialized():
-                item.node().start()
+        self._nodeAction("start")
 
     def stopActionSlot(self):
         """
@@ -840,9 +948,7 @@ class GraphicsView(QtWidgets.QGraphicsView):
         contextual menu.
         """
 
-        for item in self.scene().selectedItems():
-            if isinstance(item, NodeItem) and hasattr(item.node(), "stop") and item.node().initialized():
-                item.node().stop()
+        self._nodeAction("stop")
 
     def suspendActionSlot(self):
         """
@@ -850,9 +956,7 @@ class GraphicsView(QtWidgets.QGraphicsView):
         contextual menu.
         """
 
-        for item in self.scene().selectedItems():
-            if isinstance(item, NodeItem) and hasattr(item.node(), "suspend") and item.node().initialized():
-                item.node().suspend()
+        self._nodeAction("suspend")
 
     def reloadActionSlot(self):
         """
@@ -860,9 +964,7 @@ class GraphicsView(QtWidgets.QGraphicsView):
         contextual menu.
         """
 
-        for item in self.scene().selectedItems():
-            if isinstance(item, NodeItem) and hasattr(item.node(), "reload") and item.node().initialized():
-                item.node().reload()
+        self._nodeAction("reload")
 
     def configureActionSlot(self):
         """
@@ -1388,7 +1490,8 @@ class GraphicsView(QtWidgets.QGraphicsView):
                 return
         for item in self.scene().selectedItems():
             if isinstance(item, NodeItem):
-                item.node().delete()
+                with HTTPScheduler.priority(HTTPScheduler.BULK, group="delete nodes", host=item.node().compute().id()):
+                    item.node().delete()
                 self._topology.removeNode(item.node())
             elif item.parentItem() is None:
                 item.delete()
@@ -1455,6 +1558,7 @@ class GraphicsView(QtWidgets.QGraphicsView):
         node.setSymbol(symbol)
         node.setPos(x, y)
         node_item = NodeItem(node)
+        node_item.setCacheMode(self._nodeItemCacheMode())
         self.scene().addItem(node_item)
         self._topology.addNode(node)
 
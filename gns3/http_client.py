@@ -17,18 +17,23 @@
 
 import sip
 import json
+import time
 import copy
-import http
 import uuid
 import pathlib
 import base64
 import datetime
 import ipaddress
+import re
 import urllib.request
 
 from .version import __version__, __version_info__
 from .qt import QtCore, QtNetwork, qpartial, sip_is_deleted
 from .utils import parse_version
+from .utils.json_stream_decoder import JSONStreamDecoder
+from .http_scheduler import HTTPScheduler
+from .http_timeouts import HTTPTimeouts
+from .http_stats import HTTPStats
 
 import logging
 log = logging.getLogger(__name__)
@@ -52,6 +57,8 @@ class HTTPClient(QtCore.QObject):
     # How many times we need to retry a connection
     MAX_RETRY_CONNECTION = 5
 
+    _compute_path_re = re.compile(r"^/computes/([^/]+)")
+
     # Callback class used for displaying progress
     _progress_callback = None
 
@@ -89,12 +96,23 @@ class HTTPClient(QtCore.QObject):
             self._network_manager = network_manager
         else:
             self._network_manager = QtNetwork.QNetworkAccessManager()
-        # A buffer used by progress download
+        # A JSON stream decoder by query used by progress download
         self._buffer = {}
 
         # List of query waiting for the connection
         self._query_waiting_connections = []
 
+        self._scheduler = HTTPScheduler(parent=self)
+        self._timeouts = HTTPTimeouts(self._timeoutSlot, parent=self)
+        # Query id => [method, path, start time, bytes sent, bytes received]
+        self._query_stats = {}
+
+    def scheduler(self):
+        """
+        :returns: HTTPScheduler of the queries
+        """
+        return self._scheduler
+
     def setMaxTimeDifferenceBetweenQueries(self, value):
         self._max_time_difference_between_queries = value
 
@@ -253,6 +271,10 @@ class HTTPClient(QtCore.QObject):
                         prefix="/v2",
                         params={},
                         networkManager=None,
+                        headers={},
+                        priority=None,
+                        group=None,
+                        compute_id=None,
                         **kwargs):
         """
         Call the remote server, if not connected, check connection before
@@ -271,7 +293,11 @@ class HTTPClient(QtCore.QObject):
         :param prefix: Prefix to the path
         :param networkManager: QNetworkAccessManager None use the default
         :param params: Query arguments parameters
-        :returns: QNetworkReply
+        :param headers: Additional HTTP headers (dictionary)
+        :param priority: HTTPScheduler priority class, None for the priority of the context
+        :param group: Group of queries cancelled together with HTTPScheduler.cancelGroup
+        :param compute_id: Compute running the query, used to limit the queries by compute
+        :returns: QNetworkReply, None if the query is queued
         """
 
         if "dev" in __version__:
@@ -301,7 +327,9 @@ class HTTPClient(QtCore.QObject):
                            server=server,
                            timeout=timeout,
                            prefix=prefix,
-                           params=params)
+                           params=params,
+                           headers=headers)
+        request = qpartial(self._scheduler.submit, request, self._schedulerHost(path, compute_id), priority, group)
 
         if self._connected:
             return request()
@@ -312,6 +340,18 @@ class HTTPClient(QtCore.QObject):
                 log.info("Connection to {}".format(self.url()))
                 self._executeHTTPQuery("GET", "/version", self._callbackConnect, {}, server=server, timeout=5, showProgress=False)
 
+    def _schedulerHost(self, path, compute_id):
+        """
+        :returns: Compute used by the scheduler to limit the queries, None if unknown
+        """
+
+        if compute_id is not None:
+            return compute_id
+        match = self._compute_path_re.match(path)
+        if match:
+            return match.group(1)
+        return None
+
     def _connectionError(self, callback, msg="", server=None):
         """
         Return an error to user if connection failed
@@ -441,7 +481,34 @@ class HTTPClient(QtCore.QObject):
             request.setRawHeader(b"Authorization", auth_string.encode())
         return request
 
-    def _executeHTTPQuery(self, method, path, callback, body, context={}, downloadProgressCallback=None, showProgress=True, ignoreErrors=False, progressText=None, server=None, timeout=120, prefix="/v2", params={}, networkManager=None, **kwargs):
+    def _urlHost(self):
+        """
+        :returns: Host usable in a QUrl
+        """
+
+        try:
+            ip = self._host.rsplit('%', 1)[0]
+            ipaddress.IPv6Address(ip)  # remove any scope ID
+            # this is an IPv6 address, we must surround it with brackets to be used with QUrl.
+            return "[{}]".format(ip)
+        except ipaddress.AddressValueError:
+            return self._host
+
+    def webSocketRequest(self, path, prefix="/v2"):
+        """
+        Request to open a WebSocket on the server.
+
+        :param path: Remote path
+        :returns: QNetworkRequest
+        """
+
+        protocol = "wss" if self._protocol == "https" else "ws"
+        url = QtCore.QUrl("{protocol}://{host}:{port}{prefix}{path}".format(protocol=protocol, host=self._urlHost(), port=self._port, prefix=prefix, path=path))
+        request = QtNetwork.QNetworkRequest(url)
+        request.setRawHeader(b"User-Agent", "GNS3 QT Client v{version}".format(version=__version__).encode())
+        return self._addAuth(request)
+
+    def _executeHTTPQuery(self, method, path, callback, body, context={}, downloadProgressCallback=None, showProgress=True, ignoreErrors=False, progressText=None, server=None, timeout=120, prefix="/v2", params={}, networkManager=None, headers={}, **kwargs):
         """
         Call the remote server
 
@@ -458,23 +525,18 @@ class HTTPClient(QtCore.QObject):
         :param server: The server where the query is executed
         :param timeout: Delay in seconds before raising a timeout
         :param params: Query arguments parameters
+        :param headers: Additional HTTP headers (dictionary)
         :returns: QNetworkReply
         """
 
-        try:
-            ip = self._host.rsplit('%', 1)[0]
-            ipaddress.IPv6Address(ip)  # remove any scope ID
-            # this is an IPv6 address, we must surround it with brackets to be used with QUrl.
-            host = "[{}]".format(ip)
-        except ipaddress.AddressValueError:
-            host = self._host
+        host = self._urlHost()
 
         if params == {}:
             query_string = ""
         else:
             query_string = "?" + urllib.parse.urlencode(params)
 
-        log.debug("{method} {protocol}://{host}:{port}{prefix}{path} {body}{query_string}".format(method=method, protocol=self._protocol, host=host, port=self._port, path=path, body=body, prefix=prefix, query_string=query_string))
+        log.debug("%s %s://%s:%s%s%s %s%s", method, self._protocol, host, self._port, prefix, path, body, query_string)
         if self._user:
             url = QtCore.QUrl("{protocol}://{user}@{host}:{port}{prefix}{path}{query_string}".format(protocol=self._protocol, user=self._user, host=host, port=self._port, path=path, prefix=prefix, query_string=query_string))
         else:
@@ -484,6 +546,8 @@ class HTTPClient(QtCore.QObject):
         request = self._addAuth(request)
 
         request.setRawHeader(b"User-Agent", "GNS3 QT Client v{version}".format(version=__version__).encode())
+        for name, value in headers.items():
+            request.setRawHeader(name.encode(), value.encode())
 
         # By default QT doesn't support GET with body even if it's in the RFC that's why we need to use sendCustomRequest
         body = self._addBodyToRequest(body, request)
@@ -495,6 +559,7 @@ class HTTPClient(QtCore.QObject):
 
         context = copy.copy(context)
         context["query_id"] = str(uuid.uuid4())
+        self._query_stats[context["query_id"]] = [method, path, time.monotonic(), self._bodySize(body), 0]
 
         response.finished.connect(qpartial(self._processResponse, response, server, callback, context, body, ignoreErrors))
         response.error.connect(qpartial(self._processError, response, server, callback, context, body, ignoreErrors))
@@ -514,7 +579,7 @@ class HTTPClient(QtCore.QObject):
             self._notify_progress_start_query(context["query_id"], progressText, response)
 
         if timeout is not None:
-            QtCore.QTimer.singleShot(timeout * 1000, qpartial(self._timeoutSlot, response))
+            self._timeouts.add(response, timeout)
 
         return response
 
@@ -533,22 +598,53 @@ class HTTPClient(QtCore.QObject):
             return
 
         content = bytes(response.readAll())
+        self._addBytesReceived(context, len(content))
         content_type = response.header(QtNetwork.QNetworkRequest.ContentTypeHeader)
         if content_type == "application/json":
-            content = content.decode("utf-8")
-            if context["query_id"] in self._buffer:
-                content = self._buffer[context["query_id"]] + content
-            try:
-                while True:
-                    content = content.lstrip(" \r\n\t")
-                    answer, index = json.JSONDecoder().raw_decode(content)
-                    callback(answer, server=server, context=context)
-                    content = content[index:]
-            except ValueError:  # Partial JSON
-                self._buffer[context["query_id"]] = content
+            decoder = self._buffer.get(context["query_id"])
+            if decoder is None:
+                decoder = self._buffer[context["query_id"]] = JSONStreamDecoder()
+            for answer in decoder.feed(content):
+                callback(answer, server=server, context=context)
         else:
             callback(content, server=server, context=context)
 
+    @staticmethod
+    def _bodySize(body):
+
+        if body is None:
+            return 0
+        try:
+            return body.size()
+        except (AttributeError, RuntimeError):
+            return 0
+
+    def _addBytesReceived(self, context, size):
+
+        query_stats = self._query_stats.get(context.get("query_id"))
+        if query_stats is not None:
+            query_stats[4] += size
+
+    def _recordQueryStats(self, response, context):
+        """
+        Record the latency and the size of a finished query in the HTTP statistics.
+        """
+
+        query_stats = self._query_stats.pop(context.get("query_id"), None)
+        if query_stats is None:
+            return
+        method, path, start, bytes_sent, bytes_received = query_stats
+        error = response.error() != QtNetwork.QNetworkReply.NoError
+        if not error:
+            status = response.attribute(QtNetwork.QNetworkRequest.HttpStatusCodeAttribute)
+            error = isinstance(status, int) and status >= 400
+        HTTPStats.instance().record(method,
+                                    path,
+                                    (time.monotonic() - start) * 1000,
+                                    error=error,
+                                    bytes_sent=bytes_sent,
+                                    bytes_received=bytes_received)
+
     def _timeoutSlot(self, response):
         """
         Beware it's call for all request you need to check the status of the response
@@ -576,6 +672,7 @@ class HTTPClient(QtCore.QObject):
 
     def _processError(self, response, server, callback, context, request_body, ignore_errors, error_code):
         if error_code != QtNetwork.QNetworkReply.NoError:
+            self._buffer.pop(context.get("query_id"), None)
             error_message = response.errorString()
 
             if not ignore_errors:
@@ -598,7 +695,9 @@ class HTTPClient(QtCore.QObject):
                     log.error(error_message)
 
             try:
-                body = bytes(response.readAll()).decode("utf-8").strip("\0")
+                raw_body = bytes(response.readAll())
+                self._addBytesReceived(context, len(raw_body))
+                body = raw_body.decode("utf-8").strip("\0")
                 # Some time antivirus intercept our query and reply with garbage content
             except UnicodeError:
                 body = None
@@ -607,7 +706,7 @@ class HTTPClient(QtCore.QObject):
                 if not body or content_type != "application/json":
                     callback({"message": error_message}, error=True, server=server, context=context)
                 else:
-                    log.debug(body)
+                    log.debug("%s", body)
                     try:
                         callback(json.loads(body), error=True, server=server, context=context)
                     except ValueError:
@@ -626,18 +725,22 @@ class HTTPClient(QtCore.QObject):
 
         if "query_id" in context:
             self._notify_progress_end_query(context["query_id"])
+            self._buffer.pop(context["query_id"], None)
 
         if response.error() == QtNetwork.QNetworkReply.NoError:
             status = response.attribute(QtNetwork.QNetworkRequest.HttpStatusCodeAttribute)
-            log.debug("Decoding response from {} response {}".format(response.url().toString(), status))
+            if log.isEnabledFor(logging.DEBUG):
+                log.debug("Decoding response from %s response %s", response.url().toString(), status)
             try:
                 raw_body = bytes(response.readAll())
+                self._addBytesReceived(context, len(raw_body))
                 body = raw_body.decode("utf-8").strip("\0")
             # Some time anti-virus intercept our query and reply with garbage content
             except UnicodeDecodeError:
                 body = None
             content_type = response.header(QtNetwork.QNetworkRequest.ContentTypeHeader)
-            log.debug(body)
+            self._recordQueryStats(response, context)
+            log.debug("%s", body)
             if body and len(body.strip(" \n\t")) > 0 and content_type == "application/json":
                 try:
                     params = json.loads(body)
@@ -649,7 +752,10 @@ class HTTPClient(QtCore.QObject):
                 if status >= 400:
                     callback(params, error=True, server=server, context=context)
                 else:
-                    callback(params, server=server, context=context, raw_body=raw_body)
+                    headers = {}
+                    for name, value in response.rawHeaderPairs():
+                        headers[bytes(name).decode("utf-8", errors="ignore").lower()] = bytes(value).decode("utf-8", errors="ignore")
+                    callback(params, server=server, context=context, raw_body=raw_body, headers=headers, status=status)
             if status == 400:
                 try:
                     params = json.loads(body)
@@ -659,45 +765,6 @@ class HTTPClient(QtCore.QObject):
                 except Exception:
                     e = HttpBadRequest(body)
                 raise e
-
-    def getSynchronous(self, endpoint, timeout=2):
-        """
-        Synchronous check if a server is running
-
-        :returns: Tuple (Status code, json of anwser). Status 0 is a non HTTP error
-        """
-        try:
-            url = "{protocol}://{host}:{port}/v2/{endpoint}".format(protocol=self._protocol, host=self._host, port=self._port, endpoint=endpoint)
-
-            if self._user is not None and len(self._user) > 0:
-                log.debug("Synchronous get {} with user '{}'".format(url, self._user))
-                auth_handler = urllib.request.HTTPBasicAuthHandler()
-                auth_handler.add_password(realm="GNS3 server",
-                                          uri=url,
-                                          user=self._user,
-                                          passwd=self._password)
-                opener = urllib.request.build_opener(auth_handler)
-                urllib.request.install_opener(opener)
-            else:
-                log.debug("Synchronous get {} (no authentication)".format(url))
-            response = urllib.request.urlopen(url, timeout=timeout)
-            content_type = response.getheader("CONTENT-TYPE")
-            if response.status == 200:
-                if content_type == "application/json":
-                    content = response.read()
-                    json_data = json.loads(content.decode("utf-8"))
-                    return response.status, json_data
-            else:
-                return response.status, None
-        except http.client.InvalidURL as e:
-            log.warn("Invalid local server url: {}".format(e))
-            return 0, None
-        except urllib.error.URLError:
-            # Connection refused. It's a normal behavior if server is not started
-            return 0, None
-        except urllib.error.HTTPError as e:
-            log.debug("Error during get on {}:{}: {}".format(self.host(), self.port(), e))
-            return e.code, None
-        except (OSError, http.client.BadStatusLine, ValueError) as e:
-            log.debug("Error during get on {}:{}: {}".format(self.host(), self.port(), e))
-        return 0, None
+        else:
+            # The error has been processed by _processError
+            self._recordQueryStats(response, context)
@@ -0,0 +1,268 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2017 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Scheduling of the HTTP queries by priority.
+"""
+
+import time
+import contextlib
+import collections
+
+from .qt import QtCore, qpartial, sip_is_deleted
+
+import logging
+log = logging.getLogger(__name__)
+
+
+class HTTPScheduler(QtCore.QObject):
+
+    """
+    Send the HTTP queries by priority class.
+
+    Interactive queries (the default) are sent immediately. Bulk queries
+    (actions on many nodes) and background queries (polling, symbols) wait
+    in a queue and only a limited number of them are in flight for each
+    compute, so they never take all the connections of Qt and the
+    interactive queries of the user don't wait behind them.
+
+    :param max_bulk: Maximum of bulk and background queries in flight by compute
+    :param max_background: Maximum of background queries in flight by compute
+    """
+
+    INTERACTIVE = 0
+    BULK = 1
+    BACKGROUND = 2
+
+    PRIORITY_NAMES = {
+        INTERACTIVE: "interactive",
+        BULK: "bulk",
+        BACKGROUND: "background"
+    }
+
+    # Qt opens 6 connections by host, keep some for the interactive queries
+    DEFAULT_MAX_BULK = 4
+    DEFAULT_MAX_BACKGROUND = 2
+
+    # Stack of (priority, group, host) set by the priority context manager
+    _defaults = []
+
+    def __init__(self, max_bulk=DEFAULT_MAX_BULK, max_background=DEFAULT_MAX_BACKGROUND, parent=None):
+
+        super().__init__(parent)
+        self._max_bulk = max_bulk
+        self._max_background = max_background
+        # Priority => {host: FIFO of the queued queries}
+        self._queues = {self.BULK: {}, self.BACKGROUND: {}}
+        # Host => {priority: number of queries}
+        self._in_flight = collections.defaultdict(collections.Counter)
+        # Group => responses in flight
+        self._groups = collections.defaultdict(set)
+        self._metrics = {}
+        self.resetMetrics()
+
+    @classmethod
+    @contextlib.contextmanager
+    def priority(cls, priority, group=None, host=None):
+        """
+        Context manager setting the priority of the queries created in
+        its block when they don't set one.
+
+            with HTTPScheduler.priority(HTTPScheduler.BULK, group="start", host=node.compute().id()):
+                node.start()
+
+        :param priority: Priority class
+        :param group: Group name, used to cancel the queries together
+        :param host: Compute of the queries when it can't be found from their path
+        """
+
+        cls._defaults.append((priority, group, host))
+        try:
+            yield
+        finally:
+            cls._defaults.pop()
+
+    def submit(self, request, host=None, priority=None, group=None):
+        """
+        Send a query or queue it.
+
+        :param request: Callable sending the query and returning the QNetworkReply
+        :param host: Compute of the query, the limits are by compute
+        :param priority: Priority class, None for the priority of the context
+        :param group: Group name
+        :returns: QNetworkReply or None if the query is queued
+        """
+
+        if priority is None:
+            if self._defaults:
+                priority, default_group, default_host = self._defaults[-1]
+                if group is None:
+                    group = default_group
+                if host is None:
+                    host = default_host
+            else:
+                priority = self.INTERACTIVE
+        if host is None:
+            host = "controller"
+
+        entry = (request, host, priority, group, time.monotonic())
+        if priority == self.INTERACTIVE:
+            return self._send(entry)
+
+        self._queues[priority].setdefault(host, collections.deque()).append(entry)
+        return self._dispatch(host, entry)
+
+    def _canSend(self, host, priority):
+
+        in_flight = self._in_flight[host]
+        if in_flight[self.BULK] + in_flight[self.BACKGROUND] >= self._max_bulk:
+            return False
+        if priority == self.BACKGROUND:
+            if in_flight[self.BACKGROUND] >= self._max_background or host in self._queues[self.BULK]:
+                return False
+        return True
+
+    def _dispatch(self, host, target=None):
+        """
+        Send the queued queries of a compute allowed by the limits.
+
+        :param host: Compute, the limits of the other computes don't change
+        :returns: The response of the target entry if it has been sent
+        """
+
+        target_response = None
+        for priority in (self.BULK, self.BACKGROUND):
+            queues = self._queues[priority]
+            # Sending a query can queue another one, so the queue is read again each time
+            while host in queues and self._canSend(host, priority):
+                queue = queues[host]
+                entry = queue.popleft()
+                if not queue:
+                    del queues[host]
+                response = self._send(entry)
+                if entry is target:
+                    target_response = response
+        return target_response
+
+    def _send(self, entry):
+
+        request, host, priority, group, queued_at = entry
+        metrics = self._metrics[priority]
+        wait = time.monotonic() - queued_at
+        metrics["sent"] += 1
+        metrics["total_wait"] += wait
+        metrics["max_wait"] = max(metrics["max_wait"], wait)
+
+        response = request()
+        if response is None:
+            return None
+
+        tracked = priority != self.INTERACTIVE
+        if tracked:
+            self._in_flight[host][priority] += 1
+        if group is not None:
+            self._groups[group].add(response)
+        if tracked or group is not None:
+            response.finished.connect(qpartial(self._finishedSlot, response, host, priority, group, tracked))
+        return response
+
+    def _finishedSlot(self, response, host, priority, group, tracked):
+
+        if group is not None:
+            responses = self._groups.get(group)
+            if responses is not None:
+                responses.discard(response)
+                if not responses:
+                    del self._groups[group]
+        if tracked:
+            self._in_flight[host][priority] -= 1
+            self._dispatch(host)
+
+    def cancelGroup(self, group, abort=True):
+        """
+        Cancel the queries of a group. The queued queries are dropped
+        without calling their callback, the queries in flight are aborted.
+
+        :param group: Group name
+        :param abort: Abort the queries in flight
+        :returns: Number of queries cancelled
+        """
+
+        cancelled = 0
+        for queues in self._queues.values():
+            for host, queue in list(queues.items()):
+                remaining = collections.deque(entry for entry in queue if entry[3] != group)
+                cancelled += len(queue) - len(remaining)
+                if remaining:
+                    queues[host] = remaining
+                else:
+                    del queues[host]
+
+        if abort:
+            for response in list(self._groups.pop(group, ())):
+                if not sip_is_deleted(response) and response.isRunning():
+                    response.abort()
+                    cancelled += 1
+        if cancelled:
+            log.debug("{} queries of group {} cancelled".format(cancelled, group))
+        return cancelled
+
+    def queueDepth(self, priority=None):
+        """
+        :param priority: Priority class, None for all
+        :returns: Number of queued queries
+        """
+
+        if priority is None:
+            return sum(len(queue) for queues in self._queues.values() for queue in queues.values())
+        return sum(len(queue) for queue in self._queues.get(priority, {}).values())
+
+    def inFlight(self, host=None):
+        """
+        :param host: Compute, None for all
+        :returns: Number of bulk and background queries in flight
+        """
+
+        if host is None:
+            return sum(sum(counter.values()) for counter in self._in_flight.values())
+        return sum(self._in_flight[host].values())
+
+    def metrics(self):
+        """
+        :returns: Dictionary by priority name with the queue depth, the
+        number of queries sent and the wait times in milliseconds
+        """
+
+        result = {}
+        for priority, name in self.PRIORITY_NAMES.items():
+            metrics = self._metrics[priority]
+            average = 0
+            if metrics["sent"]:
+                average = metrics["total_wait"] * 1000 / metrics["sent"]
+            result[name] = {
+                "queued": self.queueDepth(priority),
+                "in_flight": sum(counter[priority] for counter in self._in_flight.values()),
+                "sent": metrics["sent"],
+                "average_wait_ms": round(average, 3),
+                "max_wait_ms": round(metrics["max_wait"] * 1000, 3)
+            }
+        return result
+
+    def resetMetrics(self):
+
+        for priority in self.PRIORITY_NAMES:
+            self._metrics[priority] = {"sent": 0, "total_wait": 0.0, "max_wait": 0.0}
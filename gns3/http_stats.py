@@ -0,0 +1,260 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2017 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Latency and throughput statistics of the HTTP queries by route.
+"""
+
+import re
+import json
+import bisect
+
+
+class LatencyHistogram:
+
+    """
+    Histogram of latencies with fixed buckets, the memory used doesn't
+    depend on the number of queries. The percentiles are the upper
+    bound of the bucket where they fall.
+    """
+
+    # Upper bounds of the buckets in milliseconds, the last bucket is unbounded
+    BOUNDS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 30000, 60000, 120000)
+
+    def __init__(self):
+
+        self._buckets = [0] * (len(self.BOUNDS) + 1)
+        self._count = 0
+        self._total = 0.0
+        self._max = 0.0
+
+    def record(self, latency):
+        """
+        :param latency: Latency in milliseconds
+        """
+
+        self._buckets[bisect.bisect_left(self.BOUNDS, latency)] += 1
+        self._count += 1
+        self._total += latency
+        if latency > self._max:
+            self._max = latency
+
+    def count(self):
+
+        return self._count
+
+    def average(self):
+
+        if self._count == 0:
+            return 0.0
+        return self._total / self._count
+
+    def maximum(self):
+
+        return self._max
+
+    def percentile(self, percent):
+        """
+        :param percent: Percentile between 0 and 100
+        :returns: Upper bound in milliseconds of the percentile
+        """
+
+        if self._count == 0:
+            return 0.0
+        rank = percent * self._count / 100
+        seen = 0
+        for index, count in enumerate(self._buckets):
+            seen += count
+            if seen >= rank and count:
+                if index < len(self.BOUNDS):
+                    return min(float(self.BOUNDS[index]), self._max)
+                return self._max
+        return self._max
+
+
+class RouteStats:
+
+    """
+    Statistics of a route.
+    """
+
+    def __init__(self):
+
+        self.count = 0
+        self.errors = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.latency = LatencyHistogram()
+
+    def __json__(self):
+
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+            "average_ms": round(self.latency.average(), 3),
+            "p50_ms": self.latency.percentile(50),
+            "p90_ms": self.latency.percentile(90),
+            "p99_ms": self.latency.percentile(99),
+            "max_ms": round(self.latency.maximum(), 3)
+        }
+
+
+class HTTPStats:
+
+    """
+    Statistics of the HTTP queries by method and route template, the
+    identifiers in the paths are replaced by {} so all the queries on
+    the nodes share the route PUT /projects/{}/nodes/{}.
+    """
+
+    # Maximum number of routes, the others are counted in a single route
+    MAX_ROUTES = 256
+    OTHER_ROUTE = "OTHER"
+
+    _identifier_re = re.compile(r"^([0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}|[0-9]+)$")
+    # Collections followed by a name like "local" or "vm"
+    _named_collections = ("computes", )
+    # Collections followed by a file path
+    _path_collections = ("images", "files", "symbols", "static")
+
+    def __init__(self):
+
+        self._enabled = True
+        self._routes = {}
+        self._templates = {}
+
+    def setEnabled(self, enabled):
+
+        self._enabled = enabled
+
+    def enabled(self):
+
+        return self._enabled
+
+    def routeTemplate(self, method, path):
+        """
+        :returns: The method and the path with the identifiers replaced by {}
+        """
+
+        key = (method, path)
+        template = self._templates.get(key)
+        if template is not None:
+            return template
+
+        segments = []
+        previous = None
+        for segment in path.split("?", 1)[0].split("/"):
+            if previous in self._path_collections:
+                # The rest of the path is a file path
+                segments.append("{}")
+                break
+            if previous in self._named_collections or self._identifier_re.match(segment):
+                segments.append("{}")
+            else:
+                segments.append(segment)
+            previous = segment
+        template = "{} {}".format(method, "/".join(segments))
+
+        # Don't keep a cache entry for each file path or query string
+        if len(self._templates) < 4 * self.MAX_ROUTES:
+            self._templates[key] = template
+        return template
+
+    def record(self, method, path, latency, error=False, bytes_sent=0, bytes_received=0):
+        """
+        Record a query.
+
+        :param method: HTTP method
+        :param path: Path of the query
+        :param latency: Latency in milliseconds
+        :param error: True if the query failed
+        :param bytes_sent: Size of the body sent
+        :param bytes_received: Size of the body received
+        """
+
+        if not self._enabled:
+            return
+        route = self.routeTemplate(method, path)
+        stats = self._routes.get(route)
+        if stats is None:
+            if len(self._routes) >= self.MAX_ROUTES:
+                route = self.OTHER_ROUTE
+                stats = self._routes.setdefault(route, RouteStats())
+            else:
+                stats = self._routes[route] = RouteStats()
+        stats.count += 1
+        if error:
+            stats.errors += 1
+        stats.bytes_sent += bytes_sent
+        stats.bytes_received += bytes_received
+        stats.latency.record(latency)
+
+    def reset(self):
+
+        self._routes = {}
+
+    def __json__(self):
+
+        return {route: stats.__json__() for route, stats in sorted(self._routes.items())}
+
+    def toJson(self):
+
+        return json.dumps(self.__json__(), indent=4, sort_keys=True)
+
+    def dump(self, path):
+        """
+        Write the statistics in a JSON file.
+        """
+
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.toJson())
+
+    def format(self):
+        """
+        :returns: The statistics as a text table, the slowest routes first
+        """
+
+        if not self._routes:
+            return "No HTTP query recorded"
+        lines = ["{:<55} {:>7} {:>6} {:>9} {:>9} {:>9} {:>9} {:>11} {:>11}".format("Route", "Count", "Errors", "p50 ms", "p90 ms", "p99 ms", "Max ms", "Sent", "Received")]
+        routes = sorted(self._routes.items(), key=lambda item: item[1].latency.average() * item[1].count, reverse=True)
+        for route, stats in routes:
+            data = stats.__json__()
+            lines.append("{:<55} {:>7} {:>6} {:>9.1f} {:>9.1f} {:>9.1f} {:>9.1f} {:>11} {:>11}".format(route[:55],
+                                                                                                        data["count"],
+                                                                                                        data["errors"],
+                                                                                                        data["p50_ms"],
+                                                                                                        data["p90_ms"],
+                                                                                                        data["p99_ms"],
+                                                                                                        data["max_ms"],
+                                                                                                        data["bytes_sent"],
+                                                                                                        data["bytes_received"]))
+        return "\n".join(lines)
+
+    @staticmethod
+    def instance():
+        """
+        Singleton to return only one instance of HTTPStats.
+
+        :returns: instance of HTTPStats
+        """
+
+        if not hasattr(HTTPStats, "_instance") or HTTPStats._instance is None:
+            HTTPStats._instance = HTTPStats()
+        return HTTPStats._instance
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2017 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Timeouts of the HTTP queries.
+"""
+
+import time
+import heapq
+import itertools
+
+from .qt import QtCore, qpartial
+
+import logging
+log = logging.getLogger(__name__)
+
+
+class HTTPTimeouts(QtCore.QObject):
+
+    """
+    Deadlines of the queries in flight.
+
+    The deadlines are kept in a heap swept by a single periodic timer
+    instead of a timer by query. The deadline of a query is forgotten
+    when its reply is finished, the heap entries are removed lazily.
+
+    :param callback: Called with the reply of each expired query
+    :param resolution: Interval of the sweep in milliseconds
+    """
+
+    DEFAULT_RESOLUTION = 1000
+
+    def __init__(self, callback, resolution=DEFAULT_RESOLUTION, parent=None):
+
+        super().__init__(parent)
+        self._callback = callback
+        self._heap = []
+        # id(reply) => heap entry
+        self._entries = {}
+        self._sequence = itertools.count()
+
+        self._timer = QtCore.QTimer(self)
+        self._timer.setInterval(resolution)
+        self._timer.timeout.connect(self.sweep)
+
+    def add(self, reply, timeout):
+        """
+        Start to track the deadline of a reply.
+
+        :param reply: QNetworkReply
+        :param timeout: Delay in seconds
+        """
+
+        self.remove(reply)
+        entry = [time.monotonic() + timeout, next(self._sequence), reply]
+        self._entries[id(reply)] = entry
+        heapq.heappush(self._heap, entry)
+        reply.finished.connect(qpartial(self.remove, reply))
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def remove(self, reply):
+        """
+        Forget the deadline of a reply.
+        """
+
+        entry = self._entries.pop(id(reply), None)
+        if entry is None:
+            return
+        # Lazy removal, the entry stays in the heap without its reply
+        entry[2] = None
+        if not self._entries:
+            self._heap = []
+            self._timer.stop()
+        elif len(self._heap) > 2 * len(self._entries) + 64:
+            self._heap = [entry for entry in self._heap if entry[2] is not None]
+            heapq.heapify(self._heap)
+
+    def pending(self):
+        """
+        :returns: Number of replies with a deadline
+        """
+
+        return len(self._entries)
+
+    def sweep(self, now=None):
+        """
+        Call the callback for the expired deadlines.
+        """
+
+        if now is None:
+            now = time.monotonic()
+        expired = []
+        while self._heap and self._heap[0][0] <= now:
+            entry = heapq.heappop(self._heap)
+            reply = entry[2]
+            if reply is not None:
+                del self._entries[id(reply)]
+                expired.append(reply)
+        if not self._entries:
+            self._heap = []
+            self._timer.stop()
+        for reply in expired:
+            self._callback(reply)
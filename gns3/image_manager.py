@@ -17,12 +17,12 @@
 
 import os
 import copy
-import pathlib
 
 from gns3.qt import QtWidgets
 from gns3.local_server_config import LocalServerConfig
 from gns3.settings import LOCAL_SERVER_SETTINGS
 from gns3.controller import Controller
+from gns3.image_upload_manager import ImageUploadManager
 from gns3.utils.file_copy_worker import FileCopyWorker
 from gns3.utils.progress_dialog import ProgressDialog
 
@@ -86,17 +86,17 @@ class ImageManager:
         """
 
         if node_type == 'QEMU':
-            upload_endpoint = '/qemu/images'
+            emulator = 'qemu'
         elif node_type == 'IOU':
-            upload_endpoint = '/iou/images'
+            emulator = 'iou'
         elif node_type == 'DYNAMIPS':
-            upload_endpoint = '/dynamips/images'
+            emulator = 'dynamips'
         else:
             raise Exception('Invalid node type')
 
         filename = self._getRelativeImagePath(path, node_type).replace("\\", "/")
 
-        Controller.instance().postCompute('{}/{}'.format(upload_endpoint, filename), server, None, body=pathlib.Path(path), progressText="Uploading {}".format(filename), timeout=None)
+        ImageUploadManager.instance().upload(emulator, server, path, filename)
         return filename
 
     def _askForUploadMissingImage(self, filename, server):
@@ -0,0 +1,345 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2017 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Upload of the local images to the computes.
+"""
+
+import os
+import pathlib
+import collections
+
+from .qt import QtCore, qpartial
+from .controller import Controller
+from .local_config import LocalConfig
+from .settings import GENERAL_SETTINGS
+from .registry.image_index import ImageIndex
+
+import logging
+log = logging.getLogger(__name__)
+
+
+class ImageUpload:
+
+    """
+    An image waiting to be uploaded to a compute.
+    """
+
+    def __init__(self, emulator, compute_id, path, filename):
+
+        self.emulator = emulator
+        self.compute_id = compute_id
+        self.path = path
+        self.filename = filename
+        self.callbacks = []
+        self.attempts = 0
+
+    def key(self):
+
+        return (self.compute_id, self.emulator, self.filename)
+
+
+class Md5sumRunnable(QtCore.QRunnable):
+
+    """
+    Compute the checksum of an image in a thread of the pool.
+
+    :param manager: ImageUploadManager receiving the result
+    :param image_index: ImageIndex instance
+    :param path: Path of the image
+    """
+
+    def __init__(self, manager, image_index, path):
+
+        super().__init__()
+        self._manager = manager
+        self._image_index = image_index
+        self._path = path
+
+    def run(self):
+
+        try:
+            md5sum = self._image_index.md5sum(self._path)
+        except Exception as e:
+            log.error("Can't compute the checksum of {}: {}".format(self._path, e))
+            md5sum = None
+        # Queued to the GUI thread
+        self._manager.md5sum_signal.emit(self._path, md5sum)
+
+
+class ImageUploadManager(QtCore.QObject):
+
+    """
+    Upload the images to the computes.
+
+    The images already on the compute with the same checksum are not sent
+    again. The uploads run in parallel up to a limit, an upload is checked
+    against the checksum computed by the compute and sent again if it has
+    been interrupted by a connection error or is corrupted.
+
+    The local images are hashed in a thread pool and the image lists of
+    the computes are kept only until all the uploads are finished.
+
+    :param max_uploads: Maximum number of uploads at the same time
+    """
+
+    DEFAULT_MAX_UPLOADS = 2
+    MAX_ATTEMPTS = 3
+
+    upload_finished_signal = QtCore.Signal(str, str)
+    md5sum_signal = QtCore.Signal(str, object)
+
+    def __init__(self, max_uploads=DEFAULT_MAX_UPLOADS):
+
+        super().__init__()
+        self._max_uploads = max(1, max_uploads)
+        # Key => ImageUpload
+        self._uploads = {}
+        self._queue = collections.deque()
+        self._running = set()
+        # (compute_id, emulator) => {filename: remote image}
+        self._remote_images = {}
+        # (compute_id, emulator) => uploads waiting for the remote image list
+        self._listing = {}
+        # Path => callbacks waiting for the checksum of the image
+        self._hashing = {}
+        self._pool = QtCore.QThreadPool(self)
+        self._pool.setMaxThreadCount(self._max_uploads)
+        self.md5sum_signal.connect(self._md5sumSlot)
+
+    def setMaxUploads(self, max_uploads):
+
+        self._max_uploads = max(1, max_uploads)
+        self._pool.setMaxThreadCount(self._max_uploads)
+        self._startNext()
+
+    def maxUploads(self):
+
+        return self._max_uploads
+
+    def upload(self, emulator, compute_id, path, filename, callback=None):
+        """
+        Upload an image to a compute, the callback is called when the image
+        is on the compute like a callback of the HTTP client.
+
+        :param emulator: Emulator type (qemu, iou, dynamips)
+        :param compute_id: Compute identifier
+        :param path: Local path of the image
+        :param filename: Filename of the image on the compute
+        :param callback: Callback called with the result of the upload
+        """
+
+        upload = self._uploads.get((compute_id, emulator, filename))
+        if upload is None:
+            upload = ImageUpload(emulator, compute_id, path, filename)
+            self._uploads[upload.key()] = upload
+            upload.callbacks.append(callback)
+            self._checkRemoteImage(upload)
+        else:
+            # Already uploading this image to this compute
+            upload.callbacks.append(callback)
+
+    def pending(self):
+        """
+        :returns: Number of uploads not finished
+        """
+
+        return len(self._uploads)
+
+    def _checkRemoteImage(self, upload):
+
+        list_key = (upload.compute_id, upload.emulator)
+        if list_key in self._remote_images:
+            self._compareRemoteImage(upload)
+        elif list_key in self._listing:
+            self._listing[list_key].append(upload)
+        else:
+            self._listing[list_key] = [upload]
+            self._getRemoteImages(upload, qpartial(self._listCallback, list_key))
+
+    def _getRemoteImages(self, upload, callback):
+
+        Controller.instance().getCompute("/{}/images".format(upload.emulator), upload.compute_id, callback, showProgress=False)
+
+    def _parseRemoteImages(self, result):
+
+        images = {}
+        for image in result:
+            try:
+                images[image["path"]] = image
+            except (KeyError, TypeError):
+                continue
+        return images
+
+    def _listCallback(self, list_key, result, error=False, **kwargs):
+
+        uploads = self._listing.pop(list_key, [])
+        if error or not isinstance(result, list):
+            # Old computes can't list the images, upload them anyway
+            log.debug("Can't get the image list of {}: {}".format(list_key[0], result))
+            for upload in uploads:
+                self._enqueue(upload)
+            return
+
+        self._remote_images[list_key] = self._parseRemoteImages(result)
+        for upload in uploads:
+            self._compareRemoteImage(upload)
+
+    def _localMd5sum(self, upload, callback):
+        """
+        Call the callback with the checksum of the local image, the image
+        is hashed in a thread if the checksum is not known.
+        """
+
+        image_index = ImageIndex.instance()
+        md5sum = image_index.cachedMd5sum(upload.path)
+        if md5sum is not None:
+            callback(md5sum)
+        elif upload.path in self._hashing:
+            self._hashing[upload.path].append(callback)
+        else:
+            self._hashing[upload.path] = [callback]
+            self._pool.start(Md5sumRunnable(self, image_index, upload.path))
+
+    def _md5sumSlot(self, path, md5sum):
+
+        for callback in self._hashing.pop(path, []):
+            callback(md5sum)
+
+    def waitForDone(self, msecs=-1):
+
+        return self._pool.waitForDone(msecs)
+
+    def _compareRemoteImage(self, upload):
+
+        remote_image = self._remote_images[(upload.compute_id, upload.emulator)].get(upload.filename)
+        if remote_image and remote_image.get("md5sum"):
+            try:
+                same_size = remote_image.get("filesize") is None or remote_image["filesize"] == os.path.getsize(upload.path)
+            except OSError:
+                same_size = False
+            if same_size:
+                self._localMd5sum(upload, qpartial(self._compareMd5sumCallback, upload, remote_image["md5sum"]))
+                return
+        self._enqueue(upload)
+
+    def _compareMd5sumCallback(self, upload, remote_md5sum, local_md5sum):
+
+        if remote_md5sum == local_md5sum:
+            log.info("{} is already on compute {}, skip the upload".format(upload.filename, upload.compute_id))
+            self._finish(upload, {"filename": upload.filename, "md5sum": remote_md5sum})
+        else:
+            self._enqueue(upload)
+
+    def _enqueue(self, upload):
+
+        self._queue.append(upload)
+        self._startNext()
+
+    def _startNext(self):
+
+        while self._queue and len(self._running) < self._max_uploads:
+            upload = self._queue.popleft()
+            self._running.add(upload.key())
+            upload.attempts += 1
+            log.debug("Upload {} to compute {} (attempt {})".format(upload.filename, upload.compute_id, upload.attempts))
+            Controller.instance().postCompute("/{}/images/{}".format(upload.emulator, upload.filename),
+                                              upload.compute_id,
+                                              qpartial(self._uploadCallback, upload),
+                                              body=pathlib.Path(upload.path),
+                                              progressText="Uploading {}".format(upload.filename),
+                                              timeout=None)
+
+    def _canRetry(self, upload, result):
+        """
+        Only the uploads interrupted by a connection error are sent again,
+        not the uploads refused by the compute or cancelled by the user.
+        """
+
+        if upload.attempts >= self.MAX_ATTEMPTS:
+            return False
+        if not isinstance(result, dict) or "status" in result:
+            return False
+        return result.get("message") != "Operation timeout"
+
+    def _uploadCallback(self, upload, result, error=False, **kwargs):
+
+        self._running.discard(upload.key())
+        if error:
+            if self._canRetry(upload, result):
+                log.warning("Upload of {} to compute {} failed: {}, retrying".format(upload.filename, upload.compute_id, result.get("message")))
+                self._enqueue(upload)
+            else:
+                self._finish(upload, result, error=True, **kwargs)
+                self._startNext()
+            return
+
+        # The compute computes the checksum of the received file
+        self._getRemoteImages(upload, qpartial(self._verifyCallback, upload))
+        self._startNext()
+
+    def _verifyCallback(self, upload, result, error=False, **kwargs):
+
+        if error or not isinstance(result, list):
+            # Nothing to check with old computes
+            self._finish(upload, {"filename": upload.filename})
+            return
+
+        images = self._parseRemoteImages(result)
+        self._remote_images[(upload.compute_id, upload.emulator)] = images
+        remote_md5sum = images.get(upload.filename, {}).get("md5sum")
+        if remote_md5sum is None:
+            self._finish(upload, {"filename": upload.filename, "md5sum": None})
+            return
+        self._localMd5sum(upload, qpartial(self._verifyMd5sumCallback, upload, remote_md5sum))
+
+    def _verifyMd5sumCallback(self, upload, remote_md5sum, local_md5sum):
+
+        if remote_md5sum == local_md5sum:
+            self._finish(upload, {"filename": upload.filename, "md5sum": remote_md5sum})
+        elif upload.attempts < self.MAX_ATTEMPTS:
+            log.warning("Checksum of {} on compute {} is {} instead of {}, uploading again".format(upload.filename, upload.compute_id, remote_md5sum, local_md5sum))
+            self._enqueue(upload)
+        else:
+            message = "The checksum of {} on compute {} is {} instead of {}".format(upload.filename, upload.compute_id, remote_md5sum, local_md5sum)
+            log.error(message)
+            self._finish(upload, {"message": message}, error=True)
+
+    def _finish(self, upload, result, error=False, **kwargs):
+
+        self._uploads.pop(upload.key(), None)
+        if not self._uploads:
+            # The images on the computes can change before the next batch
+            self._remote_images.clear()
+        if not error:
+            self.upload_finished_signal.emit(upload.compute_id, upload.filename)
+        for callback in upload.callbacks:
+            if callback is not None:
+                callback(result, error=error, **kwargs)
+
+    @staticmethod
+    def instance():
+        """
+        Singleton to return only one instance of ImageUploadManager.
+
+        :returns: instance of ImageUploadManager
+        """
+
+        if not hasattr(ImageUploadManager, "_instance") or ImageUploadManager._instance is None:
+            settings = LocalConfig.instance().sectionView("MainWindow", GENERAL_SETTINGS)
+            ImageUploadManager._instance = ImageUploadManager(max_uploads=settings["max_image_uploads"])
+        return ImageUploadManager._instance
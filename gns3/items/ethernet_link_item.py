@@ -20,6 +20,7 @@ Graphical representation of an Ethernet link for QGraphicsScene.
 """
 
 from ..qt import QtCore, QtGui, QtWidgets
+from ..qt.level_of_detail import LevelOfDetail
 from .link_item import LinkItem
 from .note_item import NoteItem
 from ..ports.port import Port
@@ -105,6 +106,13 @@ class EthernetLinkItem(LinkItem):
         :param widget: QWidget instance.
         """
 
+        if LevelOfDetail.isLow(painter):
+            # zoomed out, only the line is visible
+            painter.setRenderHint(QtGui.QPainter.Antialiasing, False)
+            QtWidgets.QGraphicsPathItem.paint(self, painter, option, widget)
+            self._drawCaptureSymbol()
+            return
+
         QtWidgets.QGraphicsPathItem.paint(self, painter, option, widget)
         if not self._adding_flag and self._settings["draw_link_status_points"]:
 
@@ -142,6 +150,7 @@ class EthernetLinkItem(LinkItem):
 
             if source_port_label is None:
                 source_port_label = NoteItem(self._source_item)
+                source_port_label.setVisibleAtLowDetail(False)
                 source_port_label.setPlainText(self._source_port.shortName())
                 source_port_label.setPos(self.mapToItem(self._source_item, point1))
                 self._source_port.setLabel(source_port_label)
@@ -183,6 +192,7 @@ class EthernetLinkItem(LinkItem):
 
             if destination_port_label is None:
                 destination_port_label = NoteItem(self._destination_item)
+                destination_port_label.setVisibleAtLowDetail(False)
                 destination_port_label.setPlainText(self._destination_port.shortName())
                 destination_port_label.setPos(self.mapToItem(self._destination_item, point2))
                 self._destination_port.setLabel(destination_port_label)
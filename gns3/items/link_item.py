@@ -21,6 +21,7 @@ Link items are graphical representation of a link on the QGraphicsScene
 """
 
 import math
+import sip
 from ..qt import QtCore, QtGui, QtWidgets, QtSvg, qslot
 
 from ..packet_capture import PacketCapture
@@ -54,6 +55,9 @@ class LinkItem(QtWidgets.QGraphicsPathItem):
     _draw_port_labels = False
     delete_link_item_signal = QtCore.pyqtSignal(str)
 
+    # Links to adjust at the end of the current drag step, None outside of a drag step
+    _deferred_adjust = None
+
     def __init__(self, source_item, source_port, destination_item, destination_port, link=None, adding_flag=False):
 
         super().__init__()
@@ -87,6 +91,9 @@ class LinkItem(QtWidgets.QGraphicsPathItem):
         # QGraphicsSvgItem to indicate a capture
         self._capturing_item = None
 
+        # offset of this link among the links between the same nodes
+        self._multilink = None
+
         if not self._adding_flag:
             # there is a destination
             self._link = link
@@ -383,7 +390,52 @@ class LinkItem(QtWidgets.QGraphicsPathItem):
             self.source = QtCore.QPointF(self.source + offset)
             self.destination = QtCore.QPointF(self.destination + offset)
 
+    @classmethod
+    def beginDeferredAdjust(cls):
+        """
+        Adjust the links only once at the end of a drag step, a link
+        between two moved nodes would be adjusted twice otherwise.
+        """
+
+        cls._deferred_adjust = {}
+
+    @classmethod
+    def endDeferredAdjust(cls):
+        """
+        Adjust the links moved since beginDeferredAdjust.
+        """
+
+        links = cls._deferred_adjust
+        cls._deferred_adjust = None
+        if links:
+            for link in links.values():
+                if not sip.isdeleted(link):
+                    link.adjust()
+
+    def scheduleAdjust(self):
+        """
+        Adjust the link now or at the end of the drag step.
+        """
+
+        if LinkItem._deferred_adjust is None:
+            self.adjust()
+        else:
+            LinkItem._deferred_adjust[id(self)] = self
+
+    def invalidateMultiLink(self):
+        """
+        Compute again the offset of this link on the next adjust.
+        """
+
+        self._multilink = None
+
     def _computeMultiLink(self):
+
+        if self._multilink is None:
+            self._multilink = self._computeMultiLinkOffset()
+        return self._multilink
+
+    def _computeMultiLinkOffset(self):
         # Multi-link management
         #
         # multi is the offset of the link
@@ -400,15 +452,12 @@ class LinkItem(QtWidgets.QGraphicsPathItem):
         elif not hasattr(self._destination_item, "node"):  # Could be temporary a qpointf during link creation
             multi = 0
         else:
-            multi = 0
-            link_items = self._source_item.links()
-            for link_item in link_items:
-                if link_item == self:
-                    break
-                if link_item.destinationItem().node().id() == self._destination_item.node().id():
-                    multi += 1
-                if link_item.sourceItem().node().id() == self._destination_item.node().id():
-                    multi += 1
+            # number of links added before this one between the two nodes
+            link_items = self._source_item.parallelLinks(self._destination_item.node().id())
+            if self in link_items:
+                multi = link_items.index(self)
+            else:
+                multi = 0
 
         # MAX 7 links on the scene between 2 nodes
         if multi > 7:
@@ -22,10 +22,11 @@ Graphical representation of a node on the QGraphicsScene.
 import sip
 
 from ..qt import QtCore, QtGui, QtWidgets, QtSvg, qslot
-from ..qt.qimage_svg_renderer import QImageSvgRenderer
+from ..qt.level_of_detail import LevelOfDetail, LevelOfDetailColorizeEffect
 from .note_item import NoteItem
 from ..symbol import Symbol
 from ..controller import Controller
+from ..symbol_renderer_pool import SymbolRendererPool
 
 
 import logging
@@ -50,7 +51,12 @@ class NodeItem(QtSvg.QGraphicsSvgItem):
         self._node = node
         # link items connected to this node item.
         self._links = []
+        # link items by identifier of the node at the other end
+        self._parallel_links = {}
         self._symbol = None
+        # Renderer acquired from the SymbolRendererPool
+        self._renderer = None
+        self._removed = False
 
         # says if the attached node has been initialized
         # by the server.
@@ -63,11 +69,9 @@ class NodeItem(QtSvg.QGraphicsSvgItem):
         self.setZValue(self._node.z())
 
         # Temporary symbol during loading
-        renderer = QImageSvgRenderer(":/icons/reload.svg")
-        renderer.setObjectName("symbol_loading")
-        self.setSharedRenderer(renderer)
+        self.setSharedRenderer(SymbolRendererPool.instance().placeholder())
 
-        effect = QtWidgets.QGraphicsColorizeEffect()
+        effect = LevelOfDetailColorizeEffect()
         effect.setColor(QtGui.QColor("black"))
         effect.setStrength(0.8)
         self.setGraphicsEffect(effect)
@@ -133,9 +137,7 @@ class NodeItem(QtSvg.QGraphicsSvgItem):
             self._symbol = symbol
 
             # Temporary symbol during loading
-            renderer = QImageSvgRenderer(":/icons/reload.svg")
-            renderer.setObjectName("symbol_loading")
-            self.setSharedRenderer(renderer)
+            self.releaseRenderer()
 
             Controller.instance().getStatic(Symbol(symbol_id=symbol).url(), self._symbolLoadedCallback)
 
@@ -144,9 +146,13 @@ class NodeItem(QtSvg.QGraphicsSvgItem):
 
     @qslot
     def _symbolLoadedCallback(self, path, *args):
-        renderer = QImageSvgRenderer(path, fallback=":/icons/cancel.svg")
-        renderer.setObjectName(path)
+        if self._removed:
+            return
+        renderer = SymbolRendererPool.instance().acquire(path)
         self.setSharedRenderer(renderer)
+        if self._renderer is not None:
+            SymbolRendererPool.instance().release(self._renderer)
+        self._renderer = renderer
         if self._node.settings().get("symbol") != self._symbol:
             self.updateNode()
         if not self._initialized:
@@ -154,6 +160,16 @@ class NodeItem(QtSvg.QGraphicsSvgItem):
             self._initialized = True
             self.updateNode()
 
+    def releaseRenderer(self):
+        """
+        Display the loading symbol and release the renderer of the symbol.
+        """
+
+        self.setSharedRenderer(SymbolRendererPool.instance().placeholder())
+        if self._renderer is not None:
+            SymbolRendererPool.instance().release(self._renderer)
+            self._renderer = None
+
     def node(self):
         """
         Returns the node attached to this node item.
@@ -178,6 +194,7 @@ class NodeItem(QtSvg.QGraphicsSvgItem):
 
         if not sip.isdeleted(link_item):
             self._links.append(link_item)
+            self._parallel_links.setdefault(self._otherNodeId(link_item), []).append(link_item)
             link_item.link().delete_link_signal.connect(self._removeLink)
             link_item.link().updated_link_signal.connect(self._linkUpdatedSlot)
             self._node.updated_signal.emit()
@@ -200,8 +217,44 @@ class NodeItem(QtSvg.QGraphicsSvgItem):
         for link_item in self._links:
             if link_item.link().id() == link_id:
                 self._links.remove(link_item)
+                self._removeParallelLink(link_item)
                 return
 
+    def _otherNodeId(self, link_item):
+        """
+        :returns: Identifier of the node at the other end of a link item
+        """
+
+        if link_item.sourceItem() is self:
+            return link_item.destinationItem().node().id()
+        return link_item.sourceItem().node().id()
+
+    def _removeParallelLink(self, link_item):
+
+        node_id = self._otherNodeId(link_item)
+        parallel_links = self._parallel_links.get(node_id, [])
+        if link_item not in parallel_links:
+            return
+        index = parallel_links.index(link_item)
+        parallel_links.remove(link_item)
+        if not parallel_links:
+            del self._parallel_links[node_id]
+        # the next links take the place of the removed link
+        for other_link_item in parallel_links[index:]:
+            if not sip.isdeleted(other_link_item):
+                other_link_item.invalidateMultiLink()
+                other_link_item.adjust()
+
+    def parallelLinks(self, node_id):
+        """
+        Returns the link items between this node item and another node.
+
+        :param node_id: Identifier of the other node
+        :returns: list of LinkItem instances, in the order they have been added
+        """
+
+        return self._parallel_links.get(node_id, [])
+
     def links(self):
         """
         Returns all the link items attached to this node item.
@@ -471,10 +524,16 @@ class NodeItem(QtSvg.QGraphicsSvgItem):
                 self.graphicsEffect().setEnabled(False)
                 self.updateNode()
 
-        # adjust link item positions when this node is moving or has changed.
-        if change == QtWidgets.QGraphicsItem.ItemPositionChange or change == QtWidgets.QGraphicsItem.ItemPositionHasChanged:
+        # the symbol renderer is not needed anymore when the item is removed from the scene
+        if change == QtWidgets.QGraphicsItem.ItemSceneHasChanged and value is None:
+            self._removed = True
+            self.releaseRenderer()
+
+        # adjust link item positions when this node has moved, before the move the links
+        # would be computed with the previous position.
+        if change == QtWidgets.QGraphicsItem.ItemPositionHasChanged:
             for link in self._links:
-                link.adjust()
+                link.scheduleAdjust()
 
         return super().itemChange(change, value)
 
@@ -487,6 +546,12 @@ class NodeItem(QtSvg.QGraphicsSvgItem):
         :param widget: QWidget instance
         """
 
+        if LevelOfDetail.isLow(painter):
+            # zoomed out, the symbol is drawn from a small cached pixmap
+            brect = self.boundingRect()
+            painter.drawPixmap(brect, LevelOfDetail.symbolPixmap(self.renderer(), brect), QtCore.QRectF())
+            return
+
         # don't show the selection rectangle
         if not self._settings["draw_rectangle_selected_item"]:
             option.state = QtWidgets.QStyle.State_None
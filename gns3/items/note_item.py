@@ -20,6 +20,7 @@ Graphical representation of a note on the QGraphicsScene.
 """
 
 from ..qt import QtCore, QtWidgets, QtGui
+from ..qt.level_of_detail import LevelOfDetail
 from .utils import colorFromSvg
 
 
@@ -49,6 +50,7 @@ class NoteItem(QtWidgets.QGraphicsTextItem):
         self.setFlag(self.ItemIsSelectable)
         self.setZValue(2)
         self._editable = True
+        self._visible_at_low_detail = True
 
     def delete(self):
         """
@@ -64,6 +66,15 @@ class NoteItem(QtWidgets.QGraphicsTextItem):
 
         Topology.instance().removeNote(self)
 
+    def setVisibleAtLowDetail(self, visible):
+        """
+        Draws or not this note when the scene is zoomed out.
+
+        :param visible: boolean
+        """
+
+        self._visible_at_low_detail = visible
+
     def editable(self):
         """
         Returns either the note is editable or not.
@@ -156,6 +167,9 @@ class NoteItem(QtWidgets.QGraphicsTextItem):
         :param widget: QWidget instance
         """
 
+        if not self._visible_at_low_detail and LevelOfDetail.isLow(painter):
+            return
+
         super().paint(painter, option, widget)
 
         if self.show_layer is False or self.parentItem():
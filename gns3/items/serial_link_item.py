@@ -21,6 +21,7 @@ Graphical representation of a Serial link on the QGraphicsScene.
 
 import math
 from ..qt import QtCore, QtGui, QtWidgets
+from ..qt.level_of_detail import LevelOfDetail
 from .link_item import LinkItem
 from .note_item import NoteItem
 from ..ports.port import Port
@@ -105,6 +106,13 @@ class SerialLinkItem(LinkItem):
         :param widget: QWidget instance.
         """
 
+        if LevelOfDetail.isLow(painter):
+            # zoomed out, only the line is visible
+            painter.setRenderHint(QtGui.QPainter.Antialiasing, False)
+            QtWidgets.QGraphicsPathItem.paint(self, painter, option, widget)
+            self._drawCaptureSymbol()
+            return
+
         QtWidgets.QGraphicsPathItem.paint(self, painter, option, widget)
 
         if not self._adding_flag and self._settings["draw_link_status_points"]:
@@ -131,6 +139,7 @@ class SerialLinkItem(LinkItem):
             source_port_label = self._source_port.label()
             if source_port_label is None:
                 source_port_label = NoteItem(self._source_item)
+                source_port_label.setVisibleAtLowDetail(False)
                 source_port_label.setPlainText(self._source_port.shortName())
                 source_port_label.setPos(self.mapToItem(self._source_item, self.source))
                 self._source_port.setLabel(source_port_label)
@@ -161,6 +170,7 @@ class SerialLinkItem(LinkItem):
 
             if destination_port_label is None:
                 destination_port_label = NoteItem(self._destination_item)
+                destination_port_label.setVisibleAtLowDetail(False)
                 destination_port_label.setPlainText(self._destination_port.shortName())
                 destination_port_label.setPos(self.mapToItem(self._destination_item, self.destination))
                 self._destination_port.setLabel(destination_port_label)
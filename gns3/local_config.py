@@ -20,6 +20,7 @@ import os
 import json
 import shutil
 import copy
+import itertools
 
 import psutil
 
@@ -27,6 +28,7 @@ from .qt import QtCore, QtWidgets, qslot
 from .version import __version__
 from .utils import parse_version
 from .controller import Controller
+from .settings_view import SettingsView
 
 import logging
 log = logging.getLogger(__name__)
@@ -42,6 +44,15 @@ class LocalConfig(QtCore.QObject):
     # When this signal is emit the config is saved on controller
     save_on_controller_signal = QtCore.Signal()
 
+    # Delay in milliseconds to write the changes made in a row at once
+    WRITE_DELAY = 500
+
+    # Sections saved on the controller, they are not user specific
+    CONTROLLER_SECTIONS = ["Builtin", "Docker", "IOU", "Qemu", "VMware", "VPCS", "VirtualBox", "GraphicsView", "Dynamips"]
+
+    # Versions of the settings, shared by the instances so a version is never reused
+    _versions = itertools.count(1)
+
     def __init__(self, config_file=None):
         """
         :param config_file: Path to the config file (override all other config, usefull for tests)
@@ -53,24 +64,84 @@ class LocalConfig(QtCore.QObject):
         # Security to avoid pushing to the controller settings before
         # we get the original settings from controller
         self._settings_retrieved_from_controller = False
+        self._refreshing_settings = False
+        self._refresh_settings_again = False
+        self._watcher = None
+        # Sections changed since the last write of the file
+        self._dirty_sections = set()
+        # Sections changed since the last save on the controller
+        self._controller_dirty_sections = set()
+        self._write_timer = QtCore.QTimer(self)
+        self._write_timer.setSingleShot(True)
+        self._write_timer.setInterval(self.WRITE_DELAY)
+        self._write_timer.timeout.connect(self.flush)
+        # Version of the last change of the settings
+        self._version = 0
+        self._section_versions = {}
+        # Version of the last reload of all the sections
+        self._reset_version = 0
+        # Section => last SettingsView
+        self._views = {}
         self._migrateOldConfigPath()
         self._resetLoadConfig()
-        self._monitoring_changes = False
         Controller.instance().connected_signal.connect(self.refreshConfigFromController)
         self.save_on_controller_signal.connect(self._saveOnController)
 
-    def _monitorChanges(self):
+    def watchConfigChanges(self):
+        """
+        Watch the config file for changes made by another GNS3 GUI.
+
+        The file is replaced by a rename when it's written, this remove
+        it from the watcher. That's why we also watch the directory
+        and add the file again after each change.
+        """
+
+        if self._watcher is None:
+            self._watcher = QtCore.QFileSystemWatcher(self)
+            self._watcher.fileChanged.connect(self._configPathChangedSlot)
+            self._watcher.directoryChanged.connect(self._configPathChangedSlot)
+
+            # A write generate several events in a row
+            self._watcher_timer = QtCore.QTimer(self)
+            self._watcher_timer.setSingleShot(True)
+            self._watcher_timer.setInterval(100)
+            self._watcher_timer.timeout.connect(self._watchedConfigChangedSlot)
+
+            # Settings from the controller are pushed by the settings.updated
+            # notification, but only when a project is opened
+            app = QtWidgets.QApplication.instance()
+            if app:
+                app.applicationStateChanged.connect(self._applicationStateChangedSlot)
+        self._updateWatchedPaths()
+
+    def _updateWatchedPaths(self):
         """
-        Poll the remote server waiting for settings update
+        Watch the current config file and its directory
         """
-        if self._monitoring_changes:
+
+        if self._watcher is None:
             return
-        self._monitoring_changes = True
-        self._timer = QtCore.QTimer()
-        self._timer.setInterval(5000)
-        self._refreshingSettings = False
-        self._timer.timeout.connect(self.refreshConfigFromController)
-        self._timer.start()
+        paths = self._watcher.files() + self._watcher.directories()
+        if paths:
+            self._watcher.removePaths(paths)
+        for path in (os.path.dirname(self._config_file), self._config_file):
+            if os.path.exists(path):
+                self._watcher.addPath(path)
+
+    def _configPathChangedSlot(self, path):
+
+        self._watcher_timer.start()
+
+    def _watchedConfigChangedSlot(self):
+
+        if self._config_file not in self._watcher.files() and os.path.exists(self._config_file):
+            self._watcher.addPath(self._config_file)
+        self.checkConfigChanged()
+
+    def _applicationStateChangedSlot(self, state):
+
+        if state == QtCore.Qt.ApplicationActive:
+            self.refreshConfigFromController()
 
     def _resetLoadConfig(self):
         """
@@ -78,7 +149,10 @@ class LocalConfig(QtCore.QObject):
 
         """
         self._settings = {}
+        self._bumpVersion()
         self._last_config_changed = None
+        # ETag of the last settings received from the controller
+        self._controller_settings_etag = None
         if sys.platform.startswith("win"):
             filename = "gns3_gui.ini"
         else:
@@ -119,6 +193,7 @@ class LocalConfig(QtCore.QObject):
         self._settings.update(user_settings)
         self._migrateOldConfig()
         self.writeConfig()
+        self._updateWatchedPaths()
 
     def profile(self):
         """
@@ -127,6 +202,8 @@ class LocalConfig(QtCore.QObject):
         return self._profile
 
     def setProfile(self, profile):
+        # The pending changes belong to the previous profile
+        self.flush()
         previous_profile = self._profile
         if profile == "default":
             self._profile = None
@@ -142,24 +219,55 @@ class LocalConfig(QtCore.QObject):
         Refresh the configuration from the controller
         """
         controller = Controller.instance()
-        if controller.connected():
-            self._refreshingSettings = True
-            controller.get("/settings", self._getSettingsCallback, showProgress=False)
-        self._monitorChanges()
-
-    def _getSettingsCallback(self, result, error=False, **kwargs):
-        self._refreshingSettings = False
+        if not controller.connected():
+            return
+        if self._refreshing_settings:
+            # The settings could have changed after the controller answered the current query
+            self._refresh_settings_again = True
+            return
+        self._refreshing_settings = True
+        headers = {}
+        if self._controller_settings_etag:
+            headers["If-None-Match"] = self._controller_settings_etag
+        controller.get("/settings", self._getSettingsCallback, showProgress=False, headers=headers)
+
+    def _getSettingsCallback(self, result, error=False, headers={}, status=None, **kwargs):
+        self._refreshing_settings = False
+        if self._refresh_settings_again:
+            self._refresh_settings_again = False
+            self.refreshConfigFromController()
+            return
         if error:
             log.error("Can't get settings from controller")
             return
+
+        if status == 304:
+            # Not modified since the last query, the body is empty
+            self._settings_retrieved_from_controller = True
+            return
+
+        etag = headers.get("etag")
+        if etag is not None:
+            if etag == self._controller_settings_etag:
+                # Not modified since the last query
+                self._settings_retrieved_from_controller = True
+                return
+            self._controller_settings_etag = etag
+
         if result == {} and self._settings != {}:
             self._settings_retrieved_from_controller = True
+            # The controller has no settings, send all of them
+            self._controller_dirty_sections.update(section for section in self._settings if self._isControllerSection(section))
             self.save_on_controller_signal.emit()
             return
 
         # The server return an uuid to keep track of settings version
         if self._settings.get("modification_uuid") != result.get("modification_uuid"):
             self._settings.update(result)
+            for section in result:
+                self._bumpVersion(section)
+            # The controller has the last version of its sections
+            self._controller_dirty_sections = set()
             # Update already loaded section
             for section in self._settings.keys():
                 if isinstance(self._settings[section], dict):
@@ -275,6 +383,8 @@ class LocalConfig(QtCore.QObject):
                 self._last_config_changed = os.stat(config_path).st_mtime
                 config = json.load(f)
                 self._settings.update(config)
+                for section in config:
+                    self._bumpVersion(section)
         except (ValueError, OSError) as e:
             log.error("Could not read the config file {}: {}".format(self._config_file, e))
 
@@ -285,11 +395,78 @@ class LocalConfig(QtCore.QObject):
 
         return dict()
 
+    @staticmethod
+    def _isControllerSection(section):
+
+        return section in LocalConfig.CONTROLLER_SECTIONS or section == "Server"
+
+    def _bumpVersion(self, section=None):
+        """
+        Called when a section is replaced.
+
+        :param section: section name, None for all the sections
+        """
+
+        self._version = next(LocalConfig._versions)
+        if section is None:
+            self._reset_version = self._version
+            self._section_versions = {}
+        else:
+            self._section_versions[section] = self._version
+
+    def version(self):
+        """
+        :returns: Version of the settings, it changes each time a section is changed
+        """
+
+        return self._version
+
+    def sectionVersion(self, section):
+        """
+        :returns: Version of a section, it changes each time the section is changed
+        """
+
+        return max(self._section_versions.get(section, 0), self._reset_version)
+
+    def _sectionChanged(self, section):
+        """
+        Schedules the write of a changed section. The sections
+        changed before the end of the delay are written together.
+
+        :param section: section name
+        """
+
+        self._bumpVersion(section)
+        self._dirty_sections.add(section)
+        if self._isControllerSection(section):
+            self._controller_dirty_sections.add(section)
+        if not self._write_timer.isActive():
+            self._write_timer.start()
+
+    def dirtySections(self):
+        """
+        :returns: Sections changed but not written yet
+        """
+
+        return set(self._dirty_sections)
+
+    def flush(self):
+        """
+        Writes the pending changes now, called before exiting.
+        """
+
+        if self._dirty_sections:
+            self.writeConfig()
+
     def writeConfig(self):
         """
         Write the configuration file.
         """
 
+        self._write_timer.stop()
+        if self._dirty_sections:
+            log.debug("Write the changed sections %s", ", ".join(sorted(self._dirty_sections)))
+            self._dirty_sections = set()
         self._settings["version"] = __version__
         try:
             temporary = os.path.join(os.path.dirname(self._config_file), "gns3_gui.tmp")
@@ -308,16 +485,21 @@ class LocalConfig(QtCore.QObject):
         Save some settings on controller for the transition from
         GUI to a central controller. Will be removed later
         """
+        if not self._controller_dirty_sections:
+            # Only user specific sections have changed
+            return
         if Controller.instance().connected() and self._settings_retrieved_from_controller:
-            # We save only non user specific sections
-            section_to_save_on_controller = ["Builtin", "Docker", "IOU", "Qemu", "VMware", "VPCS", "VirtualBox", "GraphicsView", "Dynamips"]
+            # The controller replaces all its settings, the sections
+            # not changed are sent with the changed sections
             controller_settings = {}
             for key, val in self._settings.items():
-                if key in section_to_save_on_controller:
+                if key in self.CONTROLLER_SECTIONS:
                     controller_settings[key] = val
                 # We want only the VM settings on the server
-                elif key == "Server":
-                    controller_settings["Server"]["vm"] = self._settings["Server"]["vm"]
+                elif key == "Server" and "vm" in val:
+                    controller_settings["Server"] = {"vm": val["vm"]}
+            log.debug("Save the changed sections %s on the controller", ", ".join(sorted(self._controller_dirty_sections)))
+            self._controller_dirty_sections = set()
             Controller.instance().post("/settings", None, body=controller_settings)
 
     def checkConfigChanged(self):
@@ -325,7 +507,10 @@ class LocalConfig(QtCore.QObject):
         try:
             if self._last_config_changed and self._last_config_changed < os.stat(self._config_file).st_mtime:
                 log.info("Client config has changed, reloading it...")
+                # Keep the changes not written yet
+                pending = {section: self._settings[section] for section in self._dirty_sections if section in self._settings}
                 self._readConfig(self._config_file)
+                self._settings.update(pending)
                 self.config_changed_signal.emit()
         except OSError as e:
             log.error("Error when checking for changes {}: {}".format(self._config_file, str(e)))
@@ -346,6 +531,8 @@ class LocalConfig(QtCore.QObject):
         :returns: path to the config file.
         """
 
+        # The pending changes belong to the previous file
+        self.flush()
         self._config_file = config_file
         self._resetLoadConfig()
 
@@ -366,8 +553,10 @@ class LocalConfig(QtCore.QObject):
         """
 
         if self._settings != settings:
+            for section, value in settings.items():
+                if self._settings.get(section) != value:
+                    self._sectionChanged(section)
             self._settings.update(settings)
-            self.writeConfig()
             self.config_changed_signal.emit()
 
     def loadSectionSettings(self, section, default_settings):
@@ -379,7 +568,7 @@ class LocalConfig(QtCore.QObject):
         :returns: settings (dict)
         """
 
-        settings = self.settings().get(section, dict())
+        settings = copy.deepcopy(self._settings.get(section, dict()))
         changed = False
 
         def _copySettings(local, default):
@@ -399,13 +588,54 @@ class LocalConfig(QtCore.QObject):
             return local
 
         settings = _copySettings(settings, default_settings)
+        if not changed:
+            if section not in self._settings:
+                self._settings[section] = settings
+                return copy.deepcopy(settings)
+            # The settings are a copy of the section
+            return settings
+
         self._settings[section] = settings
+        log.info("Section %s has missing default values. Adding keys %s Saving configuration", section, ','.join(set(default_settings.keys()) - set(settings.keys())))
+        self._sectionChanged(section)
+        return copy.deepcopy(settings)
 
-        if changed:
-            log.info("Section %s has missing default values. Adding keys %s Saving configuration", section, ','.join(set(default_settings.keys()) - set(settings.keys())))
-            self.writeConfig()
+    @staticmethod
+    def _missingDefaults(settings, default_settings):
 
-        return copy.deepcopy(settings)
+        if not isinstance(settings, dict):
+            return True
+        for name, value in default_settings.items():
+            if name not in settings:
+                return True
+            if isinstance(value, dict) and LocalConfig._missingDefaults(settings[name], value):
+                return True
+        return False
+
+    def sectionView(self, section, default_settings=None):
+        """
+        Get a read-only view of a section, without copying it. The view
+        can be kept, it's not modified when the section changes. Use
+        loadSectionSettings to get settings that will be modified.
+
+        :param section: section name
+        :param default_settings: setting names and default values (dict)
+
+        :returns: SettingsView instance
+        """
+
+        if default_settings is not None and self._missingDefaults(self._settings.get(section), default_settings):
+            self.loadSectionSettings(section, default_settings)
+
+        version = self.sectionVersion(section)
+        view = self._views.get(section)
+        if view is None or view.version() != version:
+            settings = self._settings.get(section)
+            if not isinstance(settings, dict):
+                settings = {}
+            view = SettingsView(settings, version)
+            self._views[section] = view
+        return view
 
     def saveSectionSettings(self, section, settings):
         """
@@ -419,9 +649,12 @@ class LocalConfig(QtCore.QObject):
             self._settings[section] = {}
 
         if self._settings[section] != settings:
-            self._settings[section].update(copy.deepcopy(settings))
+            # The section is replaced, the views of the previous version are not modified
+            section_settings = dict(self._settings[section])
+            section_settings.update(copy.deepcopy(settings))
+            self._settings[section] = section_settings
             log.info("Section %s has changed. Saving configuration", section)
-            self.writeConfig()
+            self._sectionChanged(section)
         else:
             log.debug("Section %s has not changed. Skip saving configuration", section)
 
@@ -431,7 +664,7 @@ class LocalConfig(QtCore.QObject):
         """
 
         from gns3.settings import GENERAL_SETTINGS
-        return self.loadSectionSettings("MainWindow", GENERAL_SETTINGS)["experimental_features"]
+        return self.sectionView("MainWindow", GENERAL_SETTINGS)["experimental_features"]
 
     def hdpi(self):
         """
@@ -439,7 +672,7 @@ class LocalConfig(QtCore.QObject):
         """
 
         from gns3.settings import GENERAL_SETTINGS
-        return self.loadSectionSettings("MainWindow", GENERAL_SETTINGS)["hdpi"]
+        return self.sectionView("MainWindow", GENERAL_SETTINGS)["hdpi"]
 
     def multiProfiles(self):
         """
@@ -447,7 +680,7 @@ class LocalConfig(QtCore.QObject):
         """
 
         from gns3.settings import GENERAL_SETTINGS
-        return self.loadSectionSettings("MainWindow", GENERAL_SETTINGS)["multi_profiles"]
+        return self.sectionView("MainWindow", GENERAL_SETTINGS)["multi_profiles"]
 
     def setMultiProfiles(self, value):
         from gns3.settings import GENERAL_SETTINGS
@@ -30,13 +30,14 @@ import signal
 import subprocess
 
 
-from gns3.qt import QtWidgets, QtCore
-from gns3.settings import LOCAL_SERVER_SETTINGS
+from gns3.qt import QtWidgets, QtCore, qpartial
+from gns3.settings import LOCAL_SERVER_SETTINGS, GENERAL_SETTINGS
 from gns3.local_config import LocalConfig
 from gns3.local_server_config import LocalServerConfig
-from gns3.utils.wait_for_connection_worker import WaitForConnectionWorker
+from gns3.utils.server_probe import ServerProbe
 from gns3.utils.progress_dialog import ProgressDialog
-from gns3.utils.http import getSynchronous
+from gns3.utils.phase_timer import PhaseTimer
+from gns3.utils.process_output_reader import ProcessOutputReader
 from gns3.utils.sudo import sudo
 from gns3.http_client import HTTPClient
 from gns3.controller import Controller
@@ -85,6 +86,11 @@ class LocalServer(QtCore.QObject):
         self._server_started_by_me = False
         self._local_server_path = ""
         self._local_server_process = None
+        self._output_reader = None
+        # Callbacks waiting for the end of the auto start, None when not starting
+        self._auto_start_callbacks = None
+        # Probes waiting for an answer
+        self._probes = set()
 
         super().__init__()
         self._parent = parent
@@ -298,6 +304,8 @@ class LocalServer(QtCore.QObject):
         """
         Kill a running zombie server (started by a gui that no longer exists)
         This will not kill server started by hand.
+
+        :returns: True if a server has been killed
         """
         try:
             if os.path.exists(self._pid_path()):
@@ -306,22 +314,42 @@ class LocalServer(QtCore.QObject):
                 process = psutil.Process(pid=pid)
                 log.info("Kill already running server with PID %d", pid)
                 process.kill()
+                return True
         except (OSError, ValueError, psutil.NoSuchProcess, psutil.AccessDenied):
             # Permission issue, or process no longer exists, or file is empty
-            return
+            pass
+        return False
 
-    def localServerAutoStartIfRequire(self):
+    def localServerAutoStartIfRequire(self, callback=None):
         """
-        Try to start the embed gns3 server.
+        Try to start the embed gns3 server. The local server is probed
+        without blocking the GUI and the startup continues from the
+        answers of the probes.
+
+        :param callback: Called with True when the controller can be used, False otherwise
         """
 
+        if self._auto_start_callbacks is not None:
+            # The startup is already in progress
+            self._auto_start_callbacks.append(callback)
+            return
+        self._auto_start_callbacks = [callback]
+
         if not self.shouldLocalServerAutoStart():
             self._http_client = HTTPClient(self._settings)
             Controller.instance().setHttpClient(self._http_client)
+            self._autoStartDone(True)
             return
 
-        if self.isLocalServerRunning() and self._server_started_by_me:
-            return True
+        timer = PhaseTimer("Local server startup")
+        self.checkLocalServerRunning(qpartial(self._autoStartProbedCallback, timer, False))
+
+    def _autoStartProbedCallback(self, timer, killed, running):
+
+        timer.phase("probe")
+        if running and self._server_started_by_me:
+            self._autoStartDone(True)
+            return
 
         # We check if two gui are not launched at the same time
         # to avoid killing the server of the other GUI
@@ -329,36 +357,66 @@ class LocalServer(QtCore.QObject):
             log.info("Not the main GUI, will not auto start the server")
             self._http_client = HTTPClient(self._settings)
             Controller.instance().setHttpClient(self._http_client)
-            return True
+            self._autoStartDone(True)
+            return
 
-        if self.isLocalServerRunning():
+        if running and not killed:
             log.info("A local server already running on this host")
             # Try to kill the server. The server can be still running after
             # if the server was started by hand
-            self._killAlreadyRunningServer()
+            if self._killAlreadyRunningServer():
+                timer.phase("kill")
+                self.checkLocalServerRunning(qpartial(self._autoStartProbedCallback, timer, True))
+                return
 
-        if not self.isLocalServerRunning():
+        if not running:
             if not self.initLocalServer():
                 QtWidgets.QMessageBox.critical(self.parent(), "Local server", "Could not start the local server process: {}".format(self._settings["path"]))
-                return False
+                self._autoStartDone(False)
+                return
+            timer.phase("init")
             if not self.startLocalServer():
                 QtWidgets.QMessageBox.critical(self.parent(), "Local server", "Could not start the local server process: {}".format(self._settings["path"]))
-                return False
+                self._autoStartDone(False)
+                return
+            timer.phase("process start")
 
         if self.parent():
-            worker = WaitForConnectionWorker(self._settings["host"], self._port)
+            worker = self._serverProbe(timeout=30, process=self._local_server_process)
             progress_dialog = ProgressDialog(worker,
                                              "Local server",
                                              "Connecting to server {} on port {}...".format(self._settings["host"], self._port),
-                                             "Cancel", busy=True, parent=self.parent())
+                                             "Cancel", busy=True, parent=self.parent(), create_thread=False)
+            worker.finished.connect(qpartial(self._autoStartConnectedSlot, timer, worker, True))
+            worker.error.connect(qpartial(self._autoStartConnectedSlot, timer, worker, False))
+            progress_dialog.canceled.connect(qpartial(self._autoStartConnectedSlot, timer, worker, False))
             progress_dialog.show()
-            if not progress_dialog.exec_():
-                return False
+        else:
+            self._autoStartConnectedSlot(timer, None, True)
+
+    def _autoStartConnectedSlot(self, timer, worker, connected, *args):
+
+        if self._auto_start_callbacks is None:
+            # Already called by another signal of the worker
+            return
+        if not connected:
+            self._autoStartDone(False)
+            return
+        if worker is not None:
+            timer.phase("wait for server ({} attempts)".format(worker.attempts()))
+        timer.log()
         self._server_started_by_me = True
         self._http_client = HTTPClient(self._settings)
         Controller.instance().setHttpClient(self._http_client)
+        self._autoStartDone(True)
 
-        return True
+    def _autoStartDone(self, result):
+
+        callbacks = self._auto_start_callbacks or []
+        self._auto_start_callbacks = None
+        for callback in callbacks:
+            if callback is not None:
+                callback(result)
 
     def initLocalServer(self):
         """
@@ -471,26 +529,44 @@ class LocalServer(QtCore.QObject):
         try:
             if sys.platform.startswith("win"):
                 # use the string on Windows
-                self._local_server_process = subprocess.Popen(command, creationflags=subprocess.CREATE_NEW_PROCESS_GROUP, stderr=subprocess.PIPE)
+                self._local_server_process = subprocess.Popen(command, creationflags=subprocess.CREATE_NEW_PROCESS_GROUP, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
             else:
                 # use arguments on other platforms
                 args = shlex.split(command)
-                self._local_server_process = subprocess.Popen(args, stderr=subprocess.PIPE)
+                self._local_server_process = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
         except (OSError, subprocess.SubprocessError) as e:
             log.warning('Could not start local server "{}": {}'.format(command, e))
             return False
 
         log.info("Local server process has started (PID={})".format(self._local_server_process.pid))
+
+        # The output must be read otherwise the server blocks when the pipe is full
+        general_settings = LocalConfig.instance().sectionView("MainWindow", GENERAL_SETTINGS)
+        self._output_reader = ProcessOutputReader(self._local_server_process.stdout,
+                                                  "Local server",
+                                                  log_rate=general_settings["local_server_output_log_rate"],
+                                                  parent=self)
+        self._output_reader.start()
         return True
 
+    def localServerOutput(self):
+        """
+        :returns: The last lines written by the local server on its output
+        """
+
+        if self._output_reader is None:
+            return ""
+        return self._output_reader.text()
+
     def _checkLocalServerRunningSlot(self):
         if self._local_server_process and not self._stopping:
             if not self.localServerProcessIsRunning():
                 log.error("Local server process has stopped")
-                try:
-                    log.error(self._local_server_process.stderr.read().decode())
-                except (OSError, UnicodeDecodeError):
-                    pass
+                if self._output_reader:
+                    self._output_reader.join(timeout=1)
+                    lines = self._output_reader.lines()[-20:]
+                    if lines:
+                        log.error("\n".join(lines))
                 self._local_server_process = None
 
     def localServerProcessIsRunning(self):
@@ -507,28 +583,40 @@ class LocalServer(QtCore.QObject):
             pass
         return False
 
-    def isLocalServerRunning(self):
+    def _serverProbe(self, **kwargs):
+        """
+        :returns: ServerProbe for the local server
         """
-        Synchronous check if a server is already running on this host.
 
-        :returns: boolean
+        return ServerProbe(self._settings["protocol"],
+                           self._settings["host"],
+                           self._port,
+                           user=self._settings["user"],
+                           password=self._settings["password"],
+                           pid_path=self._pid_path(),
+                           **kwargs)
+
+    def checkLocalServerRunning(self, callback):
         """
+        Check if a server is already running on this host without
+        blocking the GUI.
 
-        status, json_data = getSynchronous(self._settings["protocol"], self._settings["host"], self._port, "version",
-                                           timeout=2, user=self._settings["user"], password=self._settings["password"])
+        :param callback: Called with True if a GNS3 server answers
+        """
 
-        if status == 401:  # Auth issue that need to be solved later
-            return True
-        elif json_data is None:
-            return False
-        elif status != 200:
-            return False
-        else:
-            version = json_data.get("version", None)
-            if version is None:
-                log.debug("Server is not a GNS3 server")
-                return False
-        return True
+        probe = self._serverProbe(timeout=ServerProbe.REQUEST_TIMEOUT, max_attempts=1)
+        # Keep a reference until the answer
+        self._probes.add(probe)
+        probe.finished.connect(qpartial(self._probeDoneSlot, probe, callback))
+        probe.error.connect(qpartial(self._probeDoneSlot, probe, callback))
+        probe.run()
+
+    def _probeDoneSlot(self, probe, callback, *args):
+
+        if probe not in self._probes:
+            return
+        self._probes.discard(probe)
+        callback(probe.isGNS3Server())
 
     def stopLocalServer(self, wait=False):
         """
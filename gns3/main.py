@@ -56,6 +56,7 @@ from gns3.main_window import MainWindow
 from gns3.logger import init_logger
 from gns3.crash_report import CrashReport
 from gns3.local_config import LocalConfig
+from gns3.controller import Controller
 from gns3.application import Application
 from gns3.utils import parse_version
 from gns3.dialogs.profile_select import ProfileSelectDialog
@@ -172,6 +173,14 @@ def main():
             # then print the exception on stderr too.
             print("".join(lines), file=sys.stderr)
 
+        # write the settings changed just before the crash
+        local_config = getattr(LocalConfig, "_instance", None)
+        if local_config is not None:
+            try:
+                local_config.flush()
+            except Exception as e:
+                print("Could not save the settings: {}".format(e))
+
         if exception is MemoryError:
             print("YOUR SYSTEM IS OUT OF MEMORY!")
         else:
@@ -224,6 +233,9 @@ def main():
 
     global app
     app = Application(sys.argv, hdpi=local_config.hdpi())
+    # the settings are written after a delay, write them before exiting
+    app.aboutToQuit.connect(local_config.flush)
+    app.aboutToQuit.connect(Controller.instance().saveStaticCache)
 
     if local_config.multiProfiles() and not options.profile:
         profile_select = ProfileSelectDialog()
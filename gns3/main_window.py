@@ -27,7 +27,7 @@ import logging
 from .local_config import LocalConfig
 from .local_server import LocalServer
 from .modules import MODULES
-from .qt import QtGui, QtCore, QtWidgets, qslot
+from .qt import QtGui, QtCore, QtWidgets, qslot, qpartial
 from .controller import Controller
 from .node import Node
 from .ui.main_window_ui import Ui_MainWindow
@@ -97,9 +97,7 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
         self._start_time = time.time()
         local_config = LocalConfig.instance()
         local_config.config_changed_signal.connect(self._localConfigChangedSlot)
-        self._local_config_timer = QtCore.QTimer(self)
-        self._local_config_timer.timeout.connect(local_config.checkConfigChanged)
-        self._local_config_timer.start(1000)  # milliseconds
+        local_config.watchConfigChanges()
         self._analytics_client = AnalyticsClient()
 
         # restore the geometry and state of the main window.
@@ -255,6 +253,9 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
         # new appliance button
         self.uiNewAppliancePushButton.clicked.connect(self._newApplianceActionSlot)
 
+        # filter of the templates while typing
+        self.uiNodesFilterLineEdit.textChanged.connect(self.uiNodesView.setFilterText)
+
         # connect the signal to the view
         self.adding_link_signal.connect(self.uiGraphicsView.addingLinkSlot)
 
@@ -787,9 +788,15 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
             setup_wizard.show()
             res = setup_wizard.exec_()
             # start and connect to the local server if needed
-            LocalServer.instance().localServerAutoStartIfRequire()
-            if res:
-                self._newApplianceActionSlot()
+            LocalServer.instance().localServerAutoStartIfRequire(qpartial(self._setupWizardLocalServerStartedCallback, res))
+
+    def _setupWizardLocalServerStartedCallback(self, res, started):
+        """
+        Called when the local server is started after the setup wizard.
+        """
+
+        if res:
+            self._newApplianceActionSlot()
 
     def _aboutQtActionSlot(self):
         """
@@ -848,7 +855,7 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
         else:
             self.uiNodesDockWidget.setWindowTitle(title)
             self.uiNodesDockWidget.setVisible(True)
-            self.uiNodesView.clear()
+            self.uiNodesFilterLineEdit.clear()
             self.uiNodesView.populateNodesView(category)
 
     def _localConfigChangedSlot(self):
@@ -856,7 +863,9 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
         Called when the local config change
         """
 
-        self.uiNodesView.refresh()
+        # The modules are connected to the signal after the main window,
+        # refresh once they have reloaded their templates
+        QtCore.QTimer.singleShot(0, self.uiNodesView.refresh)
 
     def _browseRoutersActionSlot(self):
         """
@@ -1028,12 +1037,7 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
             self._setupWizardActionSlot()
         else:
             # start and connect to the local server if needed
-            LocalServer.instance().localServerAutoStartIfRequire()
-            if self._open_file_at_startup:
-                self.loadPath(self._open_file_at_startup)
-                self._open_file_at_startup = None
-            elif Topology.instance().project() is None:
-                self._newProjectActionSlot()
+            LocalServer.instance().localServerAutoStartIfRequire(self._localServerStartedCallback)
 
         if self._settings["check_for_update"]:
             # automatic check for update every week (604800 seconds)
@@ -1044,6 +1048,17 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
                 self._settings["last_check_for_update"] = current_epoch
                 self.setSettings(self._settings)
 
+    def _localServerStartedCallback(self, started):
+        """
+        Called when the local server is started at startup.
+        """
+
+        if self._open_file_at_startup:
+            self.loadPath(self._open_file_at_startup)
+            self._open_file_at_startup = None
+        elif Topology.instance().project() is None:
+            self._newProjectActionSlot()
+
     def updateRecentProjectsSettings(self, project_id, project_name, project_path):
         """
         Updates the recent project settings.
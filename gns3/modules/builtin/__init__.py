@@ -101,9 +101,9 @@ class Builtin(Module):
 
     def _loadBuilinNodesPerType(self, node_dict, node_type, default_settings):
 
-        settings = LocalConfig.instance().settings()
-        if node_type in settings.get(self.__class__.__name__, {}):
-            for device in settings[self.__class__.__name__][node_type]:
+        settings = LocalConfig.instance().sectionView(self.__class__.__name__)
+        if node_type in settings:
+            for device in settings[node_type].copy():
                 name = device.get("name")
                 server = device.get("server")
                 key = "{server}:{name}".format(server=server, name=name)
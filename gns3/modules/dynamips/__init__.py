@@ -149,9 +149,9 @@ class Dynamips(Module):
         """
 
         self._ios_routers = {}
-        settings = LocalConfig.instance().settings()
-        if "routers" in settings.get(self.__class__.__name__, {}):
-            for router in settings[self.__class__.__name__]["routers"]:
+        settings = LocalConfig.instance().sectionView(self.__class__.__name__)
+        if "routers" in settings:
+            for router in settings["routers"].copy():
                 name = router.get("name")
                 server = router.get("server")
                 router["image"] = router.get("path", router["image"])  # for backward compatibility before version 1.3
@@ -79,9 +79,9 @@ class IOU(Module):
         """
 
         self._iou_devices = {}
-        settings = LocalConfig.instance().settings()
-        if "devices" in settings.get(self.__class__.__name__, {}):
-            for device in settings[self.__class__.__name__]["devices"]:
+        settings = LocalConfig.instance().sectionView(self.__class__.__name__)
+        if "devices" in settings:
+            for device in settings["devices"].copy():
                 name = device.get("name")
                 server = device.get("server")
                 key = "{server}:{name}".format(server=server, name=name)
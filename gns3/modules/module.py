@@ -37,7 +37,27 @@ class Module(QtCore.QObject):
     def __init__(self):
 
         super().__init__()
-        LocalConfig.instance().config_changed_signal.connect(self.configChangedSlot)
+        # Version of the settings section of the module when it was loaded
+        self._settings_version = None
+        LocalConfig.instance().config_changed_signal.connect(self._configChangedSlot)
+
+    def _configChangedSlot(self):
+        """
+        Reloads the settings of the module only if its section has changed.
+        """
+
+        local_config = LocalConfig.instance()
+        if self._settings_version == local_config.sectionVersion(self.__class__.__name__):
+            return
+        self.configChangedSlot()
+        self._settings_version = local_config.sectionVersion(self.__class__.__name__)
+
+    def settingsVersion(self):
+        """
+        :returns: Version of the settings section the module was loaded from, None if not reloaded yet
+        """
+
+        return self._settings_version
 
     def configChangedSlot(self):
         """
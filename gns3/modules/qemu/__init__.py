@@ -85,9 +85,9 @@ class Qemu(Module):
         """
 
         self._qemu_vms = {}
-        settings = LocalConfig.instance().settings()
-        if "vms" in settings.get(self.__class__.__name__, {}):
-            for vm in settings[self.__class__.__name__]["vms"]:
+        settings = LocalConfig.instance().sectionView(self.__class__.__name__)
+        if "vms" in settings:
+            for vm in settings["vms"].copy():
                 name = vm.get("name")
                 server = vm.get("server")
                 key = "{server}:{name}".format(server=server, name=name)
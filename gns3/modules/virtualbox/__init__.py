@@ -118,9 +118,9 @@ class VirtualBox(Module):
         """
 
         self._virtualbox_vms = {}
-        settings = LocalConfig.instance().settings()
-        if "vms" in settings.get(self.__class__.__name__, {}):
-            for vm in settings[self.__class__.__name__]["vms"]:
+        settings = LocalConfig.instance().sectionView(self.__class__.__name__)
+        if "vms" in settings:
+            for vm in settings["vms"].copy():
                 vmname = vm.get("vmname")
                 server = vm.get("server")
                 key = "{server}:{vmname}".format(server=server, vmname=vmname)
@@ -188,9 +188,9 @@ class VMware(Module):
 
         self._vmware_vms = {}
         local_config = LocalConfig.instance()
-        settings = local_config.settings()
-        if "vms" in settings.get(self.__class__.__name__, {}):
-            for vm in settings[self.__class__.__name__]["vms"]:
+        settings = local_config.sectionView(self.__class__.__name__)
+        if "vms" in settings:
+            for vm in settings["vms"].copy():
                 name = vm.get("name")
                 server = vm.get("server")
                 key = "{server}:{name}".format(server=server, name=name)
@@ -97,9 +97,9 @@ class VPCS(Module):
         """
 
         self._vpcs_nodes = {}
-        settings = LocalConfig.instance().settings()
-        if "nodes" in settings.get(self.__class__.__name__, {}):
-            for node in settings[self.__class__.__name__]["nodes"]:
+        settings = LocalConfig.instance().sectionView(self.__class__.__name__)
+        if "nodes" in settings:
+            for node in settings["nodes"].copy():
                 name = node.get("name")
                 server = node.get("server")
                 key = "{server}:{name}".format(server=server, name=name)
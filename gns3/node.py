@@ -21,6 +21,7 @@ import uuid
 import pathlib
 from gns3.local_server import LocalServer
 from gns3.controller import Controller
+from gns3.graphics_sync import GraphicsSync
 from gns3.ports.ethernet_port import EthernetPort
 from gns3.ports.serial_port import SerialPort
 from gns3.qt import QtGui, QtCore
@@ -109,10 +110,23 @@ class Node(BaseNode):
         # If it's the initialization we don't resend it
         # to the server
         if self._settings["x"] is not None:
-            self._update(data)
+            # Sent by batch, moving a selection change a lot of nodes at once
+            GraphicsSync.instance().push(self, data)
         else:
             self._settings.update(data)
 
+    def updateGraphics(self, data, callback):
+        """
+        Send graphics changes collected by GraphicsSync to the controller
+
+        :param data: Changed settings (dictionary)
+        :param callback: Callback receiving the controller response
+        """
+
+        log.debug("{} is updating graphics: {}".format(self.name(), data))
+        body = self._prepareBody(data)
+        self.controllerHttpPut("/nodes/{node_id}".format(node_id=self._node_id), callback, body=body, showProgress=False)
+
     def setSymbol(self, symbol):
         self._settings["symbol"] = symbol
 
@@ -396,6 +410,7 @@ class Node(BaseNode):
         """
 
         log.info("{} is being deleted".format(self.name()))
+        GraphicsSync.instance().discard(self)
         if not skip_controller:
             self.controllerHttpDelete("/nodes/{node_id}".format(node_id=self._node_id), self._deleteCallback)
         else:
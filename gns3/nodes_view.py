@@ -20,7 +20,7 @@ Nodes view that list all the available nodes to be dragged and dropped on the QG
 """
 
 import pickle
-import sip
+import collections
 
 from .qt import QtCore, QtGui, QtWidgets, qpartial
 from .modules import MODULES
@@ -30,7 +30,208 @@ from .dialogs.configuration_dialog import ConfigurationDialog
 from .local_config import LocalConfig
 
 
-class NodesView(QtWidgets.QTreeWidget):
+CATEGORY_NAMES = {
+    Node.routers: "router",
+    Node.switches: "switch",
+    Node.end_devices: "end device",
+    Node.security_devices: "security device"
+}
+
+
+class SymbolIconCache:
+
+    """
+    Icons of the symbols, the least recently used are dropped
+    when the cache is full.
+
+    :param max_size: Maximum number of icons
+    """
+
+    DEFAULT_MAX_SIZE = 128
+
+    def __init__(self, max_size=DEFAULT_MAX_SIZE):
+
+        self._max_size = max_size
+        # Symbol => QIcon, the least recently used first
+        self._icons = collections.OrderedDict()
+
+    def get(self, symbol):
+        """
+        :returns: QIcon or None
+        """
+
+        icon = self._icons.get(symbol)
+        if icon is not None:
+            self._icons.move_to_end(symbol)
+        return icon
+
+    def put(self, symbol, icon):
+
+        self._icons[symbol] = icon
+        self._icons.move_to_end(symbol)
+        while len(self._icons) > self._max_size:
+            self._icons.popitem(last=False)
+
+    def clear(self):
+
+        self._icons.clear()
+
+    def __contains__(self, symbol):
+
+        return symbol in self._icons
+
+    def __len__(self):
+
+        return len(self._icons)
+
+
+class NodesModel(QtCore.QAbstractListModel):
+
+    """
+    Templates of all the modules.
+
+    The rows are built once for all the categories, the icon of a row
+    is requested to the controller the first time the view paints it.
+
+    :param parent: parent object
+    """
+
+    TemplateRole = QtCore.Qt.UserRole
+    CategoriesRole = QtCore.Qt.UserRole + 1
+    SearchRole = QtCore.Qt.UserRole + 2
+
+    def __init__(self, parent=None):
+
+        super().__init__(parent)
+        self._templates = []
+        # Text searched by the filter of each row
+        self._search_keys = []
+        # Symbol => rows using it
+        self._symbol_rows = {}
+        self._icons = SymbolIconCache()
+        # Symbols requested to the controller
+        self._pending_icons = set()
+        self._requesting_icon = None
+
+    def setTemplates(self, templates):
+        """
+        Replaces all the rows.
+
+        :param templates: List of template dictionaries
+        """
+
+        self.beginResetModel()
+        self._templates = list(templates)
+        self._search_keys = []
+        self._symbol_rows = {}
+        for row, template in enumerate(self._templates):
+            categories = " ".join(CATEGORY_NAMES.get(category, "") for category in template.get("categories", []))
+            self._search_keys.append("{} {}".format(template["name"], categories).lower())
+            self._symbol_rows.setdefault(template.get("symbol"), []).append(row)
+        self.endResetModel()
+
+    def clearIcons(self):
+
+        self._icons.clear()
+        self._pending_icons = set()
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+
+        if parent.isValid():
+            return 0
+        return len(self._templates)
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+
+        if not index.isValid():
+            return None
+        template = self._templates[index.row()]
+        if role == QtCore.Qt.DisplayRole:
+            return template["name"]
+        elif role == QtCore.Qt.DecorationRole:
+            return self._icon(template.get("symbol"))
+        elif role == QtCore.Qt.SizeHintRole:
+            return QtCore.QSize(32, 32)
+        elif role == self.TemplateRole:
+            return template
+        elif role == self.CategoriesRole:
+            return template.get("categories", [])
+        elif role == self.SearchRole:
+            return self._search_keys[index.row()]
+        return None
+
+    def _icon(self, symbol):
+
+        if symbol is None:
+            return None
+        icon = self._icons.get(symbol)
+        if icon is None and symbol not in self._pending_icons:
+            self._pending_icons.add(symbol)
+            # The callback is called at once when the symbol is in the cache of the controller
+            self._requesting_icon = symbol
+            Controller.instance().getSymbolIcon(symbol, qpartial(self._iconReceived, symbol))
+            self._requesting_icon = None
+            icon = self._icons.get(symbol)
+        return icon
+
+    def _iconReceived(self, symbol, icon):
+
+        self._pending_icons.discard(symbol)
+        if symbol not in self._symbol_rows:
+            return
+        self._icons.put(symbol, icon)
+        if symbol == self._requesting_icon:
+            # The icon is returned by data()
+            return
+        for row in self._symbol_rows[symbol]:
+            index = self.index(row, 0)
+            self.dataChanged.emit(index, index, [QtCore.Qt.DecorationRole])
+
+
+class NodesFilterProxyModel(QtCore.QSortFilterProxyModel):
+
+    """
+    Shows the templates of a category matching the filter text.
+    """
+
+    def __init__(self, parent=None):
+
+        super().__init__(parent)
+        self._category = None
+        self._words = []
+        self.setSortCaseSensitivity(QtCore.Qt.CaseInsensitive)
+
+    def setCategory(self, category):
+        """
+        :param category: category of device to list (None = all devices)
+        """
+
+        self._category = category
+        self.invalidateFilter()
+
+    def setFilterText(self, text):
+        """
+        Shows only the templates with all the words of the text
+        in their name or their category.
+        """
+
+        self._words = text.lower().split()
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+
+        index = self.sourceModel().index(source_row, 0, source_parent)
+        if self._category is not None and self._category not in index.data(NodesModel.CategoriesRole):
+            return False
+        if self._words:
+            search_key = index.data(NodesModel.SearchRole)
+            for word in self._words:
+                if word not in search_key:
+                    return False
+        return True
+
+
+class NodesView(QtWidgets.QTreeView):
 
     """
     Nodes view to list the nodes.
@@ -42,15 +243,57 @@ class NodesView(QtWidgets.QTreeWidget):
 
         super().__init__(parent)
         self._current_category = None
+        # Versions of the settings and of the modules used to build the templates
+        self._settings_version = None
+        self._model = NodesModel(self)
+        self._proxy_model = NodesFilterProxyModel(self)
+        self._proxy_model.setSourceModel(self._model)
+        self.setModel(self._proxy_model)
+        self.setUniformRowHeights(True)
 
         # enables the possibility to drag items.
         self.setDragEnabled(True)
 
-        Controller.instance().connected_signal.connect(self.refresh)
+        Controller.instance().connected_signal.connect(self._controllerConnectedSlot)
+
+    def _controllerConnectedSlot(self):
+
+        # The symbols may not be the same on this controller
+        self._model.clearIcons()
+        self._settings_version = None
+        self.refresh()
+
+    def refresh(self, force=False):
+        """
+        Reloads the templates of all the modules.
 
-    def refresh(self):
-        self.clear()
-        self.populateNodesView(self._current_category)
+        :param force: Rebuilds the templates even if the settings have not changed
+        """
+
+        if not Controller.instance().connected():
+            return
+        # The modules may not have reloaded their settings yet,
+        # their own versions tell when the templates have changed
+        modules = [module.instance() for module in MODULES]
+        version = (LocalConfig.instance().version(), tuple(module.settingsVersion() for module in modules))
+        if not force and version == self._settings_version:
+            # The templates come from the settings, they have not changed
+            return
+        templates = []
+        for module in modules:
+            templates.extend(module.nodes())
+        self._model.setTemplates(templates)
+        self._proxy_model.sort(0)
+        self._settings_version = version
+
+    def setFilterText(self, text):
+        """
+        Type-ahead filter of the templates.
+
+        :param text: Words to search in the name and the category of the templates
+        """
+
+        self._proxy_model.setFilterText(text)
 
     def populateNodesView(self, category):
         """
@@ -64,24 +307,23 @@ class NodesView(QtWidgets.QTreeWidget):
             return
         self.setIconSize(QtCore.QSize(32, 32))
         self._current_category = category
-        for module in MODULES:
-            for node in module.instance().nodes():
-                if category is not None and category not in node["categories"]:
-                    continue
-                item = QtWidgets.QTreeWidgetItem(self)
-                item.setText(0, node["name"])
-                item.setData(0, QtCore.Qt.UserRole, node)
-                item.setSizeHint(0, QtCore.QSize(32, 32))
-                Controller.instance().getSymbolIcon(node["symbol"], qpartial(self._setItemIcon, item))
-
-        if not self.topLevelItemCount() and category == Node.routers:
+        # The templates edited in the preferences or the appliance wizard
+        # don't emit a change of the settings, a reset of the model is cheap
+        self.refresh(force=True)
+        self._proxy_model.setCategory(category)
+
+        if not self._proxy_model.rowCount() and category == Node.routers:
             QtWidgets.QMessageBox.warning(self, 'Routers', 'No routers have been configured.<br>You must provide your own router images in order to use GNS3.<br><br><a href="https://gns3.com/support/docs">Show documentation</a>')
 
-        self.sortByColumn(0, QtCore.Qt.AscendingOrder)
+    def _currentTemplate(self):
+        """
+        :returns: Template of the current item or None
+        """
 
-    def _setItemIcon(self, item, icon):
-        if not sip.isdeleted(item):
-            item.setIcon(0, icon)
+        index = self.currentIndex()
+        if not index.isValid():
+            return None
+        return index.data(NodesModel.TemplateRole)
 
     def mousePressEvent(self, event):
         """
@@ -91,7 +333,7 @@ class NodesView(QtWidgets.QTreeWidget):
         """
 
         # Check that an item has been selected and right click
-        if self.currentItem() is not None and event.button() == QtCore.Qt.RightButton:
+        if self._currentTemplate() is not None and event.button() == QtCore.Qt.RightButton:
             self._showContextualMenu()
             event.accept()
             return
@@ -106,12 +348,11 @@ class NodesView(QtWidgets.QTreeWidget):
         """
 
         # Check that an item has been selected and left button clicked
-        if self.currentItem() is not None and event.buttons() == QtCore.Qt.LeftButton:
-            item = self.currentItem()
-            icon = item.icon(0)
+        if self._currentTemplate() is not None and event.buttons() == QtCore.Qt.LeftButton:
+            icon = self.currentIndex().data(QtCore.Qt.DecorationRole) or QtGui.QIcon()
 
             # retrieve the node class from the item data
-            node = item.data(0, QtCore.Qt.UserRole)
+            node = self._currentTemplate()
             mimedata = QtCore.QMimeData()
 
             # pickle the node class, set the Mime type and data
@@ -126,8 +367,7 @@ class NodesView(QtWidgets.QTreeWidget):
             event.accept()
 
     def _showContextualMenu(self):
-        item = self.currentItem()
-        node = item.data(0, QtCore.Qt.UserRole)
+        node = self._currentTemplate()
         for module in MODULES:
             node_class = module.getNodeClass(node["class"])
             if node_class:
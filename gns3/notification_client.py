@@ -0,0 +1,305 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2017 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Client of the notification feeds of the controller.
+"""
+
+import re
+import json
+import time
+import random
+
+from .qt import QtCore, QtNetwork, QtWebSockets, qpartial, sip_is_deleted
+from .controller import Controller
+
+import logging
+log = logging.getLogger(__name__)
+
+
+class NotificationClient(QtCore.QObject):
+
+    """
+    Receive the events of a notification feed.
+
+    The feed is read from a WebSocket when QtWebSockets is available and
+    from a long running HTTP query otherwise, or when the controller
+    rejects the WebSocket handshake. When a WebSocket fails for another
+    reason the next connection uses HTTP and the WebSocket is tried again
+    on the following one. When the connection is lost the client
+    reconnects with an exponential backoff and some jitter, so all the
+    clients of a restarted controller don't come back at the same time.
+
+    Events emitted while the client was disconnected are lost, the
+    resync_signal is emitted after a reconnection to let the owner of
+    the feed fetch the state it may have missed.
+
+    :param path: Path of the feed, like /projects/{project_id}/notifications
+    :param handler: Callable receiving each event
+    """
+
+    HTTP = "http"
+    WEBSOCKET = "websocket"
+
+    # Reconnection delays in seconds
+    MIN_DELAY = 0.5
+    MAX_DELAY = 30
+
+    # The controller sends a ping every few seconds, without any
+    # message for this delay in seconds the connection is dead
+    IDLE_TIMEOUT = 60
+
+    # Status codes of a controller that doesn't support the WebSocket
+    WEBSOCKET_REJECTED_STATUS = (400, 404)
+    # Qt only gives the status of a failed handshake in the error message
+    HANDSHAKE_STATUS_RE = re.compile(r"status code: (\d+)")
+
+    connected_signal = QtCore.Signal()
+    disconnected_signal = QtCore.Signal()
+    resync_signal = QtCore.Signal()
+
+    # Due to bug in Qt on some version the long running queries need a
+    # network manager separated from the other queries, shared by the feeds
+    _network_manager = None
+
+    def __init__(self, path, handler, parent=None):
+
+        super().__init__(parent)
+        self._path = path
+        self._handler = handler
+        self._running = False
+        self._connected = False
+        # True once the feed has been connected, the next connections may have missed events
+        self._was_connected = False
+        self._failures = 0
+        self._websocket_supported = QtWebSockets is not None
+        # Use HTTP for the next connection only
+        self._http_fallback = False
+        self._transport = None
+        self._websocket = None
+        self._stream = None
+        self._last_message = None
+
+        self._reconnect_timer = QtCore.QTimer(self)
+        self._reconnect_timer.setSingleShot(True)
+        self._reconnect_timer.timeout.connect(self._connect)
+
+        self._idle_timer = QtCore.QTimer(self)
+        self._idle_timer.setInterval(self.IDLE_TIMEOUT * 1000 // 4)
+        self._idle_timer.timeout.connect(self._checkIdle)
+
+    def path(self):
+
+        return self._path
+
+    def transport(self):
+        """
+        :returns: Transport of the current connection (HTTP or WEBSOCKET), None if disconnected
+        """
+
+        return self._transport
+
+    def connected(self):
+
+        return self._connected
+
+    def start(self):
+        """
+        Connect to the feed.
+        """
+
+        if self._running:
+            return
+        self._running = True
+        self._failures = 0
+        self._was_connected = False
+        self._connect()
+
+    def stop(self):
+        """
+        Disconnect from the feed.
+        """
+
+        self._running = False
+        self._reconnect_timer.stop()
+        self._idle_timer.stop()
+        self._close()
+        if self._connected:
+            self._connected = False
+            self.disconnected_signal.emit()
+
+    def _close(self):
+
+        self._transport = None
+        websocket = self._websocket
+        stream = self._stream
+        self._websocket = None
+        self._stream = None
+        if websocket is not None and not sip_is_deleted(websocket):
+            websocket.close()
+            websocket.deleteLater()
+        if stream is not None and not sip_is_deleted(stream):
+            stream.abort()
+
+    def _connect(self):
+
+        if not self._running:
+            return
+        if not Controller.instance().connected():
+            self._failures += 1
+            self._scheduleReconnect()
+            return
+        self._last_message = time.monotonic()
+        self._idle_timer.start()
+        if self._websocket_supported and not self._http_fallback:
+            self._connectWebSocket()
+        else:
+            self._http_fallback = False
+            self._connectHTTP()
+
+    def _connectWebSocket(self):
+
+        log.debug("Listen for notifications on WebSocket %s", self._path)
+        self._transport = self.WEBSOCKET
+        self._websocket = QtWebSockets.QWebSocket(parent=self)
+        self._websocket.connected.connect(qpartial(self._webSocketConnectedSlot, self._websocket))
+        self._websocket.disconnected.connect(qpartial(self._webSocketDisconnectedSlot, self._websocket))
+        self._websocket.textMessageReceived.connect(qpartial(self._webSocketMessageSlot, self._websocket))
+        request = Controller.instance().httpClient().webSocketRequest("{}/ws".format(self._path))
+        self._websocket.open(request)
+
+    def _webSocketConnectedSlot(self, websocket):
+
+        if websocket is self._websocket:
+            self._connectedSlot()
+
+    def _webSocketMessageSlot(self, websocket, message):
+
+        if websocket is not self._websocket:
+            return
+        try:
+            result = json.loads(message)
+        except ValueError:
+            log.debug("Invalid message on the notification feed %s: %s", self._path, message)
+            return
+        self._messageReceived(result)
+
+    def _webSocketDisconnectedSlot(self, websocket):
+
+        if websocket is not self._websocket:
+            return
+        if not self._connected:
+            if self._handshakeRejected(websocket):
+                log.info("The controller rejects the WebSocket for %s (%s), use HTTP instead", self._path, websocket.errorString())
+                self._websocket_supported = False
+            else:
+                # The controller may be starting or the network may be down, try again later
+                log.debug("Can't open a WebSocket for %s (%s), try HTTP for the next connection", self._path, websocket.errorString())
+                self._http_fallback = True
+        websocket.deleteLater()
+        self._connectionLost()
+
+    def _handshakeRejected(self, websocket):
+        """
+        :returns: True if the controller has answered the WebSocket handshake with an error status
+        """
+
+        match = self.HANDSHAKE_STATUS_RE.search(websocket.errorString())
+        return match is not None and int(match.group(1)) in self.WEBSOCKET_REJECTED_STATUS
+
+    def _connectHTTP(self):
+
+        log.debug("Listen for notifications on HTTP %s", self._path)
+        if NotificationClient._network_manager is None:
+            NotificationClient._network_manager = QtNetwork.QNetworkAccessManager()
+        self._transport = self.HTTP
+        self._stream = Controller.instance().createHTTPQuery("GET", self._path, self._httpStreamEndedCallback,
+                                                             downloadProgressCallback=self._httpEventReceivedCallback,
+                                                             networkManager=NotificationClient._network_manager,
+                                                             timeout=None,
+                                                             showProgress=False,
+                                                             ignoreErrors=True)
+
+    def _httpEventReceivedCallback(self, result, **kwargs):
+
+        if self._transport != self.HTTP:
+            return
+        if not self._connected:
+            # There is no handshake over HTTP, the first event tells the feed is open
+            self._connectedSlot()
+        self._messageReceived(result)
+
+    def _httpStreamEndedCallback(self, result, error=False, **kwargs):
+
+        if self._transport == self.HTTP:
+            self._stream = None
+            self._connectionLost()
+
+    def _connectedSlot(self):
+
+        self._connected = True
+        self._failures = 0
+        log.debug("Connected to the notification feed %s with %s", self._path, self._transport)
+        self.connected_signal.emit()
+        if self._was_connected:
+            # Events may have been emitted while we were disconnected
+            self.resync_signal.emit()
+        self._was_connected = True
+
+    def _messageReceived(self, result):
+
+        self._last_message = time.monotonic()
+        if not isinstance(result, dict):
+            return
+        self._handler(result)
+
+    def _checkIdle(self):
+
+        if self._transport is not None and time.monotonic() - self._last_message > self.IDLE_TIMEOUT:
+            log.warning("No message from the notification feed %s for %d seconds, reconnecting", self._path, self.IDLE_TIMEOUT)
+            self._close()
+            self._connectionLost()
+
+    def _connectionLost(self):
+
+        self._transport = None
+        self._websocket = None
+        self._stream = None
+        self._idle_timer.stop()
+        if self._connected:
+            self._connected = False
+            self.disconnected_signal.emit()
+        else:
+            self._failures += 1
+        self._scheduleReconnect()
+
+    def reconnectDelay(self):
+        """
+        :returns: Delay in seconds before the next connection
+        """
+
+        delay = min(self.MAX_DELAY, self.MIN_DELAY * 2 ** min(self._failures, 16))
+        # Equal jitter, half of the delay is random
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    def _scheduleReconnect(self):
+
+        if not self._running or self._reconnect_timer.isActive():
+            return
+        delay = self.reconnectDelay()
+        log.debug("Reconnect to the notification feed %s in %.1f seconds", self._path, delay)
+        self._reconnect_timer.start(int(delay * 1000))
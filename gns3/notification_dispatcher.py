@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2017 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Queue the events received on a notification feed and apply
+them by batch, merging the updates of the same object.
+"""
+
+import itertools
+import collections
+
+from .qt import QtCore
+
+import logging
+log = logging.getLogger(__name__)
+
+
+class NotificationDispatcher(QtCore.QObject):
+
+    """
+    Notification dispatcher.
+
+    An update event carry the full state of the object, so when the same
+    node, link or drawing is updated several times before the next batch
+    only the latest update is applied.
+
+    :param handler: Callable receiving each event of a batch
+    :param interval: Delay in milliseconds between two batches
+    """
+
+    # Action and identifier of the events that can be merged
+    MERGEABLE_ACTIONS = {
+        "node.updated": "node_id",
+        "link.updated": "link_id",
+        "drawing.updated": "drawing_id"
+    }
+
+    # A pending update is useless if the object is deleted
+    DELETE_ACTIONS = {
+        "node.deleted": ("node.updated", "node_id"),
+        "link.deleted": ("link.updated", "link_id"),
+        "drawing.deleted": ("drawing.updated", "drawing_id")
+    }
+
+    # Around one frame at 60 frames per second
+    FRAME_INTERVAL = 16
+
+    def __init__(self, handler, interval=FRAME_INTERVAL):
+
+        super().__init__()
+        self._handler = handler
+        self._queue = collections.OrderedDict()
+        self._batch = None
+        self._sequence = itertools.count()
+
+        self._received = 0
+        self._dispatched = 0
+        self._merged = 0
+        self._dropped = 0
+        self._batches = 0
+
+        self._timer = QtCore.QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(interval)
+        self._timer.timeout.connect(self.flush)
+
+    def _key(self, action, event):
+        """
+        :returns: Key of the event in the queue, events with the same key are merged
+        """
+
+        field = self.MERGEABLE_ACTIONS.get(action)
+        if field is not None and field in event:
+            return (action, event[field])
+        return next(self._sequence)
+
+    def push(self, result, **kwargs):
+        """
+        Queue an event received from the notification feed.
+
+        :param result: Event (dictionary with an action and an event)
+        """
+
+        self._received += 1
+        action = result.get("action")
+        event = result.get("event")
+        if not isinstance(event, dict):
+            event = {}
+
+        if action in self.DELETE_ACTIONS:
+            update_action, field = self.DELETE_ACTIONS[action]
+            if self._queue.pop((update_action, event.get(field)), None) is not None:
+                self._dropped += 1
+
+        key = self._key(action, event)
+        if key in self._queue:
+            # Move the event at the end of the queue with the latest state
+            del self._queue[key]
+            self._merged += 1
+        self._queue[key] = result
+
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def flush(self):
+        """
+        Apply all the pending events.
+        """
+
+        self._timer.stop()
+        if not self._queue:
+            return
+
+        self._batches += 1
+        self._batch = self._queue
+        self._queue = collections.OrderedDict()
+        log.debug("Dispatch %d events (%d merged and %d dropped since start)", len(self._batch), self._merged, self._dropped)
+        try:
+            while self._batch:
+                _, result = self._batch.popitem(last=False)
+                self._dispatched += 1
+                try:
+                    self._handler(result)
+                except Exception as e:
+                    # A bad event must not discard the rest of the batch
+                    log.error("Error while applying the {} notification: {}".format(result.get("action"), e), exc_info=1)
+        finally:
+            self._batch = None
+
+        if self._queue and not self._timer.isActive():
+            self._timer.start()
+
+    def clear(self):
+        """
+        Drop all the pending events, including the
+        remaining events of a batch in progress.
+        """
+
+        self._timer.stop()
+        self._dropped += len(self._queue)
+        self._queue.clear()
+        if self._batch:
+            self._dropped += len(self._batch)
+            self._batch.clear()
+
+    def pending(self):
+        """
+        :returns: Number of events waiting for the next batch
+        """
+
+        return len(self._queue)
+
+    def stats(self):
+        """
+        :returns: Dictionary with the dispatcher counters
+        """
+
+        return {
+            "received": self._received,
+            "dispatched": self._dispatched,
+            "merged": self._merged,
+            "dropped": self._dropped,
+            "batches": self._batches,
+            "pending": len(self._queue)
+        }
@@ -63,7 +63,7 @@ class PacketCapture:
         return MainWindow.instance()
 
     def settings(self):
-        return LocalConfig.instance().loadSectionSettings("PacketCapture", PACKET_CAPTURE_SETTINGS)
+        return LocalConfig.instance().sectionView("PacketCapture", PACKET_CAPTURE_SETTINGS)
 
     def startCapture(self, link):
         """
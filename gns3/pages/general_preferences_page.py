@@ -27,7 +27,7 @@ from gns3.qt import QtGui, QtCore, QtWidgets
 from gns3.local_config import LocalConfig
 from ..ui.general_preferences_page_ui import Ui_GeneralPreferencesPageWidget
 from gns3.local_server import LocalServer
-from ..settings import GRAPHICS_VIEW_SETTINGS, GENERAL_SETTINGS, STYLES
+from ..settings import GRAPHICS_VIEW_SETTINGS, GENERAL_SETTINGS, STYLES, VIEWPORT_UPDATE_MODES
 from ..dialogs.console_command_dialog import ConsoleCommandDialog
 
 
@@ -62,6 +62,8 @@ class GeneralPreferencesPage(QtWidgets.QWidget, Ui_GeneralPreferencesPageWidget)
         self.uiBrowseConfigurationPushButton.clicked.connect(self._browseConfigurationDirectorySlot)
         self._default_label_color = QtGui.QColor(QtCore.Qt.black)
         self.uiStyleComboBox.addItems(STYLES)
+        for mode, name in VIEWPORT_UPDATE_MODES:
+            self.uiViewportUpdateModeComboBox.addItem(name, mode)
         self.uiImageDirectoriesAddPushButton.clicked.connect(self._imageDirectoriesAddPushButtonSlot)
         self.uiImageDirectoriesDeletePushButton.clicked.connect(self._imageDirectoriesDeletePushButtonSlot)
 
@@ -185,6 +187,8 @@ class GeneralPreferencesPage(QtWidgets.QWidget, Ui_GeneralPreferencesPageWidget)
             QtWidgets.QMessageBox.critical(self, "Import configuration file", "Invalid file: {}".format(e))
             return
 
+        # The pending changes must not overwrite the imported file
+        LocalConfig.instance().flush()
         try:
             shutil.copyfile(path, configuration_file_path)
         except (shutil.Error, IOError) as e:
@@ -217,6 +221,7 @@ class GeneralPreferencesPage(QtWidgets.QWidget, Ui_GeneralPreferencesPageWidget)
         if not path:
             return
 
+        LocalConfig.instance().flush()
         try:
             shutil.copyfile(configuration_file_path, path)
         except (shutil.Error, IOError) as e:
@@ -287,6 +292,11 @@ class GeneralPreferencesPage(QtWidgets.QWidget, Ui_GeneralPreferencesPageWidget)
         self.uiSceneHeightSpinBox.setValue(settings["scene_height"])
         self.uiRectangleSelectedItemCheckBox.setChecked(settings["draw_rectangle_selected_item"])
         self.uiDrawLinkStatusPointsCheckBox.setChecked(settings["draw_link_status_points"])
+        self.uiLevelOfDetailCheckBox.setChecked(settings["level_of_detail"])
+        self.uiNodeItemCacheCheckBox.setChecked(settings["node_item_cache"])
+        index = self.uiViewportUpdateModeComboBox.findData(settings["viewport_update_mode"])
+        if index != -1:
+            self.uiViewportUpdateModeComboBox.setCurrentIndex(index)
 
         qt_font = QtGui.QFont()
         if qt_font.fromString(settings["default_label_font"]):
@@ -345,6 +355,9 @@ class GeneralPreferencesPage(QtWidgets.QWidget, Ui_GeneralPreferencesPageWidget)
                                       "scene_height": self.uiSceneHeightSpinBox.value(),
                                       "draw_rectangle_selected_item": self.uiRectangleSelectedItemCheckBox.isChecked(),
                                       "draw_link_status_points": self.uiDrawLinkStatusPointsCheckBox.isChecked(),
+                                      "level_of_detail": self.uiLevelOfDetailCheckBox.isChecked(),
+                                      "node_item_cache": self.uiNodeItemCacheCheckBox.isChecked(),
+                                      "viewport_update_mode": self.uiViewportUpdateModeComboBox.currentData(),
                                       "default_label_font": self.uiDefaultLabelStylePlainTextEdit.font().toString(),
                                       "default_label_color": self._default_label_color.name()}
         MainWindow.instance().uiGraphicsView.setSettings(new_graphics_view_settings)
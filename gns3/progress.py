@@ -106,7 +106,9 @@ class Progress(QtCore.QObject):
         if self._allow_cancel_query:
             log.debug("Cancel running queries")
             for query in self._queries.copy().values():
-                query["response"].abort()
+                # A batch of queries has no single response to abort
+                if query["response"] is not None:
+                    query["response"].abort()
 
     @qslot
     def _rejectSlot(self, *args):
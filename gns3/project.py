@@ -16,12 +16,15 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 import os
-from .qt import QtCore, qpartial, QtWidgets, QtNetwork
+from .qt import QtCore, qpartial, QtWidgets
 
 from gns3.controller import Controller
 from gns3.compute_manager import ComputeManager
 from gns3.topology import Topology
 from gns3.local_config import LocalConfig
+from gns3.notification_dispatcher import NotificationDispatcher
+from gns3.notification_client import NotificationClient
+from gns3.topology_loader import TopologyLoader
 from gns3.settings import GRAPHICS_VIEW_SETTINGS
 
 
@@ -44,6 +47,9 @@ class Project(QtCore.QObject):
 
     project_updated_signal = QtCore.Signal()
 
+    # Number of items created and total number of items (0 while unknown)
+    topology_load_progress_signal = QtCore.Signal(int, int)
+
     def __init__(self):
 
         self._id = None
@@ -62,12 +68,14 @@ class Project(QtCore.QObject):
         self._name = "untitled"
         self._filename = None
 
-        # Due to bug in Qt on some version we need a dedicated network manager
-        self._notification_network_manager = QtNetwork.QNetworkAccessManager()
-        self._notification_stream = None
+        self._notification_client = None
+        self._topology_loader = None
 
         super().__init__()
 
+        # Events from the notification feed are applied by batch
+        self._notification_dispatcher = NotificationDispatcher(self._event_received)
+
     def name(self):
         """
         :returns: Project name (string)
@@ -237,7 +245,7 @@ class Project(QtCore.QObject):
 
         Full arg list in createHTTPQuery
         """
-        self._projectHTTPQuery("GET", path, callback, **kwargs)
+        return self._projectHTTPQuery("GET", path, callback, **kwargs)
 
     def post(self, path, callback, body={}, **kwargs):
         """
@@ -290,7 +298,7 @@ class Project(QtCore.QObject):
         """
 
         path = "/projects/{project_id}{path}".format(project_id=self._id, path=path)
-        Controller.instance().createHTTPQuery(method, path, callback, body=body, **kwargs)
+        return Controller.instance().createHTTPQuery(method, path, callback, body=body, **kwargs)
 
     def create(self):
         """
@@ -370,33 +378,30 @@ class Project(QtCore.QObject):
             self._startListenNotifications()
         self.project_updated_signal.emit()
 
-        self.get("/nodes", self._listNodesCallback)
+        self._loadTopology()
 
-    def _listNodesCallback(self, result, error=False, **kwargs):
-        if error:
-            log.error("Error while listing project: {}".format(result["message"]))
-            return
-        topo = Topology.instance()
-        for node in result:
-            topo.createNode(node)
-        self.get("/links", self._listLinksCallback)
+    def _loadTopology(self):
+        """
+        Create the nodes, links and drawings of the project.
+        """
 
-    def _listLinksCallback(self, result, error=False, **kwargs):
-        if error:
-            log.error("Error while listing links: {}".format(result["message"]))
-            return
-        topo = Topology.instance()
-        for link in result:
-            topo.createLink(link)
-        self.get("/drawings", self._listDrawingsCallback)
+        self.stopLoadingTopology()
+        self._topology_loader = TopologyLoader(self)
+        self._topology_loader.progress_signal.connect(self.topology_load_progress_signal.emit)
+        self._topology_loader.finished_signal.connect(self._topologyLoadedSlot)
+        self._topology_loader.start()
 
-    def _listDrawingsCallback(self, result, error=False, **kwargs):
-        if error:
-            log.error("Error while listing drawings: {}".format(result["message"]))
-            return
-        topo = Topology.instance()
-        for drawing in result:
-            topo.createDrawing(drawing)
+    def _topologyLoadedSlot(self):
+        self._topology_loader = None
+
+    def stopLoadingTopology(self):
+        """
+        Stop creating the items of the topology.
+        """
+
+        if self._topology_loader:
+            self._topology_loader.cancel()
+            self._topology_loader = None
 
     def close(self, local_server_shutdown=False):
         """Close project"""
@@ -427,6 +432,7 @@ class Project(QtCore.QObject):
             log.error("Error while closing project {}: {}".format(self._id, result["message"]))
         else:
             self.stopListenNotifications()
+            self.stopLoadingTopology()
             log.info("Project {} closed".format(self._id))
 
         self._closed = True
@@ -434,30 +440,66 @@ class Project(QtCore.QObject):
         Topology.instance().setProject(None)
 
     def stopListenNotifications(self):
-        if self._notification_stream:
+        if self._notification_client:
             log.debug("Stop listening for notifications from project %s", self._id)
-            stream = self._notification_stream
-            self._notification_stream = None
-            stream.abort()
+            client = self._notification_client
+            self._notification_client = None
+            client.stop()
+            client.deleteLater()
+        self._notification_dispatcher.clear()
 
     def _startListenNotifications(self):
         if not Controller.instance().connected():
             return
+        self.stopListenNotifications()
         path = "/projects/{project_id}/notifications".format(project_id=self._id)
-        self._notification_stream = Controller.instance().createHTTPQuery("GET", path, self._endListenNotificationCallback,
-                                                                          downloadProgressCallback=self._event_received,
-                                                                          networkManager=self._notification_network_manager,
-                                                                          timeout=None,
-                                                                          showProgress=False,
-                                                                          ignoreErrors=True)
+        # The controller events (computes, settings) are sent on the project feed too
+        self._notification_client = NotificationClient(path, self._notification_dispatcher.push, parent=self)
+        self._notification_client.resync_signal.connect(self._resyncTopology)
+        self._notification_client.start()
 
-    def _endListenNotificationCallback(self, result, error=False, **kwargs):
+    def _resyncTopology(self):
         """
-        If notification stream disconnect we reconnect to it
+        Get the nodes, links and drawings again after events may have been
+        missed and apply the differences like events from the feed.
         """
-        if self._notification_stream:
-            self._notification_stream = None
-            self._startListenNotifications()
+
+        if self._topology_loader or self._closed:
+            # The topology will be up to date when loaded
+            return
+        log.debug("Resync the topology of project %s", self._id)
+        self.get("/nodes", qpartial(self._resyncCallback, "node"), showProgress=False)
+        self.get("/links", qpartial(self._resyncCallback, "link"), showProgress=False)
+        self.get("/drawings", qpartial(self._resyncCallback, "drawing"), showProgress=False)
+
+    def _resyncCallback(self, item_type, result, error=False, **kwargs):
+
+        if error or not isinstance(result, list) or self._notification_client is None:
+            if error:
+                log.warning("Can't resync the {}s of project {}: {}".format(item_type, self._id, result.get("message", "")))
+            return
+
+        topology = Topology.instance()
+        field = "{}_id".format(item_type)
+        if item_type == "node":
+            items, get_item = topology.nodes(), topology.getNodeFromUuid
+        elif item_type == "link":
+            items, get_item = topology.links(), topology.getLinkFromUuid
+        else:
+            items, get_item = topology.drawings(), topology.getDrawingFromUuid
+
+        remote_ids = set()
+        for data in result:
+            remote_ids.add(data[field])
+            if get_item(data[field]) is None:
+                action = "{}.created".format(item_type)
+            else:
+                action = "{}.updated".format(item_type)
+            self._notification_dispatcher.push({"action": action, "event": data})
+        for item in list(items):
+            item_id = getattr(item, field)()
+            if item_id is not None and item_id not in remote_ids:
+                self._notification_dispatcher.push({"action": "{}.deleted".format(item_type), "event": {field: item_id}})
 
     def _event_received(self, result, server=None, **kwargs):
 
@@ -46,6 +46,13 @@ try:
 except ImportError:
     raise SystemExit("Please install the PyQt5.QtSvg module")
 
+# Optional, the notification feeds fall back to HTTP without it
+try:
+    from PyQt5 import QtWebSockets
+    sys.modules[__name__ + '.QtWebSockets'] = QtWebSockets
+except ImportError:
+    QtWebSockets = None
+
 QtCore.Signal = QtCore.pyqtSignal
 QtCore.Slot = QtCore.pyqtSlot
 QtCore.Property = QtCore.pyqtProperty
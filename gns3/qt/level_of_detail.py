@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2017 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Simplified drawing of the items when the scene is zoomed out.
+"""
+
+import math
+
+from . import QtCore
+from . import QtGui
+from . import QtWidgets
+
+
+class LevelOfDetail:
+
+    """
+    Tell the items if they can skip the details of their drawing.
+
+    The level of detail is the scale of the painter, below the threshold
+    the details (status points, port labels, effects) are too small to
+    be seen.
+    """
+
+    enabled = True
+    threshold = 0.5
+
+    @classmethod
+    def setEnabled(cls, enabled):
+
+        cls.enabled = enabled
+
+    @classmethod
+    def isLow(cls, painter):
+        """
+        :param painter: QPainter instance
+        :returns: True if the details should not be drawn
+        """
+
+        if not cls.enabled:
+            return False
+        return QtWidgets.QStyleOptionGraphicsItem.levelOfDetailFromTransform(painter.worldTransform()) < cls.threshold
+
+    @classmethod
+    def symbolPixmap(cls, renderer, rect):
+        """
+        Pixmap of a symbol at the resolution of the low level of
+        detail, the pixmaps are shared through the QPixmapCache.
+
+        :param renderer: QSvgRenderer instance
+        :param rect: Size of the symbol in the scene (QRectF)
+        :returns: QPixmap instance
+        """
+
+        width = max(1, math.ceil(rect.width() * cls.threshold))
+        height = max(1, math.ceil(rect.height() * cls.threshold))
+        key = "gns3-symbol:{}:{}:{}x{}".format(renderer.objectName(), id(renderer), width, height)
+        pixmap = QtGui.QPixmapCache.find(key)
+        if pixmap is None or pixmap.isNull():
+            pixmap = QtGui.QPixmap(width, height)
+            pixmap.fill(QtCore.Qt.transparent)
+            painter = QtGui.QPainter(pixmap)
+            painter.setRenderHint(QtGui.QPainter.SmoothPixmapTransform)
+            renderer.render(painter)
+            painter.end()
+            QtGui.QPixmapCache.insert(key, pixmap)
+        return pixmap
+
+
+class LevelOfDetailColorizeEffect(QtWidgets.QGraphicsColorizeEffect):
+
+    """
+    Colorize effect skipped when the scene is zoomed out.
+    """
+
+    def draw(self, painter):
+
+        if LevelOfDetail.isLow(painter):
+            self.drawSource(painter)
+        else:
+            super().draw(painter)
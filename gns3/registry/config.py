@@ -46,6 +46,7 @@ class Config:
         self.path = path
         if self.path is None:
             self.path = LocalConfig.instance().configFilePath()
+            LocalConfig.instance().flush()
 
         with open(self.path, encoding="utf-8") as f:
             self._config = json.load(f)
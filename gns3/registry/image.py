@@ -17,12 +17,11 @@
 
 import re
 import os
-import hashlib
 import tarfile
-import pathlib
 
 
-from gns3.controller import Controller
+from gns3.image_upload_manager import ImageUploadManager
+from gns3.utils.image_hasher import md5sum_file, write_md5sum_file
 
 
 import logging
@@ -109,14 +108,8 @@ class Image:
 
             if not os.path.isfile(self.path):
                 return None
-            m = hashlib.md5()
-            with open(self.path, "rb") as f:
-                while True:
-                    buf = f.read(4096)
-                    if not buf:
-                        break
-                    m.update(buf)
-            self._md5sum = m.hexdigest()
+            self._md5sum = md5sum_file(self.path)
+            write_md5sum_file(self.path, self._md5sum)
         Image._cache[self.path] = self._md5sum
         return self._md5sum
 
@@ -145,5 +138,4 @@ class Image:
         """
         Upload image to the controller
         """
-        upload_endpoint = "/{}/images".format(self._emulator)
-        Controller.instance().postCompute('{}/{}'.format(upload_endpoint, self.filename), compute_id, callback, body=pathlib.Path(self.path), progressText="Uploading {}".format(self.filename), timeout=None)
+        ImageUploadManager.instance().upload(self._emulator, compute_id, self.path, self.filename, callback=callback)
@@ -0,0 +1,341 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2017 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Persistent index of the image files found in the image directories.
+"""
+
+import os
+import json
+import threading
+
+from ..utils.image_hasher import ImageHasher, read_md5sum_file
+
+import logging
+log = logging.getLogger(__name__)
+
+
+class ImageIndex:
+
+    """
+    Index of the image files by MD5 checksum, filename and size.
+
+    An entry is identified by the path, size, modification time and inode
+    of the file, a file is hashed again only when one of them changes.
+    The checksums are computed on demand and saved on disk so they survive
+    a restart of the GUI.
+
+    :param path: Path of the index file, None for an index in memory only
+    """
+
+    INDEX_FILE = "image_index.json"
+
+    # Files with almost the expected size are candidates, to avoid
+    # rounding issues with some systems
+    SIZE_TOLERANCE = 10
+
+    def __init__(self, path=None):
+
+        self._path = path
+        self._lock = threading.RLock()
+        self._dirty = False
+
+        # Path => entry
+        self._entries = {}
+        self._by_md5sum = {}
+        self._by_filename = {}
+        self._by_size = {}
+        self._load()
+
+    def _load(self):
+
+        if self._path is None:
+            return
+        try:
+            with open(self._path, encoding="utf-8") as f:
+                data = json.load(f)
+            entries = data["entries"]
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            log.warning("Can't read the image index {}: {}".format(self._path, e))
+            return
+
+        for entry in entries:
+            try:
+                self._addEntry(dict(path=entry["path"], size=entry["size"], mtime=entry["mtime"], inode=entry["inode"], md5sum=entry.get("md5sum")))
+            except (KeyError, TypeError):
+                continue
+
+    def save(self):
+        """
+        Write the index on disk if it has changed.
+        """
+
+        with self._lock:
+            if self._path is None or not self._dirty:
+                return
+            data = {"entries": list(self._entries.values())}
+            self._dirty = False
+
+        try:
+            os.makedirs(os.path.dirname(self._path), exist_ok=True)
+            with open(self._path + ".tmp", "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(self._path + ".tmp", self._path)
+        except OSError as e:
+            log.error("Can't write the image index {}: {}".format(self._path, e))
+
+    def _addEntry(self, entry):
+
+        path = entry["path"]
+        self._entries[path] = entry
+        self._by_filename.setdefault(os.path.basename(path), set()).add(path)
+        self._by_size.setdefault(entry["size"], set()).add(path)
+        if entry["md5sum"]:
+            self._by_md5sum.setdefault(entry["md5sum"], set()).add(path)
+
+    def _removeEntry(self, path):
+
+        entry = self._entries.pop(path, None)
+        if entry is None:
+            return
+        self._discard(self._by_filename, os.path.basename(path), path)
+        self._discard(self._by_size, entry["size"], path)
+        if entry["md5sum"]:
+            self._discard(self._by_md5sum, entry["md5sum"], path)
+        self._dirty = True
+
+    @staticmethod
+    def _discard(index, key, path):
+
+        paths = index.get(key)
+        if paths is not None:
+            paths.discard(path)
+            if not paths:
+                del index[key]
+
+    def _update(self, path, stat=None):
+        """
+        Check the entry of a file against the file on disk.
+
+        :returns: The entry or None if the file doesn't exist
+        """
+
+        try:
+            if stat is None:
+                stat = os.stat(path)
+        except OSError:
+            self._removeEntry(path)
+            return None
+
+        entry = self._entries.get(path)
+        if entry is not None:
+            if entry["size"] == stat.st_size and entry["mtime"] == stat.st_mtime_ns and entry["inode"] == stat.st_ino:
+                return entry
+            self._removeEntry(path)
+
+        entry = dict(path=path, size=stat.st_size, mtime=stat.st_mtime_ns, inode=stat.st_ino, md5sum=None)
+        self._addEntry(entry)
+        self._dirty = True
+        return entry
+
+    def scan(self, directory):
+        """
+        Update the index with the files of a directory. Only the metadata
+        of the files are read, the checksums are kept for the files with
+        the same size, modification time and inode.
+
+        :param directory: Image directory
+        """
+
+        with self._lock:
+            known = set(path for path in self._entries if os.path.dirname(path) == directory)
+            if os.path.isdir(directory):
+                try:
+                    with os.scandir(directory) as it:
+                        for dir_entry in it:
+                            if dir_entry.name.endswith(".md5sum") or dir_entry.name.startswith("."):
+                                continue
+                            try:
+                                if not dir_entry.is_file():
+                                    continue
+                                stat = dir_entry.stat()
+                            except OSError as e:
+                                log.error("Can't scan {}: {}".format(dir_entry.path, str(e)))
+                                continue
+                            known.discard(dir_entry.path)
+                            self._update(dir_entry.path, stat)
+                except OSError as e:
+                    log.error("Can't scan {}: {}".format(directory, str(e)))
+                    return
+
+            for path in known:
+                self._removeEntry(path)
+
+    def md5sum(self, path, cancel_event=None, progress_callback=None):
+        """
+        Checksum of a file, computed only if the file has changed since
+        the last time.
+
+        :param cancel_event: threading.Event set to cancel the computation
+        :param progress_callback: Called with the progress of the computation in percent
+        :returns: hexadecimal md5 or None
+        """
+
+        self.computeMissing([path], cancel_event=cancel_event, progress_callback=progress_callback)
+        with self._lock:
+            entry = self._update(path)
+            if entry is None:
+                return None
+            return entry["md5sum"]
+
+    def cachedMd5sum(self, path):
+        """
+        Checksum of a file if it doesn't need to be computed, from the
+        index or from an up to date .md5sum file.
+
+        :returns: hexadecimal md5 or None
+        """
+
+        with self._lock:
+            entry = self._update(path)
+            if entry is None:
+                return None
+            if entry["md5sum"]:
+                return entry["md5sum"]
+        md5sum = read_md5sum_file(path)
+        if md5sum is not None:
+            self._setMd5sum(entry, md5sum)
+        return md5sum
+
+    def computeMissing(self, paths, max_workers=ImageHasher.DEFAULT_MAX_WORKERS, cancel_event=None, progress_callback=None):
+        """
+        Compute in parallel the checksums not in the index, the .md5sum
+        files next to the images are used when they are up to date.
+
+        :param paths: Paths of the files
+        :param max_workers: Number of files hashed at the same time
+        :param cancel_event: threading.Event set to cancel the computation
+        :param progress_callback: Called with the progress of the computation in percent
+        """
+
+        missing = {}
+        with self._lock:
+            for path in paths:
+                entry = self._update(path)
+                if entry is not None and not entry["md5sum"]:
+                    missing[path] = entry
+
+        to_compute = []
+        for path, entry in missing.items():
+            md5sum = read_md5sum_file(path)
+            if md5sum is None:
+                to_compute.append(path)
+            else:
+                self._setMd5sum(entry, md5sum)
+
+        if to_compute:
+            hasher = ImageHasher(to_compute, max_workers=max_workers, cancel_event=cancel_event, progress_callback=progress_callback)
+            for path, md5sum in hasher.run().items():
+                self._setMd5sum(missing[path], md5sum)
+
+    def _setMd5sum(self, entry, md5sum):
+
+        with self._lock:
+            path = entry["path"]
+            # The file may have changed while we were hashing it
+            if self._entries.get(path) is entry:
+                entry["md5sum"] = md5sum
+                self._by_md5sum.setdefault(md5sum, set()).add(path)
+                self._dirty = True
+
+    def _sizeMatch(self, file_size, size):
+
+        return size is None or abs(file_size - size) < self.SIZE_TOLERANCE
+
+    def _inDirectories(self, paths, directories):
+        """
+        :param paths: Paths of the files
+        :param directories: Image directories, by order of priority
+        :returns: Paths in the directories sorted by directory priority
+        """
+
+        priority = {}
+        for rank, directory in enumerate(directories):
+            priority.setdefault(directory, rank)
+        paths = [path for path in paths if os.path.dirname(path) in priority]
+        return sorted(paths, key=lambda path: (priority[os.path.dirname(path)], path))
+
+    def search(self, directories, filename, md5sum, size, cancel_event=None, progress_callback=None):
+        """
+        Search an image in the directories. The files of the right size
+        not already in the index are hashed one by one, by order of
+        directory priority, until one of them matches.
+
+        :param directories: Image directories, by order of priority
+        :param filename: Image filename, used when the md5sum is unknown
+        :param md5sum: Hash of the image
+        :param size: File size
+        :param cancel_event: threading.Event set to cancel the search
+        :param progress_callback: Called with the progress of the hashing of each file in percent
+        :returns: Path of the image or None
+        """
+
+        directories = [os.path.normpath(directory) for directory in directories]
+        for directory in directories:
+            self.scan(directory)
+
+        with self._lock:
+            if md5sum is None:
+                candidates = self._inDirectories(self._by_filename.get(filename, ()), directories)
+            else:
+                for path in self._inDirectories(self._by_md5sum.get(md5sum, ()), directories):
+                    entry = self._update(path)
+                    if entry is not None and entry["md5sum"] == md5sum and self._sizeMatch(entry["size"], size):
+                        return path
+                if size is None:
+                    candidates = self._inDirectories(self._entries, directories)
+                else:
+                    candidates = set()
+                    for file_size in range(size - self.SIZE_TOLERANCE + 1, size + self.SIZE_TOLERANCE):
+                        candidates.update(self._by_size.get(file_size, ()))
+                    candidates = self._inDirectories(candidates, directories)
+
+        for path in candidates:
+            if cancel_event is not None and cancel_event.is_set():
+                return None
+            if md5sum is not None:
+                self.computeMissing([path], cancel_event=cancel_event, progress_callback=progress_callback)
+            with self._lock:
+                entry = self._update(path)
+                if entry is not None and (md5sum is None or entry["md5sum"] == md5sum):
+                    return path
+        return None
+
+    @staticmethod
+    def instance():
+        """
+        Singleton to return only one instance of ImageIndex.
+
+        :returns: instance of ImageIndex
+        """
+
+        if not hasattr(ImageIndex, "_instance") or ImageIndex._instance is None:
+            from ..local_config import LocalConfig
+            ImageIndex._instance = ImageIndex(os.path.join(LocalConfig.instance().configDirectory(), ImageIndex.INDEX_FILE))
+        return ImageIndex._instance
@@ -16,12 +16,11 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
-import os
-
 import logging
 log = logging.getLogger(__name__)
 
 from .image import Image
+from .image_index import ImageIndex
 from ..controller import Controller
 from ..qt import QtCore
 
@@ -33,13 +32,17 @@ class RegistryError(Exception):
 class Registry(QtCore.QObject):
     image_list_changed_signal = QtCore.pyqtSignal()
 
-    def __init__(self, images_dirs):
+    def __init__(self, images_dirs, image_index=None):
         """
         :param images_dirs: Local image image dir
+        :param image_index: ImageIndex instance, the persistent index by default
         """
         super().__init__()
         self._images_dirs = images_dirs
         self._remote_images = []
+        if image_index is None:
+            image_index = ImageIndex.instance()
+        self._image_index = image_index
 
     def appendImageDirectory(self, image_directory):
         """
@@ -67,7 +70,7 @@ class Registry(QtCore.QObject):
             self._remote_images.append(image)
         self.image_list_changed_signal.emit()
 
-    def search_image_file(self, emulator, filename, md5sum, size):
+    def search_image_file(self, emulator, filename, md5sum, size, cancel_event=None, progress_callback=None):
         """
         Search an image based on its MD5 checksum
 
@@ -75,6 +78,8 @@ class Registry(QtCore.QObject):
         :param filename: Image filename (used for ova in order to return the correct file in the archive)
         :param md5sum: Hash of the image
         :param size: File size
+        :param cancel_event: threading.Event set to cancel the search
+        :param progress_callback: Called with the progress of the hashing of each file in percent
         :returns: Image object or None
         """
 
@@ -85,27 +90,13 @@ class Registry(QtCore.QObject):
                 if filename == remote_image.filename:
                     return remote_image
 
-        for directory in self._images_dirs:
-            log.debug("Search images %s (%s) in %s", filename, md5sum, directory)
-            if os.path.exists(directory):
-                for file in os.listdir(directory):
-                    if not file.endswith(".md5sum") and not file.startswith("."):
-                        path = os.path.join(directory, file)
-                        try:
-                            if os.path.isfile(path):
-                                if md5sum is None:
-                                    if filename == os.path.basename(path):
-                                        return Image(emulator, path)
-                                else:
-                                    # We take all the file with almost the size of the image
-                                    # Almost to avoid round issue with system.
-                                    file_size = os.stat(path).st_size
-                                    if size is None or (file_size - 10 < size and file_size + 10 > size):
-                                        image = Image(emulator, path)
-                                        if image.md5sum == md5sum:
-                                            log.debug("Found images %s (%s) in %s", filename, md5sum, image.path)
-                                            return image
-                        except (OSError, PermissionError) as e:
-                            log.error("Can't scan {}: {}".format(path, str(e)))
-
-        return None
+        log.debug("Search images %s (%s) in %s", filename, md5sum, ", ".join(self._images_dirs))
+        path = self._image_index.search(self._images_dirs, filename, md5sum, size, cancel_event=cancel_event, progress_callback=progress_callback)
+        image = None
+        if path is not None:
+            image = Image(emulator, path)
+            # The checksum is read by the callers, take it from the index
+            image.md5sum = self._image_index.md5sum(path, cancel_event=cancel_event, progress_callback=progress_callback)
+            log.debug("Found images %s (%s) in %s", filename, image.md5sum, image.path)
+        self._image_index.save()
+        return image
@@ -211,6 +211,12 @@ if sys.platform.startswith("win") and "PROGRAMFILES(X86)" in os.environ:
 
 STYLES = ["Charcoal", "Classic", "Legacy"]
 
+# Viewport update modes of the topology view (setting value, name)
+VIEWPORT_UPDATE_MODES = [("minimal", "Minimal"),
+                         ("smart", "Smart"),
+                         ("bounding_rect", "Bounding rectangle"),
+                         ("full", "Full")]
+
 if sys.platform.startswith("win"):
     DEFAULT_STYLE = "Classic"
 else:
@@ -236,7 +242,9 @@ GENERAL_SETTINGS = {
     "preferences_dialog_geometry": "",
     "debug_level": 0,
     "multi_profiles": False,
-    "hdpi": not sys.platform.startswith("linux")
+    "hdpi": not sys.platform.startswith("linux"),
+    "max_image_uploads": 2,
+    "local_server_output_log_rate": 20
 }
 
 GRAPHICS_VIEW_SETTINGS = {
@@ -246,6 +254,9 @@ GRAPHICS_VIEW_SETTINGS = {
     "draw_link_status_points": True,
     "default_label_font": "TypeWriter,10,-1,5,75,0,0,0,0,0",
     "default_label_color": "#000000",
+    "level_of_detail": True,
+    "viewport_update_mode": "minimal",
+    "node_item_cache": False,
 }
 
 LOCAL_SERVER_SETTINGS = {
@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2017 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Read-only views of the settings.
+"""
+
+import copy
+import collections.abc
+
+
+def _view(value, version):
+
+    if isinstance(value, dict):
+        return SettingsView(value, version)
+    elif isinstance(value, list):
+        return SettingsListView(value, version)
+    return value
+
+
+class SettingsView(collections.abc.Mapping):
+
+    """
+    Read-only view of a settings section.
+
+    Creating a view doesn't copy the settings. LocalConfig never modifies
+    a section in place, a change replaces the section, so a view keeps
+    the settings of the version it was created from. Use copy() to get
+    a snapshot that can be modified.
+
+    :param data: Settings (dict)
+    :param version: Version of the settings
+    """
+
+    __slots__ = ("_data", "_version")
+
+    def __init__(self, data, version=0):
+
+        self._data = data
+        self._version = version
+
+    def version(self):
+        """
+        :returns: Version of the settings, it changes each time the section is changed
+        """
+
+        return self._version
+
+    def copy(self):
+        """
+        :returns: Mutable copy of the settings (dict)
+        """
+
+        return copy.deepcopy(self._data)
+
+    def __getitem__(self, key):
+
+        return _view(self._data[key], self._version)
+
+    def __iter__(self):
+
+        return iter(self._data)
+
+    def __len__(self):
+
+        return len(self._data)
+
+    def __contains__(self, key):
+
+        return key in self._data
+
+    def __repr__(self):
+
+        return "SettingsView({!r}, version={})".format(self._data, self._version)
+
+
+class SettingsListView(collections.abc.Sequence):
+
+    """
+    Read-only view of a list in the settings.
+
+    :param data: Settings (list)
+    :param version: Version of the settings
+    """
+
+    __slots__ = ("_data", "_version")
+
+    def __init__(self, data, version=0):
+
+        self._data = data
+        self._version = version
+
+    def version(self):
+
+        return self._version
+
+    def copy(self):
+        """
+        :returns: Mutable copy of the list
+        """
+
+        return copy.deepcopy(self._data)
+
+    def __getitem__(self, index):
+
+        if isinstance(index, slice):
+            return SettingsListView(self._data[index], self._version)
+        return _view(self._data[index], self._version)
+
+    def __len__(self):
+
+        return len(self._data)
+
+    def __eq__(self, other):
+
+        if isinstance(other, (list, tuple, SettingsListView)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+
+        return "SettingsListView({!r}, version={})".format(self._data, self._version)
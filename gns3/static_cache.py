@@ -0,0 +1,218 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2017 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Disk cache for the static files (symbols) of the controller.
+"""
+
+import os
+import json
+import hashlib
+import collections
+
+import logging
+log = logging.getLogger(__name__)
+
+
+class StaticCache:
+
+    """
+    Persistent cache of the static files downloaded from the controller.
+
+    Files are stored by the SHA-256 of their content so two URLs serving
+    the same symbol share one file. The index keeps for each URL the file,
+    the HTTP validators (ETag and Last-Modified) and the last use. The
+    least recently used URLs are evicted when the cache is too big.
+
+    :param directory: Cache directory
+    :param max_size: Maximum size of the cache in bytes
+    """
+
+    INDEX_FILE = "index.json"
+    DEFAULT_MAX_SIZE = 50 * 1024 * 1024
+
+    def __init__(self, directory, max_size=DEFAULT_MAX_SIZE):
+
+        self._directory = directory
+        self._max_size = max_size
+        # URL => entry, the least recently used first
+        self._entries = collections.OrderedDict()
+        # URLs checked with the controller since the start
+        self._validated = set()
+        # The index has changed since it was written
+        self._dirty = False
+        self._load()
+
+    def directory(self):
+
+        return self._directory
+
+    def _load(self):
+
+        try:
+            os.makedirs(self._directory, exist_ok=True)
+            with open(os.path.join(self._directory, self.INDEX_FILE), encoding="utf-8") as f:
+                entries = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            log.warning("Can't read the static cache index {}: {}".format(self._directory, e))
+            return
+
+        for entry in entries:
+            try:
+                if os.path.exists(os.path.join(self._directory, entry["file"])):
+                    self._entries[entry["url"]] = entry
+            except (KeyError, TypeError):
+                continue
+
+    def isDirty(self):
+        """
+        :returns: True if the index has changed since it was written
+        """
+
+        return self._dirty
+
+    def save(self):
+        """
+        Write the index on disk if it has changed.
+        """
+
+        if not self._dirty:
+            return
+        self._dirty = False
+        path = os.path.join(self._directory, self.INDEX_FILE)
+        try:
+            os.makedirs(self._directory, exist_ok=True)
+            with open(path + ".tmp", "w", encoding="utf-8") as f:
+                json.dump(list(self._entries.values()), f)
+            os.replace(path + ".tmp", path)
+        except OSError as e:
+            log.error("Can't write the static cache index {}: {}".format(path, e))
+
+    def get(self, url):
+        """
+        :returns: Path of the cached file or None
+        """
+
+        entry = self._entries.get(url)
+        if entry is None:
+            return None
+        self._entries.move_to_end(url)
+        # The order of the entries is the LRU order
+        self._dirty = True
+        return os.path.join(self._directory, entry["file"])
+
+    def isValidated(self, url):
+        """
+        :returns: True if the cached file has been checked with the controller
+        """
+
+        return url in self._validated and url in self._entries
+
+    def setValidated(self, url):
+
+        if url in self._entries:
+            self._validated.add(url)
+
+    def clearValidated(self):
+        """
+        Check again all the cached files with the controller.
+        """
+
+        self._validated = set()
+
+    def validators(self, url):
+        """
+        :returns: HTTP headers to ask the controller if the file has changed
+        """
+
+        headers = {}
+        entry = self._entries.get(url)
+        if entry:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def store(self, url, data, etag=None, last_modified=None, extension=""):
+        """
+        Store the content of an URL.
+
+        :returns: Path of the cached file
+        """
+
+        filename = hashlib.sha256(data).hexdigest() + extension
+        path = os.path.join(self._directory, filename)
+        if not os.path.exists(path):
+            os.makedirs(self._directory, exist_ok=True)
+            with open(path + ".tmp", "wb") as f:
+                f.write(data)
+            os.replace(path + ".tmp", path)
+
+        previous = self._entries.pop(url, None)
+        self._entries[url] = {
+            "url": url,
+            "file": filename,
+            "size": len(data),
+            "etag": etag,
+            "last_modified": last_modified
+        }
+        self._validated.add(url)
+        self._dirty = True
+        if previous and previous["file"] != filename:
+            self._removeUnusedFile(previous["file"])
+        self._evict()
+        return path
+
+    def size(self):
+        """
+        :returns: Size of the cached files in bytes
+        """
+
+        files = {}
+        for entry in self._entries.values():
+            files[entry["file"]] = entry["size"]
+        return sum(files.values())
+
+    def _evict(self):
+
+        size = self.size()
+        # The most recent entry is never evicted
+        while size > self._max_size and len(self._entries) > 1:
+            url, entry = self._entries.popitem(last=False)
+            self._validated.discard(url)
+            if self._removeUnusedFile(entry["file"]):
+                size -= entry["size"]
+            log.debug("Evict {} from the static cache".format(url))
+
+    def _removeUnusedFile(self, filename):
+        """
+        Delete a file if no entry use it anymore.
+
+        :returns: True if the file has been deleted
+        """
+
+        for entry in self._entries.values():
+            if entry["file"] == filename:
+                return False
+        try:
+            os.remove(os.path.join(self._directory, filename))
+        except OSError as e:
+            log.debug("Can't remove {} from the static cache: {}".format(filename, e))
+        return True
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2017 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Renderers shared by all the items displaying the same symbol.
+"""
+
+from .qt.qimage_svg_renderer import QImageSvgRenderer
+
+import logging
+log = logging.getLogger(__name__)
+
+
+class SymbolRendererPool:
+
+    """
+    Reference counted pool of symbol renderers.
+
+    An item acquire the renderer of a symbol and release it when it
+    doesn't display the symbol anymore. The renderer is freed when the
+    last item release it. The loading placeholder is never freed.
+    """
+
+    PLACEHOLDER = ":/icons/reload.svg"
+    FALLBACK = ":/icons/cancel.svg"
+
+    def __init__(self):
+
+        # Path => [renderer, number of users]
+        self._renderers = {}
+        self._placeholder = None
+
+    def placeholder(self):
+        """
+        :returns: Renderer displayed while a symbol is loading
+        """
+
+        if self._placeholder is None:
+            self._placeholder = QImageSvgRenderer(self.PLACEHOLDER)
+            self._placeholder.setObjectName("symbol_loading")
+        return self._placeholder
+
+    def acquire(self, path):
+        """
+        Get the renderer of a symbol, each call must be paired with a release.
+
+        :param path: Path of the symbol
+        :returns: QImageSvgRenderer instance
+        """
+
+        entry = self._renderers.get(path)
+        if entry is None:
+            renderer = QImageSvgRenderer(path, fallback=self.FALLBACK)
+            renderer.setObjectName(path)
+            entry = self._renderers[path] = [renderer, 0]
+            log.debug("Renderer created for {} ({} alive)".format(path, len(self._renderers)))
+        entry[1] += 1
+        return entry[0]
+
+    def release(self, renderer):
+        """
+        Release a renderer returned by acquire.
+
+        :param renderer: QImageSvgRenderer instance
+        """
+
+        path = renderer.objectName()
+        entry = self._renderers.get(path)
+        if entry is None or entry[0] is not renderer:
+            return
+        entry[1] -= 1
+        if entry[1] <= 0:
+            del self._renderers[path]
+            log.debug("Renderer freed for {} ({} alive)".format(path, len(self._renderers)))
+
+    def references(self, path):
+        """
+        :returns: Number of users of the renderer of a symbol
+        """
+
+        entry = self._renderers.get(path)
+        if entry is None:
+            return 0
+        return entry[1]
+
+    def alive(self):
+        """
+        :returns: Number of symbol renderers in memory
+        """
+
+        return len(self._renderers)
+
+    @staticmethod
+    def instance():
+        """
+        Singleton to return only one instance of SymbolRendererPool.
+
+        :returns: instance of SymbolRendererPool
+        """
+
+        if not hasattr(SymbolRendererPool, "_instance") or SymbolRendererPool._instance is None:
+            SymbolRendererPool._instance = SymbolRendererPool()
+        return SymbolRendererPool._instance
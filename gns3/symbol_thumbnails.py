@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2017 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Thumbnails of the symbols, rendered by a pool of threads.
+"""
+
+import os
+import hashlib
+
+from .qt import QtCore, QtGui
+from .qt.qimage_svg_renderer import QImageSvgRenderer
+
+import logging
+log = logging.getLogger(__name__)
+
+
+def renderThumbnail(path, size, directory=None):
+    """
+    Render a symbol in a QImage, QPixmap can't be used outside of the GUI thread.
+
+    The thumbnail is stored in the directory with the hash of the content
+    of the symbol, so it's rendered only once for all the URLs serving
+    the same symbol.
+
+    :param path: Path of the symbol file
+    :param size: Width and height of the thumbnail
+    :param directory: Directory of the thumbnails, None to not store them
+    :returns: QImage instance or None if the file can't be read
+    """
+
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError as e:
+        log.debug("Can't read symbol {}: {}".format(path, e))
+        return None
+
+    thumbnail_path = None
+    if directory:
+        thumbnail_path = os.path.join(directory, "{}-{}.png".format(hashlib.sha256(data).hexdigest(), size))
+        if os.path.exists(thumbnail_path):
+            image = QtGui.QImage(thumbnail_path)
+            if not image.isNull():
+                return image
+
+    svg_renderer = QImageSvgRenderer(path)
+    image = QtGui.QImage(size, size, QtGui.QImage.Format_ARGB32)
+    # Set the ARGB to 0 to prevent rendering artifacts
+    image.fill(0x00000000)
+    painter = QtGui.QPainter(image)
+    svg_renderer.render(painter)
+    painter.end()
+
+    if thumbnail_path:
+        try:
+            os.makedirs(directory, exist_ok=True)
+            if image.save(thumbnail_path + ".tmp", "PNG"):
+                os.replace(thumbnail_path + ".tmp", thumbnail_path)
+        except OSError as e:
+            log.warning("Can't store the thumbnail {}: {}".format(thumbnail_path, e))
+    return image
+
+
+class ThumbnailRunnable(QtCore.QRunnable):
+
+    """
+    Render a thumbnail in a thread of the pool.
+
+    :param thumbnails: SymbolThumbnails receiving the result
+    :param path: Path of the symbol file
+    """
+
+    def __init__(self, thumbnails, path):
+
+        super().__init__()
+        self._thumbnails = thumbnails
+        self._path = path
+        self._size = thumbnails.size()
+        self._directory = thumbnails.directory()
+
+    def run(self):
+
+        try:
+            image = renderThumbnail(self._path, self._size, self._directory)
+        except Exception as e:
+            log.error("Can't render the thumbnail of {}: {}".format(self._path, e))
+            image = None
+        # Queued to the GUI thread
+        self._thumbnails.rendered_signal.emit(self._path, image)
+
+
+class SymbolThumbnails(QtCore.QObject):
+
+    """
+    Render the thumbnails of the symbols without blocking the GUI.
+
+    The thumbnails are kept in memory for the session and on disk for the
+    next sessions. thumbnail_ready_signal is emitted in the GUI thread
+    when a thumbnail has been rendered.
+
+    :param directory: Directory of the thumbnails on disk, None to not store them
+    :param size: Width and height of the thumbnails
+    """
+
+    DEFAULT_SIZE = 64
+
+    rendered_signal = QtCore.Signal(str, object)
+    thumbnail_ready_signal = QtCore.Signal(str)
+
+    def __init__(self, directory=None, size=DEFAULT_SIZE, parent=None):
+
+        super().__init__(parent)
+        self._directory = directory
+        self._size = size
+        # Path of the symbol => QImage
+        self._images = {}
+        self._pending = set()
+        self._pool = QtCore.QThreadPool(self)
+        # Keep a core for the GUI
+        self._pool.setMaxThreadCount(max(1, QtCore.QThread.idealThreadCount() - 1))
+        self.rendered_signal.connect(self._renderedSlot)
+
+    def directory(self):
+
+        return self._directory
+
+    def size(self):
+
+        return self._size
+
+    def thumbnail(self, path):
+        """
+        :returns: QImage of the symbol or None if not rendered yet
+        """
+
+        return self._images.get(path)
+
+    def request(self, path):
+        """
+        Render the thumbnail of a symbol in the background.
+
+        :param path: Path of the symbol file
+        :returns: QImage if the thumbnail is already rendered
+        """
+
+        image = self._images.get(path)
+        if image is not None:
+            return image
+        if path not in self._pending:
+            self._pending.add(path)
+            self._pool.start(ThumbnailRunnable(self, path))
+        return None
+
+    def waitForDone(self, msecs=-1):
+
+        return self._pool.waitForDone(msecs)
+
+    def _renderedSlot(self, path, image):
+
+        if path not in self._pending:
+            return
+        self._pending.discard(path)
+        if image is None:
+            return
+        self._images[path] = image
+        self.thumbnail_ready_signal.emit(path)
+
+    @staticmethod
+    def instance():
+        """
+        Singleton to return only one instance of SymbolThumbnails.
+
+        :returns: instance of SymbolThumbnails
+        """
+
+        if not hasattr(SymbolThumbnails, "_instance") or SymbolThumbnails._instance is None:
+            from .local_config import LocalConfig
+            directory = os.path.join(LocalConfig.instance().configDirectory(), "cache", "thumbnails")
+            SymbolThumbnails._instance = SymbolThumbnails(directory)
+        return SymbolThumbnails._instance
@@ -46,6 +46,7 @@ class Topology(QtCore.QObject):
     Topology.
     """
     node_added_signal = QtCore.Signal(int)
+    link_added_signal = QtCore.Signal(int)
     project_changed_signal = QtCore.Signal()
 
     def __init__(self):
@@ -57,6 +58,17 @@ class Topology(QtCore.QObject):
         self._notes = []
         self._drawings = []
         self._images = []
+
+        # Indexes used to lookup items without walking the lists,
+        # notifications from the controller rely heavily on them
+        self._nodes_by_id = {}
+        self._nodes_by_node_id = {}
+        self._links_by_id = {}
+        self._links_by_link_id = {}
+        self._link_id_keys = {}
+        self._links_by_port = {}
+        self._drawings_by_drawing_id = {}
+
         self._project = None
         self._main_window = None
 
@@ -120,12 +132,14 @@ class Topology(QtCore.QObject):
             # Assert to detect when we create a new project object for the same project
             assert project is None or (project != self._project and project.id != self._project.id)
             self._project.stopListenNotifications()
+            self._project.stopLoadingTopology()
 
         self._main_window.uiGraphicsView.reset()
         self._project = project
         if project:
             self._project.project_updated_signal.connect(self._projectUpdatedSlot)
             self._project.project_creation_error_signal.connect(self._projectCreationErrorSlot)
+            self._project.topology_load_progress_signal.connect(self._topologyLoadProgressSlot)
             self._main_window.setWindowTitle("{name} - GNS3".format(name=self._project.name()))
             self._main_window.uiGraphicsView.setSceneSize(project.sceneWidth(), project.sceneHeight())
         else:
@@ -133,6 +147,14 @@ class Topology(QtCore.QObject):
 
         self.project_changed_signal.emit()
 
+    def _topologyLoadProgressSlot(self, created, total):
+        if total == 0:
+            self._main_window.uiStatusBar.showMessage("Loading topology: {} items created".format(created))
+        elif created < total:
+            self._main_window.uiStatusBar.showMessage("Loading topology: {}/{} items created".format(created, total))
+        else:
+            self._main_window.uiStatusBar.showMessage("Topology loaded: {} items".format(total), 2000)
+
     def _projectUpdatedSlot(self):
         if not self._project or not self._project.filesDir() or not self._project.filename():
             return
@@ -284,6 +306,9 @@ It is your responsability to check if you have the right to distribute the image
         """
 
         self._nodes.append(node)
+        self._nodes_by_id[node.id()] = node
+        if hasattr(node, "node_id"):
+            self._nodes_by_node_id[node.node_id()] = node
         self.node_added_signal.emit(node.id())
 
     def removeNode(self, node):
@@ -293,8 +318,11 @@ It is your responsability to check if you have the right to distribute the image
         :param node: Node instance
         """
 
-        if node in self._nodes:
+        if self._nodes_by_id.get(node.id()) is node:
             self._nodes.remove(node)
+            del self._nodes_by_id[node.id()]
+            if hasattr(node, "node_id") and self._nodes_by_node_id.get(node.node_id()) is node:
+                del self._nodes_by_node_id[node.node_id()]
 
     def getNodeFromUuid(self, node_id):
         """
@@ -303,9 +331,9 @@ It is your responsability to check if you have the right to distribute the image
         :returns: Node instance or None
         """
 
-        for node in self._nodes:
-            if hasattr(node, "node_id") and node.node_id() == node_id:
-                return node
+        node = self._nodes_by_node_id.get(node_id)
+        if node is not None and node.node_id() == node_id:
+            return node
         return None
 
     def getNode(self, base_node_id):
@@ -315,10 +343,7 @@ It is your responsability to check if you have the right to distribute the image
         :returns: Node instance or None
         """
 
-        for node in self._nodes:
-            if node.id() == base_node_id:
-                return node
-        return None
+        return self._nodes_by_id.get(base_node_id)
 
     def addLink(self, link):
         """
@@ -328,14 +353,46 @@ It is your responsability to check if you have the right to distribute the image
         :returns: Boolean false if link already exists
         """
 
-        for l in self._links:
-            if (l._source_node == link._destination_node and l._source_port == link._destination_port) or \
-                    (l._source_node == link._source_node and l._source_port == link._source_port):
-                return False
+        source = (link._source_node, link._source_port)
+        destination = (link._destination_node, link._destination_port)
+        if source in self._links_by_port or destination in self._links_by_port:
+            return False
 
         self._links.append(link)
+        self._links_by_id[link.id()] = link
+        self._links_by_port[source] = link
+        self._links_by_port[destination] = link
+        self._indexLinkId(link)
+        link.updated_link_signal.connect(self._linkUpdatedSlot)
+        self.link_added_signal.emit(link.id())
         return True
 
+    def _indexLinkId(self, link):
+        """
+        Index a link by its uuid, replacing any previous uuid key.
+
+        :param link: Link instance
+        """
+
+        previous_link_id = self._link_id_keys.pop(link.id(), None)
+        if previous_link_id is not None and self._links_by_link_id.get(previous_link_id) is link:
+            del self._links_by_link_id[previous_link_id]
+        if link.link_id():
+            self._links_by_link_id[link.link_id()] = link
+            self._link_id_keys[link.id()] = link.link_id()
+
+    def _linkUpdatedSlot(self, link_id):
+        """
+        The controller return the final link identifier
+        only after the link has been created.
+
+        :param link_id: base link identifier
+        """
+
+        link = self._links_by_id.get(link_id)
+        if link is not None and self._link_id_keys.get(link_id) != link.link_id():
+            self._indexLinkId(link)
+
     def removeLink(self, link):
         """
         Removes a link from this topology.
@@ -343,8 +400,15 @@ It is your responsability to check if you have the right to distribute the image
         :param link: Link instance
         """
 
-        if link in self._links:
+        if link is not None and self._links_by_id.get(link.id()) is link:
             self._links.remove(link)
+            del self._links_by_id[link.id()]
+            for key in ((link._source_node, link._source_port), (link._destination_node, link._destination_port)):
+                if self._links_by_port.get(key) is link:
+                    del self._links_by_port[key]
+            link_id = self._link_id_keys.pop(link.id(), None)
+            if link_id is not None and self._links_by_link_id.get(link_id) is link:
+                del self._links_by_link_id[link_id]
 
     def getLink(self, link_id):
         """
@@ -353,10 +417,7 @@ It is your responsability to check if you have the right to distribute the image
         :returns: Link instance or None
         """
 
-        for link in self._links:
-            if link.id() == link_id:
-                return link
-        return None
+        return self._links_by_id.get(link_id)
 
     def getLinkFromUuid(self, link_id):
         """
@@ -365,9 +426,9 @@ It is your responsability to check if you have the right to distribute the image
         :returns: Link instance or None
         """
 
-        for link in self._links:
-            if link.link_id() == link_id:
-                return link
+        link = self._links_by_link_id.get(link_id)
+        if link is not None and link.link_id() == link_id:
+            return link
         return None
 
     def addNote(self, note):
@@ -397,6 +458,7 @@ It is your responsability to check if you have the right to distribute the image
         """
 
         self._drawings.append(drawing)
+        self._drawings_by_drawing_id[drawing.drawing_id()] = drawing
 
     def removeDrawing(self, drawing):
         """
@@ -407,6 +469,8 @@ It is your responsability to check if you have the right to distribute the image
 
         if drawing in self._drawings:
             self._drawings.remove(drawing)
+            if self._drawings_by_drawing_id.get(drawing.drawing_id()) is drawing:
+                del self._drawings_by_drawing_id[drawing.drawing_id()]
 
     def getDrawingFromUuid(self, drawing_id):
         """
@@ -415,9 +479,9 @@ It is your responsability to check if you have the right to distribute the image
         :returns: Node instance or None
         """
 
-        for drawing in self._drawings:
-            if drawing.drawing_id() == drawing_id:
-                return drawing
+        drawing = self._drawings_by_drawing_id.get(drawing_id)
+        if drawing is not None and drawing.drawing_id() == drawing_id:
+            return drawing
         return None
 
     def nodes(self):
@@ -465,6 +529,13 @@ It is your responsability to check if you have the right to distribute the image
         self._notes.clear()
         self._drawings.clear()
         self._images.clear()
+        self._nodes_by_id.clear()
+        self._nodes_by_node_id.clear()
+        self._links_by_id.clear()
+        self._links_by_link_id.clear()
+        self._link_id_keys.clear()
+        self._links_by_port.clear()
+        self._drawings_by_drawing_id.clear()
 
     def __str__(self):
 
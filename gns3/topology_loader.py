@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2017 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Load the nodes, links and drawings of a project without freezing the GUI.
+"""
+
+import collections
+
+from .qt import QtCore, qpartial
+from .topology import Topology
+
+import logging
+log = logging.getLogger(__name__)
+
+
+class TopologyLoader(QtCore.QObject):
+
+    """
+    Topology loader.
+
+    The nodes, links and drawings are requested at the same time and
+    the items are created by chunks, one chunk per event loop turn.
+    A link is created only when its two nodes exist.
+
+    :param project: Project instance
+    :param chunk_size: Number of items created per event loop turn
+    """
+
+    # Number of items created and total number of items (0 until all lists are received)
+    progress_signal = QtCore.Signal(int, int)
+    finished_signal = QtCore.Signal()
+
+    def __init__(self, project, chunk_size=50):
+
+        super().__init__()
+        self._project = project
+        self._chunk_size = chunk_size
+
+        self._nodes = collections.deque()
+        self._drawings = collections.deque()
+        self._links = collections.deque()
+
+        # Links waiting for a node, by missing node identifier
+        self._parked_links = {}
+        self._parked_links_count = 0
+
+        self._pending_lists = set()
+        self._total = 0
+        self._created = 0
+        self._running = False
+
+        self._timer = QtCore.QTimer(self)
+        self._timer.setInterval(0)
+        self._timer.timeout.connect(self._processChunk)
+
+    def start(self):
+        """
+        Request the topology from the controller.
+        """
+
+        self._running = True
+        self._pending_lists = {"nodes", "links", "drawings"}
+        for name in ("nodes", "links", "drawings"):
+            self._project.get("/" + name, qpartial(self._listCallback, name), showProgress=False)
+
+    def cancel(self):
+        """
+        Stop loading, the items already created are kept.
+        """
+
+        self._running = False
+        self._timer.stop()
+        self._nodes.clear()
+        self._drawings.clear()
+        self._links.clear()
+        self._parked_links = {}
+        self._parked_links_count = 0
+
+    def isRunning(self):
+
+        return self._running
+
+    def _listCallback(self, name, result, error=False, **kwargs):
+
+        if not self._running:
+            return
+        self._pending_lists.discard(name)
+        if error:
+            log.error("Error while listing {}: {}".format(name, result["message"]))
+        elif name == "nodes":
+            self._nodes.extend(result)
+        elif name == "links":
+            self._links.extend(result)
+        else:
+            self._drawings.extend(result)
+
+        if not error:
+            self._total += len(result)
+        self._emitProgress()
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def _emitProgress(self):
+
+        if self._pending_lists:
+            self.progress_signal.emit(self._created, 0)
+        else:
+            self.progress_signal.emit(self._created, self._total)
+
+    def _processChunk(self):
+        """
+        Create the next chunk of items.
+        """
+
+        topology = Topology.instance()
+        budget = self._chunk_size
+        while budget > 0 and self._running:
+            if self._nodes:
+                node_data = self._nodes.popleft()
+                if topology.getNodeFromUuid(node_data["node_id"]) is None:
+                    topology.createNode(node_data)
+                self._releaseParkedLinks(node_data["node_id"])
+            elif self._drawings:
+                drawing_data = self._drawings.popleft()
+                if topology.getDrawingFromUuid(drawing_data["drawing_id"]) is None:
+                    topology.createDrawing(drawing_data)
+            elif self._links:
+                link_data = self._links.popleft()
+                missing_node_id = self._missingNode(topology, link_data)
+                if missing_node_id is None:
+                    if topology.getLinkFromUuid(link_data["link_id"]) is None:
+                        topology.createLink(link_data)
+                elif self._pending_lists or self._nodes:
+                    # Parking a link is cheap, it doesn't use the budget
+                    self._parked_links.setdefault(missing_node_id, []).append(link_data)
+                    self._parked_links_count += 1
+                    continue
+                else:
+                    log.error("Could not create link {}: node {} doesn't exist".format(link_data["link_id"], missing_node_id))
+            else:
+                break
+            self._created += 1
+            budget -= 1
+
+        if not self._running:
+            return
+        self._emitProgress()
+        if self._nodes or self._drawings or self._links:
+            return
+
+        # Wait for the next list from the controller
+        self._timer.stop()
+        if self._pending_lists:
+            return
+
+        if self._parked_links_count:
+            log.error("{} links have not been created because a node is missing".format(self._parked_links_count))
+        self._running = False
+        self.finished_signal.emit()
+
+    def _missingNode(self, topology, link_data):
+        """
+        :returns: Identifier of a node of the link not yet created or None
+        """
+
+        for link_node in link_data["nodes"]:
+            if topology.getNodeFromUuid(link_node["node_id"]) is None:
+                return link_node["node_id"]
+        return None
+
+    def _releaseParkedLinks(self, node_id):
+        """
+        Queue again the links waiting for this node.
+        """
+
+        links = self._parked_links.pop(node_id, None)
+        if links:
+            self._parked_links_count -= len(links)
+            self._links.extendleft(reversed(links))
@@ -19,7 +19,7 @@
 Topology summary view that list all the nodes, their status and connections.
 """
 
-from .qt import QtGui, QtCore, QtWidgets, qslot
+from .qt import QtGui, QtCore, QtWidgets, qslot, qpartial
 from .node import Node
 from .topology import Topology
 from .items.node_item import NodeItem
@@ -31,115 +31,362 @@ import logging
 log = logging.getLogger(__name__)
 
 
-class TopologyNodeItem(QtWidgets.QTreeWidgetItem):
+class TopologyNodeEntry:
 
     """
-    Custom item for the QTreeWidget instance
-    (topology summary view).
-
-    :param parent: parent widget
-    :param node: Node instance
+    A node row of the topology summary model.
     """
 
-    def __init__(self, parent, node):
+    __slots__ = ("node", "name", "sort_key", "links")
 
-        super().__init__(parent)
-        self._node = node
-        self._parent = parent
+    def __init__(self, node):
 
-        # we want to know about the node events
-        node.started_signal.connect(self._refreshStatusSlot)
-        node.stopped_signal.connect(self._refreshStatusSlot)
-        node.suspended_signal.connect(self._refreshStatusSlot)
-        node.updated_signal.connect(self._refreshNodeSlot)
-        node.created_signal.connect(self._refreshNodeSlot)
-        node.deleted_signal.connect(self._deletedNodeSlot)
+        self.node = node
+        self.name = node.name()
+        self.sort_key = natural_sort_key(self.name)
+        # TopologyLinkEntry of the connections of the node
+        self.links = []
 
-        self._refreshStatusSlot()
-        self._refreshNodeSlot()
+    def capturing(self):
 
-    @qslot
-    def _refreshStatusSlot(self, *args):
+        for link_entry in self.links:
+            if link_entry.capturing:
+                return True
+        return False
+
+
+class TopologyLinkEntry:
+
+    """
+    A connection row, child of a node row.
+    """
+
+    __slots__ = ("node_entry", "link", "text", "sort_key", "capturing")
+
+    def __init__(self, node_entry, link):
+
+        self.node_entry = node_entry
+        self.link = link
+        self.text = None
+        self.sort_key = None
+        self.capturing = False
+        self.refresh()
+
+    def refresh(self):
         """
-        Changes the icon to show the node status (started, stopped etc.)
+        :returns: True if the row has changed
         """
-        self.setText(0, self._node.name())
-        if self._node.status() == Node.started:
-            self.setIcon(0, QtGui.QIcon(':/icons/led_green.svg'))
-        elif self._node.status() == Node.suspended:
-            self.setIcon(0, QtGui.QIcon(':/icons/led_yellow.svg'))
+
+        port = self.link.getNodePort(self.node_entry.node)
+        text = "{} {}".format(port.shortName(), port.description(short=True))
+        capturing = self.link.capturing()
+        if text == self.text and capturing == self.capturing:
+            return False
+        if text != self.text:
+            self.text = text
+            self.sort_key = natural_sort_key(text)
+        self.capturing = capturing
+        return True
+
+
+class TopologySummaryModel(QtCore.QAbstractItemModel):
+
+    """
+    Model of the nodes and of their connections.
+
+    The rows are updated one by one from the signals of the nodes and
+    links. The rows are not sorted, the sort keys are computed when a
+    name changes and used by TopologySummaryProxyModel.
+    """
+
+    NodeRole = QtCore.Qt.UserRole
+    LinkRole = QtCore.Qt.UserRole + 1
+    SortKeyRole = QtCore.Qt.UserRole + 2
+    CapturingRole = QtCore.Qt.UserRole + 3
+
+    def __init__(self, parent=None):
+
+        super().__init__(parent)
+        self._nodes = []
+        # Node id => row
+        self._node_rows = {}
+        # Internal pointer of the node rows, the link rows point to their node entry
+        self._root = object()
+
+        self._started_icon = QtGui.QIcon(":/icons/led_green.svg")
+        self._suspended_icon = QtGui.QIcon(":/icons/led_yellow.svg")
+        self._stopped_icon = QtGui.QIcon(":/icons/led_red.svg")
+        self._capture_icon = QtGui.QIcon(":/icons/inspect.svg")
+
+    def index(self, row, column, parent=QtCore.QModelIndex()):
+
+        if column != 0 or row < 0:
+            return QtCore.QModelIndex()
+        if not parent.isValid():
+            if row < len(self._nodes):
+                return self.createIndex(row, column, self._root)
+            return QtCore.QModelIndex()
+        if parent.internalPointer() is self._root:
+            node_entry = self._nodes[parent.row()]
+            if row < len(node_entry.links):
+                return self.createIndex(row, column, node_entry)
+        return QtCore.QModelIndex()
+
+    def parent(self, index):
+
+        if not index.isValid() or index.internalPointer() is self._root:
+            return QtCore.QModelIndex()
+        node_entry = index.internalPointer()
+        return self.createIndex(self._node_rows[node_entry.node.id()], 0, self._root)
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+
+        if not parent.isValid():
+            return len(self._nodes)
+        if parent.internalPointer() is self._root:
+            return len(self._nodes[parent.row()].links)
+        return 0
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+
+        return 1
+
+    def _entry(self, index):
+
+        if index.internalPointer() is self._root:
+            return self._nodes[index.row()]
+        return index.internalPointer().links[index.row()]
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+
+        if not index.isValid():
+            return None
+        entry = self._entry(index)
+        if isinstance(entry, TopologyNodeEntry):
+            if role == QtCore.Qt.DisplayRole:
+                return entry.name
+            elif role == QtCore.Qt.DecorationRole:
+                status = entry.node.status()
+                if status == Node.started:
+                    return self._started_icon
+                elif status == Node.suspended:
+                    return self._suspended_icon
+                return self._stopped_icon
+            elif role == self.NodeRole:
+                return entry.node
+            elif role == self.SortKeyRole:
+                return entry.sort_key
+            elif role == self.CapturingRole:
+                return entry.capturing()
         else:
-            self.setIcon(0, QtGui.QIcon(':/icons/led_red.svg'))
+            if role == QtCore.Qt.DisplayRole:
+                return entry.text
+            elif role == QtCore.Qt.DecorationRole:
+                if entry.capturing:
+                    return self._capture_icon
+            elif role == self.NodeRole:
+                return entry.node_entry.node
+            elif role == self.LinkRole:
+                return entry.link
+            elif role == self.SortKeyRole:
+                return entry.sort_key
+            elif role == self.CapturingRole:
+                return entry.capturing
+        return None
 
-    @qslot
-    def _refreshNodeSlot(self, *args):
+    def nodeIndex(self, node):
         """
-        Slot to update the node.
+        :returns: Index of the row of a node
         """
-        self.refresh()
 
-    def node(self):
-        """
-        Returns the node.
+        row = self._node_rows.get(node.id())
+        if row is None:
+            return QtCore.QModelIndex()
+        return self.createIndex(row, 0, self._root)
+
+    def _linkRow(self, node_entry, link):
+
+        for row, link_entry in enumerate(node_entry.links):
+            if link_entry.link is link:
+                return row
+        return None
+
+    def clear(self):
+
+        self.beginResetModel()
+        self._nodes = []
+        self._node_rows = {}
+        self.endResetModel()
 
-        :return: Node instance
+    def addNode(self, node):
+        """
+        Add the row of a node with its connections.
         """
 
-        return self._node
+        if node.id() in self._node_rows:
+            return
+        row = len(self._nodes)
+        self.beginInsertRows(QtCore.QModelIndex(), row, row)
+        self._nodes.append(TopologyNodeEntry(node))
+        self._node_rows[node.id()] = row
+        self.endInsertRows()
 
-    def refresh(self):
+        node.started_signal.connect(qpartial(self._nodeStatusSlot, node))
+        node.stopped_signal.connect(qpartial(self._nodeStatusSlot, node))
+        node.suspended_signal.connect(qpartial(self._nodeStatusSlot, node))
+        node.updated_signal.connect(qpartial(self.refreshNode, node))
+        node.created_signal.connect(qpartial(self.refreshNode, node))
+        node.deleted_signal.connect(qpartial(self.removeNode, node))
+
+        for link in list(node.links()):
+            self.refreshLink(link)
+
+    def removeNode(self, node, *args):
         """
-        Updates the widget item with the current node name.
+        Remove the row of a node.
         """
 
-        if self._node.name() != self.text(0):
-            # refresh all the other item if the node name has changed
-            self._parent.refreshAllLinks(source_child=self)
-        self.setText(0, self._node.name())
-        self.refreshLinks()
-        self._parent.invisibleRootItem().sortChildren(0, QtCore.Qt.AscendingOrder)
+        row = self._node_rows.get(node.id())
+        if row is None or self._nodes[row].node is not node:
+            return
+        self.beginRemoveRows(QtCore.QModelIndex(), row, row)
+        del self._nodes[row]
+        del self._node_rows[node.id()]
+        for index in range(row, len(self._nodes)):
+            self._node_rows[self._nodes[index].node.id()] = index
+        self.endRemoveRows()
 
-    def refreshLinks(self):
+    def _nodeStatusSlot(self, node, *args):
+
+        index = self.nodeIndex(node)
+        if index.isValid():
+            self.dataChanged.emit(index, index, [QtCore.Qt.DecorationRole])
+
+    def refreshNode(self, node, *args):
         """
-        List all the connections as children.
+        Update the row of a node after a change.
         """
 
-        self.takeChildren()
+        index = self.nodeIndex(node)
+        if not index.isValid():
+            return
+        node_entry = self._nodes[index.row()]
+        name = node.name()
+        if name != node_entry.name:
+            node_entry.name = name
+            node_entry.sort_key = natural_sort_key(name)
+            self.dataChanged.emit(index, index)
+            # The connections of the other nodes show the name of this node
+            for link_entry in node_entry.links:
+                peer = link_entry.link.destinationNode() if link_entry.link.sourceNode() is node else link_entry.link.sourceNode()
+                self._refreshLinkRow(peer, link_entry.link)
+
+        for link in list(node.links()):
+            if self._linkRow(node_entry, link) is None:
+                self.refreshLink(link)
+            else:
+                self._refreshLinkRow(node, link)
 
-        capturing = False
-        for link in self._node.links():
-            item = QtWidgets.QTreeWidgetItem()
-            port = link.getNodePort(self._node)
-            item.setText(0, "{} {}".format(port.shortName(), port.description(short=True)))
-            item.setData(0, QtCore.Qt.UserRole, link)
-            if link.capturing():
-                item.setIcon(0, QtGui.QIcon(':/icons/inspect.svg'))
-                capturing = True
-            self.addChild(item)
+    def refreshLink(self, link, *args):
+        """
+        Add or update the rows of a link under its two nodes.
+        """
 
-        if self._parent.show_only_devices_with_capture and capturing is False:
-            self.setHidden(True)
-        else:
-            self.setHidden(False)
+        if not link.initialized():
+            return
+        for node in (link.sourceNode(), link.destinationNode()):
+            row = self._node_rows.get(node.id())
+            if row is None:
+                continue
+            node_entry = self._nodes[row]
+            if self._linkRow(node_entry, link) is None:
+                parent = self.createIndex(row, 0, self._root)
+                link_row = len(node_entry.links)
+                self.beginInsertRows(parent, link_row, link_row)
+                node_entry.links.append(TopologyLinkEntry(node_entry, link))
+                self.endInsertRows()
+                if node_entry.links[-1].capturing:
+                    self.dataChanged.emit(parent, parent, [self.CapturingRole])
+            else:
+                self._refreshLinkRow(node, link)
 
-        self.sortChildren(0, QtCore.Qt.AscendingOrder)
+    def _refreshLinkRow(self, node, link):
 
-    @qslot
-    def _deletedNodeSlot(self, *args):
+        row = self._node_rows.get(node.id())
+        if row is None:
+            return
+        node_entry = self._nodes[row]
+        link_row = self._linkRow(node_entry, link)
+        if link_row is None:
+            return
+        link_entry = node_entry.links[link_row]
+        capturing = link_entry.capturing
+        if link_entry.refresh():
+            index = self.createIndex(link_row, 0, node_entry)
+            self.dataChanged.emit(index, index)
+            if capturing != link_entry.capturing:
+                # The filter on the captures depends on the node row
+                parent = self.createIndex(row, 0, self._root)
+                self.dataChanged.emit(parent, parent, [self.CapturingRole])
+
+    def removeLink(self, link, *args):
         """
-        Removes the node from the view.
+        Remove the rows of a link.
         """
 
-        tree = self.treeWidget()
-        tree.takeTopLevelItem(tree.indexOfTopLevelItem(self))
-        tree.nodes_id.remove(self._node.id())
+        for node in (link.sourceNode(), link.destinationNode()):
+            row = self._node_rows.get(node.id())
+            if row is None:
+                continue
+            node_entry = self._nodes[row]
+            link_row = self._linkRow(node_entry, link)
+            if link_row is None:
+                continue
+            parent = self.createIndex(row, 0, self._root)
+            self.beginRemoveRows(parent, link_row, link_row)
+            link_entry = node_entry.links.pop(link_row)
+            self.endRemoveRows()
+            if link_entry.capturing:
+                self.dataChanged.emit(parent, parent, [self.CapturingRole])
+
+
+class TopologySummaryProxyModel(QtCore.QSortFilterProxyModel):
+
+    """
+    Sort the rows with a natural sort and hide the
+    nodes without capture when requested.
+    """
+
+    def __init__(self, parent=None):
+
+        super().__init__(parent)
+        self._show_only_devices_with_capture = False
+        self.setDynamicSortFilter(True)
+        self.setSortRole(TopologySummaryModel.SortKeyRole)
+
+    def showOnlyDevicesWithCapture(self):
+
+        return self._show_only_devices_with_capture
+
+    def setShowOnlyDevicesWithCapture(self, value):
+
+        self._show_only_devices_with_capture = value
+        self.invalidateFilter()
+
+    def lessThan(self, left, right):
+
+        model = self.sourceModel()
+        return model.data(left, TopologySummaryModel.SortKeyRole) < model.data(right, TopologySummaryModel.SortKeyRole)
+
+    def filterAcceptsRow(self, source_row, source_parent):
 
-    def __lt__(self, otherItem):
-        column = self.treeWidget().sortColumn()
-        return natural_sort_key(self.text(column)) < natural_sort_key(otherItem.text(column))
+        if self._show_only_devices_with_capture and not source_parent.isValid():
+            model = self.sourceModel()
+            return model.data(model.index(source_row, 0), TopologySummaryModel.CapturingRole)
+        return True
 
 
-class TopologySummaryView(QtWidgets.QTreeWidget):
+class TopologySummaryView(QtWidgets.QTreeView):
 
     """
     Topology summary view implementation.
@@ -150,34 +397,52 @@ class TopologySummaryView(QtWidgets.QTreeWidget):
     def __init__(self, parent):
 
         super().__init__(parent)
-        self.nodes_id = set()
         self._topology = Topology.instance()
+        self._model = TopologySummaryModel(self)
+        self._proxy_model = TopologySummaryProxyModel(self)
+        self._proxy_model.setSourceModel(self._model)
+        self.setModel(self._proxy_model)
+        self.sortByColumn(0, QtCore.Qt.AscendingOrder)
+        self.setUniformRowHeights(True)
+
         self._topology.node_added_signal.connect(self._nodeAddedSlot)
+        self._topology.link_added_signal.connect(self._linkAddedSlot)
         self._topology.project_changed_signal.connect(self._projectChangedSlot)
-        self.itemSelectionChanged.connect(self._itemSelectionChangedSlot)
-        self.show_only_devices_with_capture = False
+        self.selectionModel().currentChanged.connect(self._currentChangedSlot)
         self.setExpandsOnDoubleClick(False)
-        self.itemDoubleClicked.connect(self._itemDoubleClickedSlot)
+        self.doubleClicked.connect(self._doubleClickedSlot)
 
-    @qslot
-    def _projectChangedSlot(self, *args):
+    def summaryModel(self):
+        """
+        :returns: TopologySummaryModel instance
+        """
+
+        return self._model
+
+    @property
+    def show_only_devices_with_capture(self):
+
+        return self._proxy_model.showOnlyDevicesWithCapture()
+
+    @show_only_devices_with_capture.setter
+    def show_only_devices_with_capture(self, value):
+
+        self._proxy_model.setShowOnlyDevicesWithCapture(value)
+
+    def clear(self):
         """
         Clears all the topology summary.
         """
 
-        self.clear()
+        self._model.clear()
 
-    def refreshAllLinks(self, source_child=None):
+    @qslot
+    def _projectChangedSlot(self, *args):
         """
-        Refreshes all links for all items.
+        Clears all the topology summary.
         """
 
-        root = self.invisibleRootItem()
-        for index in range(0, root.childCount()):
-            child = root.child(index)
-            if source_child and source_child == child:
-                continue
-            child.refreshLinks()
+        self.clear()
 
     @qslot
     def _nodeAddedSlot(self, base_node_id, *args):
@@ -196,52 +461,70 @@ class TopologySummaryView(QtWidgets.QTreeWidget):
             log.error("could not find node with ID {}".format(base_node_id))
             return
 
-        # We check if we don't already have this node because it seem
+        # The model ignores a node already added because it seem
         # sometimes we can get twice the signal
-        if node.id() in self.nodes_id:
+        self._model.addNode(node)
+
+    @qslot
+    def _linkAddedSlot(self, link_id, *args):
+        """
+        Received events for link creation.
+
+        :param link_id: link identifier
+        """
+
+        link = self._topology.getLink(link_id)
+        if not link:
             return
-        self.nodes_id.add(node.id())
-        TopologyNodeItem(self, node)
+        # The link is shown once created on the controller
+        link.add_link_signal.connect(qpartial(self._model.refreshLink, link))
+        link.updated_link_signal.connect(qpartial(self._model.refreshLink, link))
+        link.delete_link_signal.connect(qpartial(self._model.removeLink, link))
+        self._model.refreshLink(link)
+
+    def _currentNodeAndLink(self):
+        """
+        :returns: Tuple (node, link) of the current row, link is None for a node row
+        """
+
+        index = self.currentIndex()
+        if not index.isValid():
+            return None, None
+        return index.data(TopologySummaryModel.NodeRole), index.data(TopologySummaryModel.LinkRole)
 
     @qslot
-    def _itemSelectionChangedSlot(self, *args):
+    def _currentChangedSlot(self, *args):
         """
         Slot called when an item is selected in the TreeWidget.
         """
 
-        current_item = self.currentItem()
-        if current_item:
+        node, link = self._currentNodeAndLink()
+        if node:
             from .main_window import MainWindow
             view = MainWindow.instance().uiGraphicsView
             for item in view.scene().items():
                 if isinstance(item, NodeItem):
-                    item.setSelected(False)
-                    if isinstance(current_item, TopologyNodeItem) and item.node().id() == current_item.node().id():
-                        item.setSelected(True)
+                    item.setSelected(link is None and item.node().id() == node.id())
                 elif isinstance(item, LinkItem):
-                    item.setHovered(False)
-                    if not isinstance(current_item, TopologyNodeItem):
-                        port = current_item.data(0, QtCore.Qt.UserRole)
-                        if item.sourcePort() == port or item.destinationPort() == port:
-                            item.setHovered(True)
+                    item.setHovered(link is not None and item.link() is link)
 
     @qslot
-    def _itemDoubleClickedSlot(self, current_item, *args):
+    def _doubleClickedSlot(self, index, *args):
         """
         When user double click on an element we center the topology on it
         """
-        if current_item != 0:
+
+        node, link = self._currentNodeAndLink()
+        if node:
             from .main_window import MainWindow
             view = MainWindow.instance().uiGraphicsView
             for item in view.scene().items():
-                if isinstance(item, NodeItem):
-                    if isinstance(current_item, TopologyNodeItem) and item.node().id() == current_item.node().id():
-                        view.centerOn(item)
-                elif isinstance(item, LinkItem):
-                    if not isinstance(current_item, TopologyNodeItem):
-                        port = current_item.data(0, QtCore.Qt.UserRole)
-                        if item.sourcePort() == port or item.destinationPort() == port:
-                            view.centerOn(item)
+                if link is None and isinstance(item, NodeItem) and item.node().id() == node.id():
+                    view.centerOn(item)
+                    break
+                elif link is not None and isinstance(item, LinkItem) and item.link() is link:
+                    view.centerOn(item)
+                    break
 
     def mousePressEvent(self, event):
         """
@@ -287,17 +570,16 @@ class TopologySummaryView(QtWidgets.QTreeWidget):
         stop_all_captures.triggered.connect(self._stopAllCapturesSlot)
         menu.addAction(stop_all_captures)
 
-        current_item = self.currentItem()
+        node, link = self._currentNodeAndLink()
         from .main_window import MainWindow
         view = MainWindow.instance().uiGraphicsView
-        if current_item and not current_item.isHidden():
+        if node:
             menu.addSeparator()
-            if isinstance(current_item, TopologyNodeItem):
+            if link is None:
                 view.populateDeviceContextualMenu(menu)
             else:
-                port = current_item.data(0, QtCore.Qt.UserRole)
                 for item in view.scene().items():
-                    if isinstance(item, LinkItem) and (item.sourcePort() == port or item.destinationPort() == port):
+                    if isinstance(item, LinkItem) and item.link() is link:
                         item.populateLinkContextualMenu(menu)
                         break
 
@@ -326,7 +608,6 @@ class TopologySummaryView(QtWidgets.QTreeWidget):
         """
 
         self.show_only_devices_with_capture = True
-        self.refreshAllLinks()
 
     @qslot
     def _showAllDevicesSlot(self, *args):
@@ -335,7 +616,6 @@ class TopologySummaryView(QtWidgets.QTreeWidget):
         """
 
         self.show_only_devices_with_capture = False
-        self.refreshAllLinks()
 
     @qslot
     def _stopAllCapturesSlot(self, *args):
@@ -313,8 +313,21 @@ class Ui_GeneralPreferencesPageWidget(object):
         self.uiSceneWidthSpinBox.setProperty("value", 2000)
         self.uiSceneWidthSpinBox.setObjectName("uiSceneWidthSpinBox")
         self.gridLayout_8.addWidget(self.uiSceneWidthSpinBox, 1, 0, 1, 2)
+        self.uiLevelOfDetailCheckBox = QtWidgets.QCheckBox(self.uiSceneTab)
+        self.uiLevelOfDetailCheckBox.setChecked(True)
+        self.uiLevelOfDetailCheckBox.setObjectName("uiLevelOfDetailCheckBox")
+        self.gridLayout_8.addWidget(self.uiLevelOfDetailCheckBox, 10, 0, 1, 2)
+        self.uiNodeItemCacheCheckBox = QtWidgets.QCheckBox(self.uiSceneTab)
+        self.uiNodeItemCacheCheckBox.setObjectName("uiNodeItemCacheCheckBox")
+        self.gridLayout_8.addWidget(self.uiNodeItemCacheCheckBox, 11, 0, 1, 2)
+        self.uiViewportUpdateModeLabel = QtWidgets.QLabel(self.uiSceneTab)
+        self.uiViewportUpdateModeLabel.setObjectName("uiViewportUpdateModeLabel")
+        self.gridLayout_8.addWidget(self.uiViewportUpdateModeLabel, 12, 0, 1, 1)
+        self.uiViewportUpdateModeComboBox = QtWidgets.QComboBox(self.uiSceneTab)
+        self.uiViewportUpdateModeComboBox.setObjectName("uiViewportUpdateModeComboBox")
+        self.gridLayout_8.addWidget(self.uiViewportUpdateModeComboBox, 12, 1, 1, 1)
         spacerItem6 = QtWidgets.QSpacerItem(20, 5, QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Expanding)
-        self.gridLayout_8.addItem(spacerItem6, 10, 0, 1, 1)
+        self.gridLayout_8.addItem(spacerItem6, 13, 0, 1, 1)
         self.label_2 = QtWidgets.QLabel(self.uiSceneTab)
         self.label_2.setObjectName("label_2")
         self.gridLayout_8.addWidget(self.label_2, 4, 0, 1, 1)
@@ -413,6 +426,9 @@ class Ui_GeneralPreferencesPageWidget(object):
         self.uiSceneHeightSpinBox.setSuffix(_translate("GeneralPreferencesPageWidget", " pixels"))
         self.uiSceneWidthSpinBox.setSuffix(_translate("GeneralPreferencesPageWidget", " pixels"))
         self.label_2.setText(_translate("GeneralPreferencesPageWidget", "If you want to change the size of the current project. Via the project menu you can edit it."))
+        self.uiLevelOfDetailCheckBox.setText(_translate("GeneralPreferencesPageWidget", "Simplify the drawing when the view is zoomed out"))
+        self.uiNodeItemCacheCheckBox.setText(_translate("GeneralPreferencesPageWidget", "Cache the node symbols as pixmaps"))
+        self.uiViewportUpdateModeLabel.setText(_translate("GeneralPreferencesPageWidget", "Viewport update mode:"))
         self.uiMiscTabWidget.setTabText(self.uiMiscTabWidget.indexOf(self.uiSceneTab), _translate("GeneralPreferencesPageWidget", "Topology view"))
         self.uiCheckForUpdateCheckBox.setText(_translate("GeneralPreferencesPageWidget", "Automatically check for update"))
         self.uiCrashReportCheckBox.setText(_translate("GeneralPreferencesPageWidget", "Send anonymous crash reports"))
@@ -91,6 +91,10 @@ class Ui_MainWindow(object):
         self.vboxlayout.setContentsMargins(0, 0, 0, 0)
         self.vboxlayout.setSpacing(0)
         self.vboxlayout.setObjectName("vboxlayout")
+        self.uiNodesFilterLineEdit = QtWidgets.QLineEdit(self.uiNodesDockWidgetContents)
+        self.uiNodesFilterLineEdit.setClearButtonEnabled(True)
+        self.uiNodesFilterLineEdit.setObjectName("uiNodesFilterLineEdit")
+        self.vboxlayout.addWidget(self.uiNodesFilterLineEdit)
         self.uiNodesView = NodesView(self.uiNodesDockWidgetContents)
         sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Expanding)
         sizePolicy.setHorizontalStretch(0)
@@ -537,15 +541,14 @@ class Ui_MainWindow(object):
         self.uiToolsMenu.setTitle(_translate("MainWindow", "&Tools"))
         self.uiGeneralToolBar.setWindowTitle(_translate("MainWindow", "General"))
         self.uiNodesDockWidget.setWindowTitle(_translate("MainWindow", "All devices"))
+        self.uiNodesFilterLineEdit.setPlaceholderText(_translate("MainWindow", "Search"))
         self.uiNodesView.setToolTip(_translate("MainWindow", "Drag a node to the workspace (Press SHIFT while dragging to add multiple identical nodes)."))
-        self.uiNodesView.headerItem().setText(0, _translate("MainWindow", "1"))
         self.uiNewAppliancePushButton.setText(_translate("MainWindow", "New appliance template"))
         self.uiBrowsersToolBar.setWindowTitle(_translate("MainWindow", "Devices"))
         self.uiControlToolBar.setWindowTitle(_translate("MainWindow", "Emulation"))
         self.uiConsoleDockWidget.setWindowTitle(_translate("MainWindow", "Console"))
         self.uiAnnotationToolBar.setWindowTitle(_translate("MainWindow", "Drawing"))
         self.uiTopologySummaryDockWidget.setWindowTitle(_translate("MainWindow", "Topology Summary"))
-        self.uiTopologySummaryTreeWidget.headerItem().setText(0, _translate("MainWindow", "1"))
         self.uiComputeSummaryDockWidget.setWindowTitle(_translate("MainWindow", "Servers Summary"))
         self.uiAboutAction.setText(_translate("MainWindow", "&About"))
         self.uiAboutAction.setStatusTip(_translate("MainWindow", "About"))
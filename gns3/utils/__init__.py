@@ -44,7 +44,7 @@ def md5_hash_file(path):
     m = hashlib.md5()
     with open(path, "rb") as f:
         while True:
-            buf = f.read(128)
+            buf = f.read(1024 * 1024)
             if not buf:
                 break
             m.update(buf)
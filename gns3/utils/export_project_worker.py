@@ -15,7 +15,14 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
-from ..qt import QtCore
+import time
+
+from ..qt import QtCore, qpartial
+from . import human_filesize
+from .stream_file_writer import StreamFileWriter
+
+import logging
+log = logging.getLogger(__name__)
 
 
 class ExportProjectWorker(QtCore.QObject):
@@ -27,41 +34,118 @@ class ExportProjectWorker(QtCore.QObject):
     error = QtCore.pyqtSignal(str, bool)
     finished = QtCore.pyqtSignal()
     updated = QtCore.pyqtSignal(int)
+    status = QtCore.pyqtSignal(str)
+
+    # Minimum delay in seconds between two progress updates
+    UPDATE_INTERVAL = 0.5
 
     def __init__(self, project, path, include_images):
         super().__init__()
         self._project = project
         self._include_images = include_images
         self._path = path
+        self._writer = None
+        self._response = None
+        self._started = None
+        self._last_update = 0
+        self._received = 0
+        self._total = 0
 
     def run(self):
         if self._project:
-            self._project.get("/export?include_images={}".format(self._include_images),
-                              self._exportReceived,
-                              downloadProgressCallback=self._downloadFileProgress,
-                              timeout=None)
+            try:
+                self._writer = StreamFileWriter(self._path)
+            except OSError as e:
+                self.error.emit("Can't write project file {}: {}".format(self._path, e), True)
+                self.finished.emit()
+                return
+            self._started = time.monotonic()
+            self._response = self._project.get("/export?include_images={}".format(self._include_images),
+                                               self._exportReceived,
+                                               downloadProgressCallback=self._downloadFileProgress,
+                                               timeout=None)
+            if self._response is not None:
+                self._response.downloadProgress.connect(qpartial(self._downloadProgressSlot))
 
     def _exportReceived(self, content, error=False, server=None, context={}, **kwargs):
+        if self._writer is None:
+            # Cancelled or already failed
+            return
         if error:
+            self._writer.abort()
+            self._writer = None
             if content:
                 self.error.emit(content["message"], True)
             else:
                 self.error.emit("Can't export the project from the server", True)
             self.finished.emit()
             return
+
+        try:
+            self._writer.close()
+        except OSError as e:
+            self._writeError(e)
+            return
+        elapsed = max(time.monotonic() - self._started, 0.001)
+        log.info("Project exported to {} ({}, {}/s, md5 {})".format(self._path,
+                                                                    human_filesize(self._writer.bytesWritten()),
+                                                                    human_filesize(self._writer.bytesWritten() / elapsed),
+                                                                    self._writer.md5sum()))
+        self._writer = None
+        self._response = None
+        self.updated.emit(100)
         self.finished.emit()
 
+    def _downloadProgressSlot(self, received, total):
+        """
+        Called when the size of the export is known
+        """
+        self._total = max(total, 0)
+
     def _downloadFileProgress(self, content, server=None, context={}, **kwargs):
         """
         Called for each part of the file
         """
+        if self._writer is None:
+            return
         try:
-            with open(self._path, 'ab') as f:
-                f.write(content)
+            self._writer.write(content)
         except OSError as e:
-            self.error.emit("Can't write project file {}: {}".format(self._path, e), True)
-            self.finished.emit()
+            self._writeError(e)
             return
+        self._received += len(content)
+
+        now = time.monotonic()
+        if now - self._last_update >= self.UPDATE_INTERVAL:
+            self._last_update = now
+            self._updateProgress(now)
+
+    def _updateProgress(self, now):
+        """
+        Report the throughput and, when the size of the export is known,
+        the percentage and the remaining time.
+        """
+
+        elapsed = max(now - self._started, 0.001)
+        throughput = self._received / elapsed
+        text = "Exporting portable project files... {} ({}/s)".format(human_filesize(self._received), human_filesize(throughput))
+        if self._total and throughput:
+            remaining = int(max(self._total - self._received, 0) / throughput)
+            text += ", {}:{:02d} remaining".format(remaining // 60, remaining % 60)
+            self.updated.emit(min(int(self._received * 100 / self._total), 99))
+        self.status.emit(text)
+
+    def _writeError(self, e):
+        self.cancel()
+        self.error.emit("Can't write project file {}: {}".format(self._path, e), True)
+        self.finished.emit()
 
     def cancel(self):
-        pass
+        if self._writer is not None:
+            self._writer.abort()
+            self._writer = None
+        if self._response is not None:
+            response = self._response
+            self._response = None
+            if response.isRunning():
+                response.abort()
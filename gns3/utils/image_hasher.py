@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2017 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Thread to compute the MD5 checksum of image files without blocking the GUI.
+"""
+
+import os
+import hashlib
+import threading
+import concurrent.futures
+
+from ..qt import QtCore
+
+import logging
+log = logging.getLogger(__name__)
+
+
+BLOCK_SIZE = 1024 * 1024
+
+
+class HashCancelledError(Exception):
+    pass
+
+
+def md5sum_file(path, block_size=BLOCK_SIZE, cancel_event=None, progress_callback=None):
+    """
+    Compute the md5 hash of a file. The file is read in large blocks
+    into a reused buffer, hashlib releases the GIL while hashing them so
+    several files can be hashed in parallel by threads.
+
+    :param path: Path of the file
+    :param block_size: Size of the reads
+    :param cancel_event: threading.Event set to stop the computation
+    :param progress_callback: Called with the number of bytes hashed since the last call
+    :returns: hexadecimal md5
+    """
+
+    m = hashlib.md5()
+    buf = bytearray(block_size)
+    view = memoryview(buf)
+    with open(path, "rb", buffering=0) as f:
+        while True:
+            if cancel_event is not None and cancel_event.is_set():
+                raise HashCancelledError("Checksum of {} cancelled".format(path))
+            read = f.readinto(buf)
+            if not read:
+                break
+            m.update(view[:read])
+            if progress_callback is not None:
+                progress_callback(read)
+    return m.hexdigest()
+
+
+def read_md5sum_file(path):
+    """
+    Read the .md5sum file next to an image, the file is ignored if it is
+    older than the image.
+
+    :returns: hexadecimal md5 or None
+    """
+
+    try:
+        if os.path.getmtime(path + ".md5sum") < os.path.getmtime(path):
+            return None
+        with open(path + ".md5sum", encoding="utf-8") as f:
+            return f.read().strip() or None
+    except (OSError, UnicodeDecodeError):
+        return None
+
+
+def write_md5sum_file(path, md5sum):
+    """
+    Write the .md5sum file next to an image, a read only image directory
+    is not an error.
+    """
+
+    try:
+        with open(path + ".md5sum", "w", encoding="utf-8") as f:
+            f.write(md5sum)
+    except OSError as e:
+        log.debug("Can't write the md5sum of {}: {}".format(path, e))
+
+
+class ImageHasher(QtCore.QObject):
+
+    """
+    Thread to compute the checksum of several image files in parallel.
+
+    :param paths: Paths of the files
+    :param max_workers: Number of files hashed at the same time
+    :param write_md5sum: Write the .md5sum file of each image
+    :param cancel_event: threading.Event shared with the caller to cancel the computation
+    :param progress_callback: Called from the hashing threads with the progress in percent
+    """
+
+    # signals to update the progress dialog.
+    error = QtCore.pyqtSignal(str, bool)
+    finished = QtCore.pyqtSignal()
+    updated = QtCore.pyqtSignal(int)
+    file_hashed_signal = QtCore.pyqtSignal(str, str)
+
+    DEFAULT_MAX_WORKERS = 4
+
+    def __init__(self, paths, max_workers=DEFAULT_MAX_WORKERS, write_md5sum=True, cancel_event=None, progress_callback=None):
+
+        super().__init__()
+        self._paths = list(paths)
+        self._max_workers = max(1, max_workers)
+        self._write_md5sum = write_md5sum
+        if cancel_event is None:
+            cancel_event = threading.Event()
+        self._cancel_event = cancel_event
+        self._progress_callback = progress_callback
+        self._lock = threading.Lock()
+        self._total = 0
+        self._done = 0
+        self._progress = -1
+        self._results = {}
+
+    def results(self):
+        """
+        :returns: Dictionary path => hexadecimal md5, without the files in error
+        """
+
+        return dict(self._results)
+
+    def _progressCallback(self, size):
+
+        with self._lock:
+            self._done += size
+            if self._total:
+                progress = int(self._done * 100 / self._total)
+            else:
+                progress = 100
+            if progress == self._progress:
+                return
+            self._progress = progress
+        if self._progress_callback is not None:
+            self._progress_callback(progress)
+        self.updated.emit(progress)
+
+    def _hash(self, path):
+
+        md5sum = md5sum_file(path, cancel_event=self._cancel_event, progress_callback=self._progressCallback)
+        if self._write_md5sum:
+            write_md5sum_file(path, md5sum)
+        return md5sum
+
+    def run(self):
+        """
+        Worker starting point.
+
+        :returns: Dictionary path => hexadecimal md5
+        """
+
+        self._total = 0
+        for path in self._paths:
+            try:
+                self._total += os.path.getsize(path)
+            except OSError:
+                pass
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+            futures = {executor.submit(self._hash, path): path for path in self._paths}
+            for future in concurrent.futures.as_completed(futures):
+                path = futures[future]
+                try:
+                    md5sum = future.result()
+                except HashCancelledError:
+                    continue
+                except OSError as e:
+                    log.warning("Can't compute the md5sum of {}: {}".format(path, e))
+                    self.error.emit("Can't compute the checksum of {}: {}".format(path, e), False)
+                    continue
+                self._results[path] = md5sum
+                self.file_hashed_signal.emit(path, md5sum)
+
+        if not self._cancel_event.is_set():
+            self.finished.emit()
+        return self.results()
+
+    def cancel(self):
+        """
+        Cancel this worker.
+        """
+
+        if not self:
+            return
+        self._cancel_event.set()
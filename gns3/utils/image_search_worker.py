@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2017 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Thread to search image files in the registry without blocking the GUI.
+"""
+
+import threading
+
+from ..qt import QtCore
+
+import logging
+log = logging.getLogger(__name__)
+
+
+class ImageSearchWorker(QtCore.QObject):
+
+    """
+    Thread to search several images, the files are hashed
+    with progress and can be cancelled.
+
+    :param registry: Registry instance
+    :param emulator: Emulator type
+    :param images: List of image dictionaries with the filename, md5sum and filesize keys
+    """
+
+    # signals to update the progress dialog.
+    error = QtCore.pyqtSignal(str, bool)
+    finished = QtCore.pyqtSignal()
+    updated = QtCore.pyqtSignal(int)
+    status = QtCore.pyqtSignal(str)
+
+    def __init__(self, registry, emulator, images):
+
+        super().__init__()
+        self._registry = registry
+        self._emulator = emulator
+        self._images = list(images)
+        self._cancel_event = threading.Event()
+        self._results = {}
+        self._current = 0
+        self._progress = -1
+
+    def results(self):
+        """
+        :returns: Dictionary image index => Image object or None, without the images not searched
+        """
+
+        return dict(self._results)
+
+    def _progressCallback(self, progress):
+
+        # Progress of the file being hashed inside the progress of the search
+        progress = int((self._current * 100 + progress) / len(self._images))
+        if progress != self._progress:
+            self._progress = progress
+            self.updated.emit(progress)
+
+    def run(self):
+        """
+        Worker starting point.
+        """
+
+        for i, image in enumerate(self._images):
+            if self._cancel_event.is_set():
+                return
+            self._current = i
+            self.status.emit("Searching {}...".format(image["filename"]))
+            self._progressCallback(0)
+            img = self._registry.search_image_file(self._emulator,
+                                                   image["filename"],
+                                                   image.get("md5sum"),
+                                                   image.get("filesize"),
+                                                   cancel_event=self._cancel_event,
+                                                   progress_callback=self._progressCallback)
+            if self._cancel_event.is_set():
+                return
+            self._results[i] = img
+
+        self.updated.emit(100)
+        self.finished.emit()
+
+    def cancel(self):
+        """
+        Cancel this worker.
+        """
+
+        if not self:
+            return
+        self._cancel_event.set()
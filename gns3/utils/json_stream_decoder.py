@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2017 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Incremental decoder for a stream of concatenated JSON objects.
+"""
+
+import re
+import json
+
+import logging
+log = logging.getLogger(__name__)
+
+
+# Everything until a character changing the structure, including complete strings
+SKIP_RE = re.compile(rb'(?:[^"{}\[\]]+|"[^"\\]*(?:\\.[^"\\]*)*")*', re.DOTALL)
+# Characters ending a string or escaping the next character
+STRING_RE = re.compile(rb'["\\]')
+# First character of the next value
+VALUE_RE = re.compile(rb'[^ \t\r\n\0]')
+WHITESPACE_RE = re.compile(r'[ \t\r\n\0]*')
+
+OPEN_CHARS = (ord("{"), ord("["))
+CLOSE_CHARS = (ord("}"), ord("]"))
+QUOTE = ord('"')
+BACKSLASH = ord("\\")
+
+
+class JSONStreamDecoder:
+
+    """
+    Decode the JSON objects of a stream received by chunks.
+
+    The bytes received are appended to a single buffer. The objects
+    complete in the buffer are decoded directly, an object split over
+    several chunks is scanned only once and given to the JSON parser
+    when it's complete. This way an object split over a lot of chunks
+    cost the same as an object received in one chunk.
+
+    :param compact_size: Consumed size of the buffer before we release it
+    """
+
+    def __init__(self, compact_size=65536):
+
+        self._buffer = bytearray()
+        self._compact_size = compact_size
+        # Start of the object in progress
+        self._start = 0
+        # Next byte to scan
+        self._position = 0
+        self._depth = 0
+        self._in_string = False
+        self._decoder = json.JSONDecoder()
+
+    def feed(self, data):
+        """
+        Add data received from the stream.
+
+        :param data: bytes
+        :returns: List of the objects completed by this data
+        """
+
+        buffer = self._buffer
+        buffer.extend(data)
+        objects = []
+
+        while self._position < len(buffer):
+            if self._depth == 0:
+                self._decodeCompleteObjects(objects)
+                match = VALUE_RE.search(buffer, self._position)
+                if match is None:
+                    self._position = len(buffer)
+                    self._start = self._position
+                    break
+                if buffer[match.start()] not in OPEN_CHARS:
+                    log.warning("Skip invalid character %r in JSON stream", chr(buffer[match.start()]))
+                    self._position = match.end()
+                    self._start = self._position
+                    continue
+                self._start = match.start()
+                self._position = match.end()
+                self._depth = 1
+            elif self._in_string:
+                match = STRING_RE.search(buffer, self._position)
+                if match is None:
+                    self._position = len(buffer)
+                    break
+                if buffer[match.start()] == BACKSLASH:
+                    # Skip the escaped character even if it's in the next chunk
+                    self._position = match.end() + 1
+                else:
+                    self._position = match.end()
+                    self._in_string = False
+            else:
+                position = SKIP_RE.match(buffer, self._position).end()
+                if position >= len(buffer):
+                    self._position = len(buffer)
+                    break
+                self._position = position + 1
+                char = buffer[position]
+                if char == QUOTE:
+                    # The string is not complete yet
+                    self._in_string = True
+                elif char in OPEN_CHARS:
+                    self._depth += 1
+                elif char in CLOSE_CHARS:
+                    self._depth -= 1
+                    if self._depth == 0:
+                        self._decode(self._start, self._position, objects)
+                        self._start = self._position
+
+        self._compact()
+        return objects
+
+    def _decodeCompleteObjects(self, objects):
+        """
+        Decode the objects starting at the current position
+        until we found an incomplete or invalid object.
+        """
+
+        data = self._buffer[self._position:]
+        try:
+            text = data.decode("utf-8")
+        except UnicodeDecodeError as e:
+            # The last character could be split with the next chunk
+            try:
+                text = data[:e.start].decode("utf-8")
+            except UnicodeDecodeError:
+                return
+
+        index = 0
+        end = 0
+        while True:
+            index = WHITESPACE_RE.match(text, index).end()
+            if index >= len(text) or text[index] not in "{[":
+                break
+            try:
+                answer, index = self._decoder.raw_decode(text, index)
+            except ValueError:
+                break
+            objects.append(answer)
+            end = index
+
+        if end:
+            self._position += len(text[:end].encode("utf-8"))
+            self._start = self._position
+
+    def _decode(self, start, end, objects):
+
+        try:
+            objects.append(json.loads(self._buffer[start:end].decode("utf-8")))
+        except ValueError as e:
+            log.error("Invalid JSON in stream: {}".format(e))
+
+    def _compact(self):
+        """
+        Release the part of the buffer already decoded
+        """
+
+        if self._start == len(self._buffer) and self._position == self._start:
+            self._buffer.clear()
+            self._start = self._position = 0
+        elif self._start >= self._compact_size:
+            del self._buffer[:self._start]
+            self._position -= self._start
+            self._start = 0
+
+    def pending(self):
+        """
+        :returns: Number of bytes waiting for the end of an object
+        """
+
+        return len(self._buffer) - self._start
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2017 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Measure the duration of the phases of an operation.
+"""
+
+import time
+
+import logging
+log = logging.getLogger(__name__)
+
+
+class PhaseTimer:
+
+    """
+    Record the duration of each phase of an operation,
+    like the start of the local server, and log them.
+
+    :param name: Name of the operation
+    """
+
+    def __init__(self, name):
+
+        self._name = name
+        self._start = self._last = time.monotonic()
+        self._phases = []
+
+    def phase(self, name):
+        """
+        End a phase, the next phase starts now.
+
+        :param name: Name of the phase which ends
+        """
+
+        now = time.monotonic()
+        self._phases.append((name, now - self._last))
+        self._last = now
+
+    def phases(self):
+        """
+        :returns: List of (name, duration in seconds)
+        """
+
+        return list(self._phases)
+
+    def total(self):
+
+        return self._last - self._start
+
+    def __str__(self):
+
+        phases = ", ".join("{} {:.0f} ms".format(name, duration * 1000) for name, duration in self._phases)
+        return "{}: {} (total {:.0f} ms)".format(self._name, phases, self.total() * 1000)
+
+    def log(self, level=logging.INFO):
+
+        log.log(level, str(self))
@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2017 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Read the output of a process so it never blocks on a full pipe.
+"""
+
+import threading
+import collections
+
+from ..qt import QtCore
+
+import logging
+log = logging.getLogger(__name__)
+
+
+class ProcessOutputReader(QtCore.QObject):
+
+    """
+    Read the output of a process from a background thread.
+
+    The last lines are kept in a ring buffer for the crash reports and
+    the debug information. The lines are also forwarded to the log from
+    the GUI thread, with a maximum number of lines per second so a very
+    verbose process can't flood the console.
+
+    :param stream: Binary stream of the process output
+    :param name: Name of the process in the log
+    :param max_lines: Number of lines kept in the ring buffer
+    :param log_rate: Maximum number of lines logged per second, 0 to not log them
+    """
+
+    DEFAULT_MAX_LINES = 1000
+    DEFAULT_LOG_RATE = 20
+
+    # Interval in milliseconds between two forwards to the log
+    LOG_INTERVAL = 500
+    # Seconds of output waiting to be logged, the older lines are not logged
+    MAX_LOG_DELAY = 5
+
+    def __init__(self, stream, name, max_lines=DEFAULT_MAX_LINES, log_rate=DEFAULT_LOG_RATE, parent=None):
+
+        super().__init__(parent)
+        self._stream = stream
+        self._name = name
+        self._log_rate = log_rate
+        self._lock = threading.Lock()
+        self._lines = collections.deque(maxlen=max_lines)
+        # Lines waiting to be logged
+        self._pending = collections.deque(maxlen=max(1, log_rate * self.MAX_LOG_DELAY))
+        self._received = 0
+        self._suppressed = 0
+
+        self._thread = threading.Thread(target=self._readerThread, name="ProcessOutputReader", daemon=True)
+        self._timer = QtCore.QTimer(self)
+        self._timer.setInterval(self.LOG_INTERVAL)
+        self._timer.timeout.connect(self.flushLog)
+
+    def start(self):
+
+        self._thread.start()
+        if self._log_rate > 0:
+            self._timer.start()
+
+    def _readerThread(self):
+
+        try:
+            for line in iter(self._stream.readline, b""):
+                line = line.decode("utf-8", errors="replace").rstrip("\r\n")
+                with self._lock:
+                    self._lines.append(line)
+                    self._received += 1
+                    if self._log_rate > 0:
+                        if len(self._pending) == self._pending.maxlen:
+                            self._suppressed += 1
+                        self._pending.append(line)
+        except (OSError, ValueError) as e:
+            # The stream has been closed
+            log.debug("Stop reading the output of {}: {}".format(self._name, e))
+
+    def join(self, timeout=None):
+        """
+        Wait for the end of the output, after the end of the process.
+        """
+
+        self._thread.join(timeout)
+        self._timer.stop()
+        # The last lines often explain why the process stopped
+        self.flushLog(rate_limit=False)
+
+    def flushLog(self, rate_limit=True):
+        """
+        Log the pending lines allowed by the rate limit.
+        """
+
+        if rate_limit:
+            burst = max(1, self._log_rate * self.LOG_INTERVAL // 1000)
+        else:
+            burst = len(self._pending)
+        with self._lock:
+            lines = [self._pending.popleft() for _ in range(min(burst, len(self._pending)))]
+            suppressed = self._suppressed
+            self._suppressed = 0
+        for line in lines:
+            log.info("{}: {}".format(self._name, line))
+        if suppressed:
+            log.info("{}: {} lines not logged, export the debug information to get them".format(self._name, suppressed))
+
+    def lines(self):
+        """
+        :returns: The last lines of the output
+        """
+
+        with self._lock:
+            return list(self._lines)
+
+    def text(self):
+
+        return "\n".join(self.lines())
+
+    def received(self):
+        """
+        :returns: Number of lines read since the start
+        """
+
+        with self._lock:
+            return self._received
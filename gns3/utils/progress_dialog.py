@@ -70,6 +70,8 @@ class ProgressDialog(QtWidgets.QProgressDialog):
         self._worker.finished.connect(self.accept)
         self._worker.updated.connect(self._updateProgressSlot)
         self._worker.error.connect(self._error)
+        if hasattr(self._worker, "status"):
+            self._worker.status.connect(self._statusSlot)
         if self._thread:
             self._thread.started.connect(self._worker.run)
 
@@ -113,6 +115,8 @@ class ProgressDialog(QtWidgets.QProgressDialog):
         if self._thread:
             self._worker.cancel()
             log.debug("{} thread canceled".format(self._worker.objectName()))
+        elif self._worker:
+            self._worker.cancel()
         self._cleanup()
 
     @qslot
@@ -156,10 +160,21 @@ class ProgressDialog(QtWidgets.QProgressDialog):
         :param value: value for the progress bar (integer)
         """
 
-        if self._thread:
+        if self._worker:
             # It seems in some cases this is called on a deleted object and crash
             self.setValue(value)
 
+    @qslot
+    def _statusSlot(self, text):
+        """
+        Slot to update the label with the status sent by the worker.
+
+        :param text: status text
+        """
+
+        if self._worker:
+            self.setLabelText(text)
+
     @qslot
     def _error(self, message, stop=False):
         """
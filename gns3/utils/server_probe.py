@@ -0,0 +1,260 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2017 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Check if a GNS3 server answers without blocking the GUI.
+"""
+
+import os
+import json
+import time
+import base64
+import ipaddress
+
+from ..qt import QtCore, QtNetwork, qpartial, sip_is_deleted
+
+import logging
+log = logging.getLogger(__name__)
+
+
+class ServerProbe(QtCore.QObject):
+
+    """
+    Query /version on a server until it answers, with an exponential
+    backoff between the attempts.
+
+    It can be used as a worker of a ProgressDialog without a thread.
+    When the process of the server is given, the probe fails as soon as
+    the process exits. When the PID file of the server is given, the
+    delay between the attempts is reset when the file appears because
+    the server is then about to listen.
+
+    :param protocol: http or https
+    :param host: Server host
+    :param port: Server port
+    :param user: User for the authentication
+    :param password: Password for the authentication
+    :param timeout: Delay in seconds before giving up
+    :param max_attempts: Maximum number of attempts, None for no limit
+    :param process: subprocess.Popen instance of the server
+    :param pid_path: Path of the PID file written by the server
+    :param network_manager: QNetworkAccessManager to use
+    """
+
+    # signals to update the progress dialog.
+    error = QtCore.pyqtSignal(str, bool)
+    finished = QtCore.pyqtSignal()
+    updated = QtCore.pyqtSignal(int)
+    status = QtCore.pyqtSignal(str)
+
+    # Delays between the attempts in seconds
+    MIN_DELAY = 0.025
+    MAX_DELAY = 1.0
+
+    # Maximum duration of an attempt in seconds
+    REQUEST_TIMEOUT = 2
+
+    def __init__(self, protocol, host, port, user=None, password=None, timeout=30, max_attempts=None, process=None, pid_path=None, network_manager=None):
+
+        super().__init__()
+        self._protocol = protocol
+        self._host = host
+        self._port = port
+        self._user = user
+        self._password = password
+        self._timeout = timeout
+        self._max_attempts = max_attempts
+        self._process = process
+        self._pid_path = pid_path
+        self._network_manager = network_manager
+
+        self._running = False
+        self._done = False
+        self._attempts = 0
+        self._delay = self.MIN_DELAY
+        self._pid_file_found = False
+        self._deadline = None
+        self._reply = None
+        self._status_code = 0
+        self._json_data = None
+        self._last_error = None
+
+        self._retry_timer = QtCore.QTimer(self)
+        self._retry_timer.setSingleShot(True)
+        self._retry_timer.timeout.connect(self._attempt)
+
+        self._request_timer = QtCore.QTimer(self)
+        self._request_timer.setSingleShot(True)
+        self._request_timer.timeout.connect(self._requestTimeoutSlot)
+
+    def _url(self):
+
+        host = self._host
+        try:
+            ipaddress.IPv6Address(host)
+            host = "[{}]".format(host)
+        except ipaddress.AddressValueError:
+            pass
+        return QtCore.QUrl("{}://{}:{}/v2/version".format(self._protocol, host, self._port))
+
+    def run(self):
+        """
+        Worker starting point, the probe continues in the event loop.
+        """
+
+        self._running = True
+        self._done = False
+        self._attempts = 0
+        self._delay = self.MIN_DELAY
+        self._deadline = time.monotonic() + self._timeout
+        if self._network_manager is None:
+            self._network_manager = QtNetwork.QNetworkAccessManager(self)
+        self._attempt()
+
+    def cancel(self):
+        """
+        Cancel this worker.
+        """
+
+        if not self:
+            return
+        self._running = False
+        self._retry_timer.stop()
+        self._request_timer.stop()
+        reply = self._reply
+        self._reply = None
+        if reply is not None and not sip_is_deleted(reply):
+            reply.abort()
+
+    def done(self):
+        """
+        :returns: True when the probe has a result
+        """
+
+        return self._done
+
+    def attempts(self):
+
+        return self._attempts
+
+    def result(self):
+        """
+        :returns: Tuple (Status code, json of the answer), status 0 is a non HTTP error
+        """
+
+        return self._status_code, self._json_data
+
+    def isGNS3Server(self):
+        """
+        :returns: True if the answer comes from a GNS3 server
+        """
+
+        if self._status_code == 401:
+            # Auth issue that need to be solved later
+            return True
+        if self._status_code != 200 or not isinstance(self._json_data, dict):
+            return False
+        if self._json_data.get("version") is None:
+            log.debug("Server is not a GNS3 server")
+            return False
+        return True
+
+    def _attempt(self):
+
+        if not self._running:
+            return
+        if self._process is not None and self._process.poll() is not None:
+            self._finish("The local server process has stopped (exit code {})".format(self._process.returncode))
+            return
+
+        self._attempts += 1
+        self.status.emit("Connecting to server {} on port {} (attempt {})...".format(self._host, self._port, self._attempts))
+        request = QtNetwork.QNetworkRequest(self._url())
+        if self._user:
+            auth_string = base64.b64encode("{}:{}".format(self._user, self._password).encode("utf-8"))
+            request.setRawHeader(b"Authorization", b"Basic " + auth_string)
+        if self._protocol == "https":
+            ssl_config = QtNetwork.QSslConfiguration.defaultConfiguration()
+            ssl_config.setPeerVerifyMode(QtNetwork.QSslSocket.VerifyNone)
+            request.setSslConfiguration(ssl_config)
+
+        self._reply = self._network_manager.get(request)
+        self._reply.finished.connect(qpartial(self._replyFinishedSlot, self._reply))
+        self._request_timer.start(self.REQUEST_TIMEOUT * 1000)
+
+    def _requestTimeoutSlot(self):
+
+        if self._reply is not None and not sip_is_deleted(self._reply):
+            self._reply.abort()
+
+    def _replyFinishedSlot(self, reply):
+
+        if reply is not self._reply:
+            return
+        self._reply = None
+        self._request_timer.stop()
+        reply.deleteLater()
+        if not self._running:
+            return
+
+        status = reply.attribute(QtNetwork.QNetworkRequest.HttpStatusCodeAttribute)
+        if status is None:
+            self._status_code = 0
+            self._json_data = None
+            self._last_error = reply.errorString()
+        else:
+            self._status_code = status
+            self._json_data = None
+            self._last_error = "HTTP status {}".format(status)
+            if status == 200 and reply.header(QtNetwork.QNetworkRequest.ContentTypeHeader) == "application/json":
+                try:
+                    self._json_data = json.loads(bytes(reply.readAll()).decode("utf-8"))
+                except (UnicodeDecodeError, ValueError):
+                    self._json_data = None
+
+        if self.isGNS3Server():
+            self._finish()
+            return
+        if self._max_attempts is not None and self._attempts >= self._max_attempts:
+            self._finish(self._last_error)
+            return
+        self._scheduleAttempt()
+
+    def _scheduleAttempt(self):
+
+        if self._pid_path and not self._pid_file_found and os.path.exists(self._pid_path):
+            # The server is starting, try again quickly
+            self._pid_file_found = True
+            self._delay = self.MIN_DELAY
+
+        remaining = self._deadline - time.monotonic()
+        if remaining <= 0:
+            self._finish(self._last_error)
+            return
+        delay = min(self._delay, remaining)
+        self._delay = min(self._delay * 2, self.MAX_DELAY)
+        self._retry_timer.start(int(delay * 1000))
+
+    def _finish(self, error=None):
+
+        self._running = False
+        self._done = True
+        if error is None:
+            log.debug("Server {}:{} answered after {} attempts".format(self._host, self._port, self._attempts))
+            self.finished.emit()
+        else:
+            self.error.emit("Could not connect to {} on port {}: {}".format(self._host, self._port, error), True)
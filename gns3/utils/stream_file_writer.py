@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2017 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Write a stream of data received from the network to a file.
+"""
+
+import os
+import queue
+import hashlib
+import threading
+
+import logging
+log = logging.getLogger(__name__)
+
+
+class StreamFileWriter:
+
+    """
+    Write the chunks of a download to a file from a background thread.
+
+    The file is opened once and truncated. Small chunks are merged in
+    blocks before being handed to the writer thread, the number of blocks
+    waiting to be written is bounded so a slow disk slows down the caller
+    instead of filling the memory. The md5 of the data is computed while
+    writing.
+
+    :param path: Path of the file
+    :param block_size: Size of the blocks given to the writer thread
+    :param max_blocks: Maximum number of blocks waiting to be written
+    """
+
+    DEFAULT_BLOCK_SIZE = 1024 * 1024
+    DEFAULT_MAX_BLOCKS = 16
+
+    def __init__(self, path, block_size=DEFAULT_BLOCK_SIZE, max_blocks=DEFAULT_MAX_BLOCKS):
+
+        self._path = path
+        self._block_size = block_size
+        self._buffer = bytearray()
+        self._queue = queue.Queue(maxsize=max_blocks)
+        self._md5 = hashlib.md5()
+        self._bytes_written = 0
+        self._error = None
+        self._closed = False
+
+        # Raise OSError if the file can't be created
+        self._file = open(path, "wb")
+        self._thread = threading.Thread(target=self._writerThread, name="StreamFileWriter", daemon=True)
+        self._thread.start()
+
+    def path(self):
+
+        return self._path
+
+    def _writerThread(self):
+
+        while True:
+            block = self._queue.get()
+            if block is None:
+                break
+            if self._error is not None:
+                # Drain the queue to unblock the producer
+                continue
+            try:
+                self._file.write(block)
+                self._md5.update(block)
+                self._bytes_written += len(block)
+            except OSError as e:
+                self._error = e
+        try:
+            self._file.close()
+        except OSError as e:
+            if self._error is None:
+                self._error = e
+
+    def _raiseError(self):
+
+        if self._error is not None:
+            raise OSError("Can't write {}: {}".format(self._path, self._error))
+
+    def write(self, data):
+        """
+        Queue data to write.
+
+        :param data: bytes
+        :raises OSError: if a previous write failed
+        """
+
+        self._raiseError()
+        if self._closed:
+            raise ValueError("Write to a closed StreamFileWriter")
+        self._buffer.extend(data)
+        if len(self._buffer) >= self._block_size:
+            self._queue.put(bytes(self._buffer))
+            self._buffer.clear()
+
+    def close(self):
+        """
+        Write the remaining data and wait for the writer thread.
+
+        :raises OSError: if a write failed
+        """
+
+        if not self._closed:
+            self._closed = True
+            if self._buffer:
+                self._queue.put(bytes(self._buffer))
+                self._buffer.clear()
+            self._queue.put(None)
+            self._thread.join()
+        self._raiseError()
+
+    def abort(self):
+        """
+        Stop writing and delete the file.
+        """
+
+        if not self._closed:
+            self._closed = True
+            self._buffer.clear()
+            self._error = self._error or OSError("aborted")
+            self._queue.put(None)
+            self._thread.join()
+        try:
+            os.remove(self._path)
+        except OSError as e:
+            log.debug("Can't remove {}: {}".format(self._path, e))
+
+    def bytesWritten(self):
+        """
+        :returns: Number of bytes on disk
+        """
+
+        return self._bytes_written
+
+    def md5sum(self):
+        """
+        :returns: hexadecimal md5 of the data written, once the writer is closed
+        """
+
+        return self._md5.hexdigest()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+#
+# Copyright (C) 2017 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Micro benchmark of the checksum of QEMU images. The images are
+created in a temporary directory (or the given directory) and hashed
+with the previous code (one file at a time, 4 KB reads) and with the
+ImageHasher. Drop the page cache between runs to measure cold reads.
+"""
+
+import os
+import sys
+import time
+import hashlib
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from gns3.qt import QtCore  # noqa
+from gns3.utils.image_hasher import ImageHasher
+
+
+def create_images(directory, count, size):
+
+    paths = []
+    block = os.urandom(1024 * 1024)
+    for i in range(count):
+        path = os.path.join(directory, "qemu-image-{}.qcow2".format(i))
+        if not os.path.exists(path) or os.path.getsize(path) != size:
+            with open(path, "wb") as f:
+                written = 0
+                while written < size:
+                    f.write(block[:size - written])
+                    written += len(block)
+        paths.append(path)
+    return paths
+
+
+def previous_hashing(paths):
+    """
+    Hashing used by Image.md5sum before ImageHasher
+    """
+
+    results = {}
+    for path in paths:
+        m = hashlib.md5()
+        with open(path, "rb") as f:
+            while True:
+                buf = f.read(4096)
+                if not buf:
+                    break
+                m.update(buf)
+        results[path] = m.hexdigest()
+    return results
+
+
+def run(name, hashing, paths, size):
+
+    start = time.perf_counter()
+    results = hashing(paths)
+    elapsed = time.perf_counter() - start
+    assert len(results) == len(paths)
+    print("{:<25} {:>10.3f} s {:>10.1f} MB/s".format(name, elapsed, len(paths) * size / elapsed / 1024 / 1024))
+    return results
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--directory", help="directory of the images, a temporary directory by default")
+    parser.add_argument("--images", type=int, default=4, help="number of images")
+    parser.add_argument("--size", type=int, default=1024, help="size of each image in MB")
+    parser.add_argument("--workers", type=int, default=ImageHasher.DEFAULT_MAX_WORKERS, help="number of files hashed at the same time")
+    args = parser.parse_args()
+
+    size = args.size * 1024 * 1024
+    with tempfile.TemporaryDirectory() as tmpdir:
+        paths = create_images(args.directory or tmpdir, args.images, size)
+        print("{} images of {} MB".format(args.images, args.size))
+
+        previous = run("previous hashing", previous_hashing, paths, size)
+        new = run("ImageHasher ({} workers)".format(args.workers), lambda p: ImageHasher(p, max_workers=args.workers, write_md5sum=False).run(), paths, size)
+        assert previous == new
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+#
+# Copyright (C) 2017 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Micro benchmark of the notification feed decoding. The feed is
+split in chunks of random sizes like the reads of a TCP stream.
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from gns3.utils.json_stream_decoder import JSONStreamDecoder
+
+
+def build_feed(events, event_size):
+    """
+    :returns: The feed as bytes and the number of events
+    """
+
+    feed = []
+    for i in range(events):
+        event = {
+            "action": "node.updated",
+            "event": {
+                "node_id": "node-{}".format(i),
+                "name": "R{}".format(i),
+                "properties": {"startup_config_content": "x" * event_size}
+            }
+        }
+        feed.append(json.dumps(event))
+    return "\n".join(feed).encode("utf-8")
+
+
+def split_feed(feed, max_chunk):
+
+    chunks = []
+    position = 0
+    while position < len(feed):
+        size = random.randint(1, max_chunk)
+        chunks.append(feed[position:position + size])
+        position += size
+    return chunks
+
+
+def previous_decoder(chunks):
+    """
+    Decoding used by HTTPClient._readyReadySlot before JSONStreamDecoder
+    """
+
+    count = 0
+    buffer = ""
+    for chunk in chunks:
+        content = buffer + chunk.decode("utf-8", errors="ignore")
+        try:
+            while True:
+                content = content.lstrip(" \r\n\t")
+                answer, index = json.JSONDecoder().raw_decode(content)
+                count += 1
+                content = content[index:]
+        except ValueError:
+            buffer = content
+    return count
+
+
+def stream_decoder(chunks):
+
+    count = 0
+    decoder = JSONStreamDecoder()
+    for chunk in chunks:
+        count += len(decoder.feed(chunk))
+    return count
+
+
+def run(name, decoder, chunks, events):
+
+    start = time.perf_counter()
+    count = decoder(chunks)
+    elapsed = time.perf_counter() - start
+    assert count == events, "{} decoded {} events instead of {}".format(name, count, events)
+    print("{:<20} {:>10.3f} ms".format(name, elapsed * 1000))
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=2000, help="number of events in the feed")
+    parser.add_argument("--event-size", type=int, default=2000, help="size of the payload of each event")
+    parser.add_argument("--max-chunk", type=int, default=1460, help="maximum size of a chunk")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    feed = build_feed(args.events, args.event_size)
+    chunks = split_feed(feed, args.max_chunk)
+    print("{} events, {} bytes in {} chunks".format(args.events, len(feed), len(chunks)))
+
+    run("previous decoder", previous_decoder, chunks, args.events)
+    run("JSONStreamDecoder", stream_decoder, chunks, args.events)
+
+
+if __name__ == '__main__':
+    main()
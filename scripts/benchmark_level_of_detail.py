@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+#
+# Copyright (C) 2017 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Micro benchmark of the topology drawing. A grid of routers connected
+to their neighbors is painted at several zoom levels with and without
+the level of detail.
+"""
+
+import os
+import sys
+import time
+import argparse
+from unittest.mock import MagicMock, patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from gns3.qt import QtCore, QtGui, QtWidgets
+
+app = QtWidgets.QApplication(sys.argv)
+
+from gns3.ui import resources_rc  # noqa
+from gns3.settings import GRAPHICS_VIEW_SETTINGS
+from gns3.ports.port import Port
+from gns3.qt.level_of_detail import LevelOfDetail
+from gns3.symbol_renderer_pool import SymbolRendererPool
+
+
+def fake_node(node_id, x, y):
+
+    node = MagicMock()
+    node.id.return_value = node_id
+    node.x.return_value = x
+    node.y.return_value = y
+    node.z.return_value = 1
+    node.initialized.return_value = False
+    return node
+
+
+def fake_port(name):
+
+    port = MagicMock()
+    port.status.return_value = Port.started
+    port.shortName.return_value = name
+    port.label.return_value = None
+    port.setLabel.side_effect = lambda label: setattr(port.label, "return_value", label)
+    return port
+
+
+def build_scene(size):
+
+    from gns3.items.node_item import NodeItem
+    from gns3.items.ethernet_link_item import EthernetLinkItem
+
+    scene = QtWidgets.QGraphicsScene()
+    items = {}
+    for row in range(size):
+        for column in range(size):
+            node_item = NodeItem(fake_node(row * size + column, column * 150, row * 150))
+            node_item.setSharedRenderer(SymbolRendererPool.instance().acquire(":/symbols/router.svg"))
+            node_item._initialized = True
+            scene.addItem(node_item)
+            items[(row, column)] = node_item
+
+    for (row, column), node_item in items.items():
+        for neighbor in ((row, column + 1), (row + 1, column)):
+            if neighbor in items:
+                link = MagicMock()
+                link_item = EthernetLinkItem(node_item, fake_port("e0"), items[neighbor], fake_port("e1"), link=link)
+                scene.addItem(link_item)
+    return scene
+
+
+def paint(scene, zoom, frames):
+    """
+    :returns: Average time to paint a frame in milliseconds
+    """
+
+    image = QtGui.QImage(1280, 800, QtGui.QImage.Format_ARGB32_Premultiplied)
+    source = QtCore.QRectF(scene.itemsBoundingRect().topLeft(), QtCore.QSizeF(1280 / zoom, 800 / zoom))
+    start = time.perf_counter()
+    for _ in range(frames):
+        image.fill(QtCore.Qt.white)
+        painter = QtGui.QPainter(image)
+        painter.setRenderHint(QtGui.QPainter.Antialiasing)
+        scene.render(painter, QtCore.QRectF(image.rect()), source)
+        painter.end()
+    return (time.perf_counter() - start) * 1000 / frames
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=20, help="the grid has size x size routers")
+    parser.add_argument("--frames", type=int, default=10, help="number of frames painted for each measure")
+    args = parser.parse_args()
+
+    settings = dict(GRAPHICS_VIEW_SETTINGS)
+    with patch("gns3.main_window.MainWindow.instance") as main_window:
+        main_window.return_value.uiGraphicsView.settings.return_value = settings
+        main_window.return_value.uiSnapToGridAction.isChecked.return_value = False
+        scene = build_scene(args.size)
+        print("{} nodes and {} items".format(args.size * args.size, len(scene.items())))
+
+        for zoom in (1.0, 0.4, 0.2, 0.1):
+            LevelOfDetail.setEnabled(False)
+            full = paint(scene, zoom, args.frames)
+            LevelOfDetail.setEnabled(True)
+            simplified = paint(scene, zoom, args.frames)
+            print("zoom {:<4} full {:>9.2f} ms   level of detail {:>9.2f} ms".format(zoom, full, simplified))
+
+
+if __name__ == '__main__':
+    main()
@@ -37,8 +37,16 @@ def reset_modules():
     from gns3.modules.virtualbox.virtualbox_vm import VirtualBoxVM
     from gns3.modules.iou.iou_device import IOUDevice
     from gns3.compute_manager import ComputeManager
+    from gns3.registry.image_index import ImageIndex
+    from gns3.image_upload_manager import ImageUploadManager
+    from gns3.http_stats import HTTPStats
+    from gns3.symbol_thumbnails import SymbolThumbnails
 
     ComputeManager.reset()
+    ImageIndex._instance = ImageIndex()
+    ImageUploadManager._instance = None
+    HTTPStats._instance = None
+    SymbolThumbnails._instance = None
     VPCSNode.reset()
     VirtualBoxVM.reset()
     IOUDevice.reset()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+#
+# Copyright (C) 2017 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+from gns3.qt import QtWidgets
+from gns3.items.link_item import LinkItem
+from gns3.items.node_item import NodeItem
+
+
+class FakeNodeItem(QtWidgets.QGraphicsRectItem):
+    """
+    Node item without symbol, the link management come from NodeItem
+    """
+
+    addLink = NodeItem.addLink
+    _removeLink = NodeItem._removeLink
+    _linkUpdatedSlot = NodeItem._linkUpdatedSlot
+    _otherNodeId = NodeItem._otherNodeId
+    _removeParallelLink = NodeItem._removeParallelLink
+    parallelLinks = NodeItem.parallelLinks
+    links = NodeItem.links
+
+    def __init__(self, node_id):
+        super().__init__(0, 0, 10, 10)
+        self._links = []
+        self._parallel_links = {}
+        self._node = MagicMock()
+        self._node.id.return_value = node_id
+
+    def node(self):
+        return self._node
+
+
+@pytest.fixture(autouse=True)
+def main_window():
+    with patch("gns3.main_window.MainWindow.instance") as mock:
+        yield mock
+
+
+def create_link(source_item, destination_item, link_id):
+    link = MagicMock()
+    link.id.return_value = link_id
+    return LinkItem(source_item, MagicMock(), destination_item, MagicMock(), link=link)
+
+
+def test_multilink_offset():
+    r1 = FakeNodeItem(1)
+    r2 = FakeNodeItem(2)
+    r3 = FakeNodeItem(3)
+    link1 = create_link(r1, r2, "l1")
+    create_link(r1, r3, "l2")
+    link3 = create_link(r2, r1, "l3")
+    link4 = create_link(r1, r2, "l4")
+
+    assert link1._computeMultiLink() == 0
+    assert link3._computeMultiLink() == -1
+    assert link4._computeMultiLink() == 1
+    assert r1.parallelLinks(2) == [link1, link3, link4]
+    assert r2.parallelLinks(1) == [link1, link3, link4]
+
+    # The next links take the place of the deleted link
+    r1._removeLink("l1")
+    r2._removeLink("l1")
+    assert link3._computeMultiLink() == 0
+    assert link4._computeMultiLink() == -1
+
+
+def test_deferred_adjust():
+    r1 = FakeNodeItem(1)
+    r2 = FakeNodeItem(2)
+    link = create_link(r1, r2, "l1")
+    with patch("gns3.items.link_item.LinkItem.adjust") as adjust:
+        LinkItem.beginDeferredAdjust()
+        link.scheduleAdjust()
+        link.scheduleAdjust()
+        assert not adjust.called
+        LinkItem.endDeferredAdjust()
+        assert adjust.call_count == 1
+
+        link.scheduleAdjust()
+        assert adjust.call_count == 2
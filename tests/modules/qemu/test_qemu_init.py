@@ -0,0 +1,47 @@
+#!/usr/bin/env python
+#
+# Copyright (C) 2017 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from unittest.mock import patch
+
+from gns3.modules.qemu import Qemu
+
+
+def test_loadQemuVMs(local_config):
+
+    local_config.saveSectionSettings("Qemu", {"vms": [{"name": "IOSv", "server": "local"}, {"name": "", "server": "local"}]})
+    qemu = Qemu()
+    assert list(qemu.VMs().keys()) == ["local:IOSv"]
+    assert qemu.VMs()["local:IOSv"]["symbol"] == ":/symbols/qemu_guest.svg"
+
+    # The VMs of the module are not the settings
+    qemu.VMs()["local:IOSv"]["name"] = "IOSvL2"
+    assert local_config._settings["Qemu"]["vms"][0]["name"] == "IOSv"
+
+
+def test_configChangedOnlyReloadChangedSection(local_config):
+
+    qemu = Qemu()
+    qemu._configChangedSlot()
+    with patch("gns3.modules.qemu.Qemu._loadSettings") as mock:
+        # Another section has changed
+        local_config.saveSectionSettings("VPCS", {"vpcs_path": "/bin/vpcs"})
+        qemu._configChangedSlot()
+        assert not mock.called
+
+        local_config.saveSectionSettings("Qemu", {"vms": [{"name": "IOSv", "server": "local"}]})
+        qemu._configChangedSlot()
+        assert mock.called
@@ -0,0 +1,52 @@
+#!/usr/bin/env python
+#
+# Copyright (C) 2017 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import pytest
+
+from gns3.qt import QtCore, QtGui
+from gns3.qt.qimage_svg_renderer import QImageSvgRenderer
+from gns3.qt.level_of_detail import LevelOfDetail
+
+
+@pytest.fixture
+def painter():
+    image = QtGui.QImage(100, 100, QtGui.QImage.Format_ARGB32_Premultiplied)
+    painter = QtGui.QPainter(image)
+    yield painter
+    painter.end()
+    LevelOfDetail.setEnabled(True)
+
+
+def test_isLow(painter):
+    assert not LevelOfDetail.isLow(painter)
+    painter.scale(0.2, 0.2)
+    assert LevelOfDetail.isLow(painter)
+
+
+def test_isLow_disabled(painter):
+    LevelOfDetail.setEnabled(False)
+    painter.scale(0.2, 0.2)
+    assert not LevelOfDetail.isLow(painter)
+
+
+def test_symbolPixmap():
+    renderer = QImageSvgRenderer('resources/symbols/router.svg')
+    renderer.setObjectName('router')
+    pixmap = LevelOfDetail.symbolPixmap(renderer, QtCore.QRectF(0, 0, 64, 46))
+    assert pixmap.width() == 32
+    assert pixmap.height() == 23
+    assert LevelOfDetail.symbolPixmap(renderer, QtCore.QRectF(0, 0, 64, 46)).cacheKey() == pixmap.cacheKey()
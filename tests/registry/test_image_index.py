@@ -0,0 +1,143 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2017 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import threading
+import pytest
+from unittest.mock import patch
+
+from gns3.registry.image_index import ImageIndex
+from gns3.utils.image_hasher import md5sum_file
+
+
+@pytest.fixture
+def qemu_dir(tmpdir):
+    path = str(tmpdir / "QEMU")
+    os.makedirs(path)
+    with open(os.path.join(path, "a"), "w+") as f:
+        f.write("ALPHA")
+    with open(os.path.join(path, "b"), "w+") as f:
+        f.write("BETA")
+    return path
+
+
+def test_search(qemu_dir):
+    index = ImageIndex()
+    assert index.search([qemu_dir], "b", "36b84f8e3fba5bf993e3ba352d62d146", 5) == os.path.join(qemu_dir, "b")
+    assert index.search([qemu_dir], "a", None, None) == os.path.join(qemu_dir, "a")
+    assert index.search([qemu_dir], "b", "36b84f8e3fba5bf993e3ba352d62d146", 1000) is None
+    assert index.search([qemu_dir], "x", None, None) is None
+
+
+def test_search_hash_only_once(qemu_dir):
+    index = ImageIndex()
+    with patch("gns3.utils.image_hasher.md5sum_file", wraps=md5sum_file) as compute:
+        index.search([qemu_dir], "b", "36b84f8e3fba5bf993e3ba352d62d146", 5)
+        count = compute.call_count
+        assert index.search([qemu_dir], "b", "36b84f8e3fba5bf993e3ba352d62d146", 5) == os.path.join(qemu_dir, "b")
+        assert compute.call_count == count
+
+
+def test_persistence(qemu_dir, tmpdir):
+    path = str(tmpdir / "index.json")
+    index = ImageIndex(path)
+    index.search([qemu_dir], "b", "36b84f8e3fba5bf993e3ba352d62d146", 5)
+    index.save()
+    os.remove(os.path.join(qemu_dir, "b.md5sum"))
+
+    index = ImageIndex(path)
+    with patch("gns3.utils.image_hasher.md5sum_file") as compute:
+        assert index.search([qemu_dir], "b", "36b84f8e3fba5bf993e3ba352d62d146", 5) == os.path.join(qemu_dir, "b")
+        assert not compute.called
+
+
+def test_file_changed(qemu_dir):
+    index = ImageIndex()
+    path = os.path.join(qemu_dir, "b")
+    assert index.md5sum(path) == "36b84f8e3fba5bf993e3ba352d62d146"
+
+    with open(path, "w+") as f:
+        f.write("BETA2")
+    # The .md5sum file written by the index is now outdated
+    mtime = os.path.getmtime(path + ".md5sum") + 10
+    os.utime(path, (mtime, mtime))
+    assert index.md5sum(path) == "d5183103bab089a47f38e8e163347dc9"
+    assert index.search([qemu_dir], "b", "36b84f8e3fba5bf993e3ba352d62d146", 5) is None
+
+
+def test_file_removed(qemu_dir):
+    index = ImageIndex()
+    path = os.path.join(qemu_dir, "a")
+    assert index.search([qemu_dir], "a", None, None) == path
+    os.remove(path)
+    assert index.search([qemu_dir], "a", None, None) is None
+    assert index.md5sum(path) is None
+
+
+def test_md5sum_sidecar(qemu_dir):
+    with open(os.path.join(qemu_dir, "a.md5sum"), "w+") as f:
+        f.write("42b84f8e3fba5bf993e3ba352d62d146")
+    index = ImageIndex()
+    assert index.search([qemu_dir], "a", "42b84f8e3fba5bf993e3ba352d62d146", 5) == os.path.join(qemu_dir, "a")
+
+
+def test_search_directory_priority(tmpdir):
+    directories = []
+    for name in ("z_first", "a_second"):
+        path = str(tmpdir / name)
+        os.makedirs(path)
+        with open(os.path.join(path, "image"), "w+") as f:
+            f.write(name)
+        directories.append(path)
+
+    index = ImageIndex()
+    assert index.search(directories, "image", None, None) == os.path.join(directories[0], "image")
+    assert index.search(list(reversed(directories)), "image", None, None) == os.path.join(directories[1], "image")
+
+
+def test_search_stop_at_first_match(tmpdir):
+    directories = []
+    for name in ("first", "second"):
+        path = str(tmpdir / name)
+        os.makedirs(path)
+        with open(os.path.join(path, "image"), "w+") as f:
+            f.write("BETA")
+        directories.append(path)
+
+    index = ImageIndex()
+    with patch("gns3.utils.image_hasher.md5sum_file", wraps=md5sum_file) as compute:
+        assert index.search(directories, "x", "36b84f8e3fba5bf993e3ba352d62d146", 5) == os.path.join(directories[0], "image")
+        assert compute.call_count == 1
+
+
+def test_search_cancelled(qemu_dir):
+    cancel_event = threading.Event()
+    cancel_event.set()
+    index = ImageIndex()
+    assert index.search([qemu_dir], "b", "36b84f8e3fba5bf993e3ba352d62d146", 5, cancel_event=cancel_event) is None
+    assert not os.path.exists(os.path.join(qemu_dir, "b.md5sum"))
+
+
+def test_cached_md5sum(qemu_dir):
+    index = ImageIndex()
+    path = os.path.join(qemu_dir, "b")
+    with patch("gns3.utils.image_hasher.md5sum_file") as compute:
+        assert index.cachedMd5sum(path) is None
+        assert not compute.called
+    index.md5sum(path)
+    assert index.cachedMd5sum(path) == "36b84f8e3fba5bf993e3ba352d62d146"
@@ -15,10 +15,12 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+import os
 import pytest
 from unittest.mock import MagicMock
 
 from gns3.controller import Controller
+from gns3.static_cache import StaticCache
 
 
 @pytest.fixture
@@ -49,3 +51,56 @@ def test_connected(controller):
     controller._httpClientConnectedSlot()
     assert controller.connected() is True
     assert callback.called
+
+
+def test_getStatic(controller, tmpdir):
+    controller._static_cache = StaticCache(str(tmpdir))
+    callback = MagicMock()
+    controller.getStatic("/symbols/router.svg/raw", callback)
+    controller.getStatic("/symbols/router.svg/raw", callback)
+    assert controller._http_client.createHTTPQuery.call_count == 1
+    args, kwargs = controller._http_client.createHTTPQuery.call_args
+    assert kwargs["headers"] == {}
+
+    # Simulate the answer of the controller
+    args[2]({}, raw_body=b"<svg></svg>", headers={"etag": "abc"})
+    assert callback.call_count == 2
+    path = callback.call_args[0][0]
+    with open(path, "rb") as f:
+        assert f.read() == b"<svg></svg>"
+
+    controller.getStatic("/symbols/router.svg/raw", callback)
+    assert controller._http_client.createHTTPQuery.call_count == 1
+    assert callback.call_args[0][0] == path
+
+
+def test_getStatic_not_modified(controller, tmpdir):
+    cache = StaticCache(str(tmpdir))
+    path = cache.store("/symbols/router.svg/raw", b"<svg></svg>", etag="abc", extension=".svg")
+    cache.save()
+    # Cache loaded by a new session
+    controller._static_cache = StaticCache(str(tmpdir))
+    callback = MagicMock()
+    controller.getStatic("/symbols/router.svg/raw", callback)
+    args, kwargs = controller._http_client.createHTTPQuery.call_args
+    assert kwargs["headers"] == {"If-None-Match": "abc"}
+
+    args[2]({}, raw_body=b"", headers={"etag": "abc"})
+    callback.assert_called_with(path)
+
+
+
+def test_getStatic_save_index_once(controller, tmpdir):
+    controller._static_cache = StaticCache(str(tmpdir))
+    for name in ("router", "switch"):
+        controller.getStatic("/symbols/{}.svg/raw".format(name), MagicMock())
+        args, kwargs = controller._http_client.createHTTPQuery.call_args
+        args[2]({}, raw_body="<svg>{}</svg>".format(name).encode(), headers={})
+    # The index is written after a delay
+    assert controller._static_cache_save_timer.isActive()
+    assert not os.path.exists(str(tmpdir / StaticCache.INDEX_FILE))
+
+    controller.saveStaticCache()
+    assert os.path.exists(str(tmpdir / StaticCache.INDEX_FILE))
+    assert not controller._static_cache.isDirty()
+    assert not controller._static_cache_save_timer.isActive()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+#
+# Copyright (C) 2017 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+from gns3.graphics_sync import GraphicsSync
+
+
+def fake_node(node_id):
+    node = MagicMock()
+    node.id.return_value = node_id
+    node.initialized.return_value = True
+    return node
+
+
+@pytest.fixture
+def progress():
+    with patch("gns3.progress.Progress.instance") as mock:
+        yield mock.return_value
+
+
+def test_merge_changes(progress):
+    sync = GraphicsSync()
+    node = fake_node(1)
+    sync.push(node, {"x": 10, "y": 10})
+    sync.push(node, {"x": 20, "z": 1})
+    assert sync.pending() == 1
+    assert not node.updateGraphics.called
+
+    sync.flush()
+    node.updateGraphics.assert_called_once()
+    assert node.updateGraphics.call_args[0][0] == {"x": 20, "y": 10, "z": 1}
+
+
+def test_limit_queries_and_single_progress_entry(progress):
+    sync = GraphicsSync(max_queries=2)
+    nodes = [fake_node(i) for i in range(5)]
+    for node in nodes:
+        sync.push(node, {"x": 1})
+    sync.flush()
+    assert [n.updateGraphics.called for n in nodes] == [True, True, False, False, False]
+    assert progress.add_query_signal.emit.call_count == 1
+
+    # Answer the queries one by one
+    for node in nodes:
+        callback = node.updateGraphics.call_args[0][1]
+        callback({"x": 1})
+        node.updateNodeCallback.assert_called_with({"x": 1}, error=False)
+    assert all(n.updateGraphics.call_count == 1 for n in nodes)
+    progress.progress_signal.emit.assert_called_with(progress.add_query_signal.emit.call_args[0][0], 5, 5)
+    assert progress.remove_query_signal.emit.call_count == 1
+
+
+def test_node_in_flight_is_not_sent_twice(progress):
+    sync = GraphicsSync()
+    node = fake_node(1)
+    sync.push(node, {"x": 1})
+    sync.flush()
+    sync.push(node, {"x": 2})
+    sync.flush()
+    assert node.updateGraphics.call_count == 1
+
+    node.updateGraphics.call_args[0][1]({})
+    assert node.updateGraphics.call_count == 2
+    assert node.updateGraphics.call_args[0][0] == {"x": 2}
+
+
+def test_discard(progress):
+    sync = GraphicsSync()
+    node = fake_node(1)
+    sync.push(node, {"x": 1})
+    sync.discard(node)
+    sync.flush()
+    assert not node.updateGraphics.called
@@ -20,6 +20,8 @@ import unittest.mock
 
 from gns3.qt import QtCore, QtNetwork, FakeQtSignal
 from gns3.http_client import HTTPClient
+from gns3.http_scheduler import HTTPScheduler
+from gns3.http_stats import HTTPStats
 from gns3.version import __version__, __version_info__
 
 
@@ -332,3 +334,30 @@ def test_callbackConnect_non_gns3_server(http_client):
     http_client._callbackConnect(params)
     assert http_client._connected is False
     mock.assert_called_with({"message": "The remote server http://127.0.0.1:3080 is not a GNS3 server"}, error=True, server=None)
+
+
+def test_createHTTPQuery_bulk(http_client, http_request, network_manager, response):
+
+    http_client._connected = True
+    http_client._scheduler = HTTPScheduler(max_bulk=1)
+    callback = unittest.mock.MagicMock()
+
+    assert http_client.createHTTPQuery("GET", "/computes/local/qemu/images", callback, priority=HTTPScheduler.BULK) is not None
+    assert http_client.createHTTPQuery("GET", "/computes/local/iou/images", callback, priority=HTTPScheduler.BULK) is None
+    assert http_client.createHTTPQuery("GET", "/computes/remote/qemu/images", callback, priority=HTTPScheduler.BULK) is not None
+    assert http_client.scheduler().queueDepth() == 1
+
+
+def test_query_stats(http_client, http_request, network_manager, response):
+
+    http_client._connected = True
+    response.readAll.return_value = QtCore.QByteArray(b'{"name": "test"}')
+
+    http_client.createHTTPQuery("GET", "/projects/5e5bc1d8-4b36-4bd5-8a28-83dbc9bb9a9c/nodes", None)
+    response.finished.emit()
+
+    stats = HTTPStats.instance().__json__()
+    assert stats["GET /projects/{}/nodes"]["count"] == 1
+    assert stats["GET /projects/{}/nodes"]["errors"] == 0
+    assert stats["GET /projects/{}/nodes"]["bytes_received"] == 16
+    assert http_client._query_stats == {}
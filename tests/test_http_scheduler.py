@@ -0,0 +1,148 @@
+#!/usr/bin/env python
+#
+# Copyright (C) 2017 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from unittest.mock import MagicMock
+
+from gns3.http_scheduler import HTTPScheduler
+
+
+class FakeResponse:
+
+    def __init__(self):
+        self.finished = MagicMock()
+        self.aborted = False
+
+    def isRunning(self):
+        return not self.aborted
+
+    def abort(self):
+        self.aborted = True
+
+    def finish(self):
+        args, kwargs = self.finished.connect.call_args
+        args[0]()
+
+
+def fake_request(sent):
+    def request():
+        response = FakeResponse()
+        sent.append(response)
+        return response
+    return request
+
+
+def test_interactive_sent_immediately():
+    scheduler = HTTPScheduler(max_bulk=1)
+    sent = []
+    for i in range(3):
+        assert scheduler.submit(fake_request(sent)) is not None
+    assert len(sent) == 3
+    assert scheduler.inFlight() == 0
+
+
+def test_bulk_limit_by_host():
+    scheduler = HTTPScheduler(max_bulk=2)
+    sent = []
+    for i in range(3):
+        scheduler.submit(fake_request(sent), "local", HTTPScheduler.BULK)
+    scheduler.submit(fake_request(sent), "remote", HTTPScheduler.BULK)
+    assert len(sent) == 3
+    assert scheduler.queueDepth() == 1
+    assert scheduler.inFlight("local") == 2
+
+    sent[0].finish()
+    assert len(sent) == 4
+    assert scheduler.queueDepth() == 0
+
+
+def test_background_after_bulk():
+    scheduler = HTTPScheduler(max_bulk=1, max_background=1)
+    sent = []
+    scheduler.submit(fake_request(sent), "local", HTTPScheduler.BULK)
+    scheduler.submit(fake_request(sent), "local", HTTPScheduler.BACKGROUND)
+    scheduler.submit(fake_request(sent), "local", HTTPScheduler.BULK)
+    assert len(sent) == 1
+
+    sent[0].finish()
+    # The bulk query goes first
+    assert len(sent) == 2
+    assert scheduler.queueDepth(HTTPScheduler.BACKGROUND) == 1
+    sent[1].finish()
+    assert len(sent) == 3
+
+
+def test_priority_context():
+    scheduler = HTTPScheduler(max_bulk=1)
+    sent = []
+    with HTTPScheduler.priority(HTTPScheduler.BULK, group="start nodes", host="local"):
+        scheduler.submit(fake_request(sent))
+        scheduler.submit(fake_request(sent))
+    assert len(sent) == 1
+    assert scheduler.queueDepth(HTTPScheduler.BULK) == 1
+
+    assert scheduler.cancelGroup("start nodes") == 2
+    assert sent[0].aborted
+    assert scheduler.queueDepth() == 0
+
+
+def test_cancel_group_without_abort():
+    scheduler = HTTPScheduler(max_bulk=1)
+    sent = []
+    scheduler.submit(fake_request(sent), "local", HTTPScheduler.BULK, group="stop nodes")
+    scheduler.submit(fake_request(sent), "local", HTTPScheduler.BULK, group="stop nodes")
+    assert scheduler.cancelGroup("stop nodes", abort=False) == 1
+    assert not sent[0].aborted
+
+
+def test_metrics():
+    scheduler = HTTPScheduler(max_bulk=1)
+    sent = []
+    scheduler.submit(fake_request(sent))
+    scheduler.submit(fake_request(sent), "local", HTTPScheduler.BULK)
+    scheduler.submit(fake_request(sent), "local", HTTPScheduler.BULK)
+    metrics = scheduler.metrics()
+    assert metrics["interactive"]["sent"] == 1
+    assert metrics["bulk"]["sent"] == 1
+    assert metrics["bulk"]["queued"] == 1
+    assert metrics["bulk"]["in_flight"] == 1
+    assert metrics["background"]["sent"] == 0
+
+
+def test_bulk_fifo_by_host():
+    scheduler = HTTPScheduler(max_bulk=1)
+    sent = []
+    requests = {}
+    for host in ("local", "remote"):
+        for i in range(300):
+            request = fake_request(sent)
+            requests[request] = (host, i)
+            scheduler.submit(request, host, HTTPScheduler.BULK)
+    assert len(sent) == 2
+    assert scheduler.queueDepth(HTTPScheduler.BULK) == 598
+
+    # Each completion sends the next query of the same compute
+    order = []
+    original_send = scheduler._send
+
+    def send(entry):
+        order.append(requests[entry[0]])
+        return original_send(entry)
+    scheduler._send = send
+    for i in range(4):
+        sent[i].finish()
+    assert order == [("local", 1), ("remote", 1), ("local", 2), ("remote", 2)]
+    assert scheduler.queueDepth() == 594
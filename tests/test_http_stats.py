@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+#
+# Copyright (C) 2017 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import json
+
+from gns3.http_stats import HTTPStats, LatencyHistogram
+
+
+def test_histogram_percentile():
+
+    histogram = LatencyHistogram()
+    assert histogram.percentile(50) == 0.0
+    for latency in range(1, 101):
+        histogram.record(latency)
+    assert histogram.count() == 100
+    assert histogram.average() == 50.5
+    assert histogram.maximum() == 100
+    assert histogram.percentile(50) == 50
+    assert histogram.percentile(90) == 100
+    assert histogram.percentile(100) == 100
+
+
+def test_histogram_above_bounds():
+
+    histogram = LatencyHistogram()
+    histogram.record(500000)
+    assert histogram.percentile(99) == 500000
+
+
+def test_route_template():
+
+    stats = HTTPStats()
+    assert stats.routeTemplate("GET", "/projects/5e5bc1d8-4b36-4bd5-8a28-83dbc9bb9a9c/nodes/0f3a66e8-c0e4-4cb1-b3c2-2ef5b4a2c8d4") == "GET /projects/{}/nodes/{}"
+    assert stats.routeTemplate("GET", "/computes/local/qemu/images") == "GET /computes/{}/qemu/images"
+    assert stats.routeTemplate("POST", "/computes/vm/qemu/images/linux/test.qcow2") == "POST /computes/{}/qemu/images/{}"
+    assert stats.routeTemplate("GET", "/projects/5e5bc1d8-4b36-4bd5-8a28-83dbc9bb9a9c/export?include_images=yes") == "GET /projects/{}/export"
+    assert stats.routeTemplate("PUT", "/projects/5e5bc1d8-4b36-4bd5-8a28-83dbc9bb9a9c/nodes/1/adapters/0/ports/0/nio") == "PUT /projects/{}/nodes/{}/adapters/{}/ports/{}/nio"
+
+
+def test_record():
+
+    stats = HTTPStats()
+    stats.record("GET", "/projects/5e5bc1d8-4b36-4bd5-8a28-83dbc9bb9a9c", 10, bytes_received=100)
+    stats.record("GET", "/projects/0f3a66e8-c0e4-4cb1-b3c2-2ef5b4a2c8d4", 30, error=True, bytes_sent=5, bytes_received=20)
+    route = stats.__json__()["GET /projects/{}"]
+    assert route["count"] == 2
+    assert route["errors"] == 1
+    assert route["bytes_sent"] == 5
+    assert route["bytes_received"] == 120
+    assert route["average_ms"] == 20
+    assert route["max_ms"] == 30
+
+    stats.reset()
+    assert stats.__json__() == {}
+
+
+def test_record_disabled():
+
+    stats = HTTPStats()
+    stats.setEnabled(False)
+    stats.record("GET", "/version", 10)
+    assert stats.__json__() == {}
+
+
+def test_max_routes():
+
+    stats = HTTPStats()
+    stats.MAX_ROUTES = 2
+    stats.record("GET", "/a", 1)
+    stats.record("GET", "/b", 1)
+    stats.record("GET", "/c", 1)
+    stats.record("GET", "/d", 1)
+    assert sorted(stats.__json__().keys()) == ["GET /a", "GET /b", HTTPStats.OTHER_ROUTE]
+    assert stats.__json__()[HTTPStats.OTHER_ROUTE]["count"] == 2
+
+
+def test_dump(tmpdir):
+
+    stats = HTTPStats()
+    stats.record("GET", "/version", 2)
+    path = str(tmpdir / "stats.json")
+    stats.dump(path)
+    with open(path) as f:
+        assert json.load(f)["GET /version"]["count"] == 1
+
+
+def test_format():
+
+    stats = HTTPStats()
+    assert stats.format() == "No HTTP query recorded"
+    stats.record("GET", "/version", 2)
+    stats.record("POST", "/projects", 200)
+    lines = stats.format().splitlines()
+    assert len(lines) == 3
+    assert lines[1].startswith("POST /projects")
@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+#
+# Copyright (C) 2017 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import time
+from unittest.mock import MagicMock
+
+from gns3.http_timeouts import HTTPTimeouts
+
+
+def finish(reply):
+    args, kwargs = reply.finished.connect.call_args
+    args[0]()
+
+
+def test_sweep():
+    callback = MagicMock()
+    timeouts = HTTPTimeouts(callback)
+    fast = MagicMock()
+    slow = MagicMock()
+    timeouts.add(fast, 5)
+    timeouts.add(slow, 120)
+    assert timeouts.pending() == 2
+
+    timeouts.sweep(time.monotonic() + 1)
+    assert not callback.called
+
+    timeouts.sweep(time.monotonic() + 10)
+    callback.assert_called_once_with(fast)
+    assert timeouts.pending() == 1
+
+
+def test_finished_reply_removed():
+    callback = MagicMock()
+    timeouts = HTTPTimeouts(callback)
+    reply = MagicMock()
+    timeouts.add(reply, 5)
+    assert timeouts._timer.isActive()
+    finish(reply)
+    assert timeouts.pending() == 0
+    assert not timeouts._timer.isActive()
+
+    timeouts.sweep(time.monotonic() + 10)
+    assert not callback.called
+
+
+def test_heap_compaction():
+    timeouts = HTTPTimeouts(MagicMock())
+    keep = MagicMock()
+    timeouts.add(keep, 120)
+    for i in range(200):
+        reply = MagicMock()
+        timeouts.add(reply, 120)
+        finish(reply)
+    assert timeouts.pending() == 1
+    assert len(timeouts._heap) <= 2 + 64
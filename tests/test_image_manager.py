@@ -63,9 +63,16 @@ def test_askCopyUploadImage_remote(image_manager, remote_server):
 
 
 def test_uploadImageToRemoteServer(image_manager, remote_server, images_dir, controller):
+    controller.get = MagicMock()
     controller.post = MagicMock()
     filename = image_manager._uploadImageToRemoteServer(str(images_dir / "QEMU" / "test"), remote_server.id(), 'QEMU')
     assert filename == 'test'
+
+    # The images of the compute are listed before the upload
+    args, kwargs = controller.get.call_args
+    assert args[0] == '/computes/example.org/qemu/images'
+    args[1]([])
+
     args, kwargs = controller.post.call_args
     assert args[0] == '/computes/example.org/qemu/images/test'
     assert kwargs['body'] == pathlib.Path(str(images_dir / "QEMU" / "test"))
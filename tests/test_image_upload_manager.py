@@ -0,0 +1,160 @@
+#!/usr/bin/env python
+#
+# Copyright (C) 2017 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import time
+import pytest
+import pathlib
+from unittest.mock import MagicMock
+
+from gns3.qt import QtCore
+from gns3.image_upload_manager import ImageUploadManager
+
+
+# md5sum of "hello"
+HELLO_MD5SUM = "5d41402abc4b2a76b9719d911017c592"
+
+
+@pytest.fixture
+def image(tmpdir):
+    path = str(tmpdir / "linux.img")
+    with open(path, "w+") as f:
+        f.write("hello")
+    return path
+
+
+@pytest.fixture
+def manager(controller):
+    controller.get = MagicMock()
+    controller.post = MagicMock()
+    return ImageUploadManager(max_uploads=1)
+
+
+def wait_md5sum(manager):
+    """
+    Wait for the checksums computed in the thread pool of the manager
+    """
+
+    manager.waitForDone()
+    deadline = time.monotonic() + 5
+    while manager._hashing and time.monotonic() < deadline:
+        QtCore.QCoreApplication.processEvents()
+
+
+def list_callback(controller, images, manager=None):
+    args, kwargs = controller.get.call_args
+    assert args[0] == "/computes/example.org/qemu/images"
+    controller.get.reset_mock()
+    args[1](images)
+    if manager is not None:
+        wait_md5sum(manager)
+
+
+def upload_callback(controller, result, error=False):
+    args, kwargs = controller.post.call_args
+    controller.post.reset_mock()
+    args[1](result, error=error)
+
+
+def test_upload(manager, controller, image):
+    callback = MagicMock()
+    manager.upload("qemu", "example.org", image, "linux.img", callback)
+    list_callback(controller, [])
+
+    args, kwargs = controller.post.call_args
+    assert args[0] == "/computes/example.org/qemu/images/linux.img"
+    assert kwargs["body"] == pathlib.Path(image)
+    assert kwargs["timeout"] is None
+    upload_callback(controller, {})
+    assert not callback.called
+
+    # The checksum computed by the compute is verified
+    list_callback(controller, [{"path": "linux.img", "md5sum": HELLO_MD5SUM, "filesize": 5}], manager)
+    callback.assert_called_with({"filename": "linux.img", "md5sum": HELLO_MD5SUM}, error=False)
+    assert manager.pending() == 0
+
+
+def test_upload_already_on_compute(manager, controller, image):
+    callback = MagicMock()
+    manager.upload("qemu", "example.org", image, "linux.img", callback)
+    list_callback(controller, [{"path": "linux.img", "md5sum": HELLO_MD5SUM, "filesize": 5}], manager)
+    assert not controller.post.called
+    callback.assert_called_with({"filename": "linux.img", "md5sum": HELLO_MD5SUM}, error=False)
+
+    # The image may have been deleted from the compute since the last batch
+    manager.upload("qemu", "example.org", image, "linux.img", callback)
+    assert controller.get.called
+
+
+def test_upload_image_list_kept_during_batch(manager, controller, image, tmpdir):
+    other = str(tmpdir / "other.img")
+    open(other, "w+").close()
+    manager.upload("qemu", "example.org", other, "other.img")
+    list_callback(controller, [])
+    manager.upload("qemu", "example.org", image, "linux.img")
+    assert not controller.get.called
+
+
+def test_upload_different_checksum_on_compute(manager, controller, image):
+    manager.upload("qemu", "example.org", image, "linux.img")
+    list_callback(controller, [{"path": "linux.img", "md5sum": "00000000000000000000000000000000", "filesize": 5}], manager)
+    assert controller.post.called
+
+
+def test_upload_max_uploads(manager, controller, image, tmpdir):
+    other = str(tmpdir / "other.img")
+    open(other, "w+").close()
+    manager.upload("qemu", "example.org", image, "linux.img")
+    manager.upload("qemu", "example.org", other, "other.img")
+    list_callback(controller, [])
+    assert controller.post.call_count == 1
+
+    upload_callback(controller, {})
+    args, kwargs = controller.post.call_args
+    assert args[0] == "/computes/example.org/qemu/images/other.img"
+
+
+def test_upload_same_image_twice(manager, controller, image):
+    first = MagicMock()
+    second = MagicMock()
+    manager.upload("qemu", "example.org", image, "linux.img", first)
+    manager.upload("qemu", "example.org", image, "linux.img", second)
+    list_callback(controller, [])
+    assert controller.post.call_count == 1
+    upload_callback(controller, {"message": "Server error", "status": 500}, error=True)
+    assert first.called
+    assert second.called
+
+
+def test_upload_retry_after_connection_error(manager, controller, image):
+    callback = MagicMock()
+    manager.upload("qemu", "example.org", image, "linux.img", callback)
+    list_callback(controller, [])
+    upload_callback(controller, {"message": "Connection closed"}, error=True)
+    assert controller.post.called
+    assert not callback.called
+
+
+def test_upload_retry_corrupted(manager, controller, image):
+    callback = MagicMock()
+    manager.upload("qemu", "example.org", image, "linux.img", callback)
+    list_callback(controller, [])
+    for attempt in range(ImageUploadManager.MAX_ATTEMPTS):
+        upload_callback(controller, {})
+        list_callback(controller, [{"path": "linux.img", "md5sum": "00000000000000000000000000000000", "filesize": 5}], manager)
+    assert not controller.post.called
+    args, kwargs = callback.call_args
+    assert kwargs["error"] is True
@@ -359,3 +359,144 @@ def test_migrateRemoveInternetVM(tmpdir):
     local_config._migrateOldConfig()
 
     assert len(local_config._settings["Qemu"]["vms"]) == 1
+
+
+def test_watchConfigChanges(config_file, local_config):
+    local_config.setConfigFilePath(config_file)
+    local_config.watchConfigChanges()
+    assert local_config._watcher.files() == [config_file]
+    assert local_config._watcher.directories() == [os.path.dirname(config_file)]
+
+    # writeConfig replace the file with a rename, the file need to be watched again
+    local_config.writeConfig()
+    with patch("gns3.local_config.LocalConfig.checkConfigChanged") as mock:
+        local_config._watchedConfigChangedSlot()
+        assert mock.called
+    assert local_config._watcher.files() == [config_file]
+
+
+def test_refreshConfigFromControllerETag(local_config):
+    controller = MagicMock()
+    controller.connected.return_value = True
+    with patch("gns3.controller.Controller.instance", return_value=controller):
+        local_config.refreshConfigFromController()
+        args, kwargs = controller.get.call_args
+        assert kwargs["headers"] == {}
+
+        local_config._getSettingsCallback({"modification_uuid": "a", "Test": {"a": "b"}}, headers={"etag": "42"})
+        assert local_config._settings["Test"] == {"a": "b"}
+
+        local_config.refreshConfigFromController()
+        args, kwargs = controller.get.call_args
+        assert kwargs["headers"] == {"If-None-Match": "42"}
+
+        # Not modified, the empty body is not pushed back to the controller
+        controller.post.reset_mock()
+        local_config._getSettingsCallback({}, headers={"etag": "42"})
+        assert not controller.post.called
+        assert local_config._settings["Test"] == {"a": "b"}
+
+        # A 304 without ETag is not an empty settings
+        local_config._getSettingsCallback({}, headers={}, status=304)
+        assert not controller.post.called
+        assert not local_config._controller_dirty_sections
+        assert local_config._settings["Test"] == {"a": "b"}
+
+
+def test_saveSectionSettingsWriteBehind(local_config):
+
+    with patch("gns3.local_config.LocalConfig.writeConfig") as mock:
+        local_config.saveSectionSettings("Test", {"a": 1})
+        local_config.saveSectionSettings("Test2", {"b": 2})
+        local_config.saveSectionSettings("Test", {"a": 3})
+        assert not mock.called
+        assert local_config.dirtySections() == {"Test", "Test2"}
+        assert local_config._write_timer.isActive()
+
+    # The changes made during the delay are written once
+    local_config.flush()
+    assert local_config.dirtySections() == set()
+    assert not local_config._write_timer.isActive()
+    with open(local_config.configFilePath()) as f:
+        settings = json.load(f)
+    assert settings["Test"] == {"a": 3}
+    assert settings["Test2"] == {"b": 2}
+
+    # Nothing to write
+    with patch("gns3.local_config.LocalConfig.writeConfig") as mock:
+        local_config.flush()
+        assert not mock.called
+
+
+def test_saveOnControllerOnlyChangedSections(local_config):
+
+    controller = MagicMock()
+    controller.connected.return_value = True
+    local_config._settings_retrieved_from_controller = True
+    local_config._settings["Qemu"] = {"vms": []}
+    with patch("gns3.controller.Controller.instance", return_value=controller):
+        # User specific sections are not saved on the controller
+        local_config.saveSectionSettings("MainWindow", {"hdpi": False})
+        local_config.flush()
+        assert not controller.post.called
+
+        local_config.saveSectionSettings("VPCS", {"vpcs_path": "/bin/vpcs"})
+        local_config.flush()
+        args, kwargs = controller.post.call_args
+        assert args[0] == "/settings"
+        assert kwargs["body"] == {"Qemu": {"vms": []}, "VPCS": {"vpcs_path": "/bin/vpcs"}}
+
+        controller.post.reset_mock()
+        local_config.writeConfig()
+        assert not controller.post.called
+
+
+def test_checkConfigChangedKeepPendingChanges(config_file, local_config):
+
+    local_config.setConfigFilePath(config_file)
+    local_config.saveSectionSettings("VPCS", {"vpcs_path": "/bin/vpcs"})
+    with open(config_file, "w+") as f:
+        json.dump({"VirtualBox": {"use_local_server": False}, "VPCS": {"vpcs_path": "/usr/bin/vpcs"}, "type": "settings", "version": "1.4.0.dev1"}, f)
+    local_config._last_config_changed = 1
+    local_config.checkConfigChanged()
+    assert local_config._settings["VirtualBox"]["use_local_server"] is False
+    assert local_config._settings["VPCS"]["vpcs_path"] == "/bin/vpcs"
+
+
+def test_sectionView(local_config):
+
+    view = local_config.sectionView("Test", {"a": 1, "b": {"c": 2}})
+    assert view == {"a": 1, "b": {"c": 2}}
+    # The defaults are added to the section
+    assert local_config._settings["Test"] == {"a": 1, "b": {"c": 2}}
+    # The view is cached until the section changes
+    assert local_config.sectionView("Test", {"a": 1}) is view
+
+    version = local_config.sectionVersion("Test")
+    other_version = local_config.sectionVersion("Other")
+    local_config.saveSectionSettings("Test", {"a": 3})
+    assert local_config.sectionVersion("Test") > version
+    assert local_config.sectionVersion("Other") == other_version
+
+    # Copy on write, the previous view is not modified
+    assert view["a"] == 1
+    new_view = local_config.sectionView("Test")
+    assert new_view["a"] == 3
+    assert new_view.version() == local_config.sectionVersion("Test")
+
+
+def test_loadSectionSettingsIsASnapshot(local_config):
+
+    local_config.saveSectionSettings("Test", {"vms": [{"name": "R1"}]})
+    view = local_config.sectionView("Test")
+    settings = local_config.loadSectionSettings("Test", {})
+    settings["vms"].append({"name": "R2"})
+    assert len(local_config._settings["Test"]["vms"]) == 1
+    assert local_config.sectionView("Test") is view
+
+
+def test_versionChangesOnReload(config_file, local_config):
+
+    version = local_config.sectionVersion("VirtualBox")
+    local_config.setConfigFilePath(config_file)
+    assert local_config.sectionVersion("VirtualBox") > version
@@ -15,6 +15,7 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+import io
 import sys
 import json
 import pytest
@@ -27,6 +28,10 @@ from gns3.local_server import LocalServer
 from gns3.local_server_config import LocalServerConfig
 
 
+# The fixture patches the method, keep the real one
+localServerAutoStartIfRequire = LocalServer.localServerAutoStartIfRequire
+
+
 @pytest.fixture
 def local_server_path(tmpdir):
     return str(tmpdir / "gns3server")
@@ -75,6 +80,7 @@ def test_startLocalServer(tmpdir, local_server, local_server_path):
     logging.getLogger().setLevel(logging.DEBUG)  # Make sure we are using debug level in order to get the --debug
 
     process_mock = MagicMock()
+    process_mock.stdout = io.BytesIO(b"")
     with patch("subprocess.Popen", return_value=process_mock) as mock:
 
         # If everything work fine the command is still running and a timeout is raised
@@ -86,7 +92,7 @@ def test_startLocalServer(tmpdir, local_server, local_server_path):
                                  '--debug',
                                  '--log=' + str(tmpdir / "gns3_server.log"),
                                  '--pid=' + str(tmpdir / "gns3_server.pid")
-                                 ], stderr=unittest.mock.ANY)
+                                 ], stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
 
 
 def test_killAlreadyRunningServer(local_server):
@@ -98,3 +104,62 @@ def test_killAlreadyRunningServer(local_server):
         LocalServer.instance()._killAlreadyRunningServer()
         mock.assert_called_with(pid=42)
         assert mock_process.kill.called
+
+
+def test_checkLocalServerRunning(local_server):
+
+    def run(probe):
+        probe._status_code = 200
+        probe._json_data = {"version": "2.0.0"}
+        probe._finish()
+
+    callback = MagicMock()
+    with patch("gns3.utils.server_probe.ServerProbe.run", autospec=True, side_effect=run):
+        local_server.checkLocalServerRunning(callback)
+    callback.assert_called_with(True)
+    assert not local_server._probes
+
+
+def test_checkLocalServerRunning_not_gns3(local_server):
+
+    def run(probe):
+        probe._status_code = 200
+        probe._json_data = {"hello": "world"}
+        probe._finish("Not a GNS3 server")
+
+    callback = MagicMock()
+    with patch("gns3.utils.server_probe.ServerProbe.run", autospec=True, side_effect=run):
+        local_server.checkLocalServerRunning(callback)
+    callback.assert_called_with(False)
+
+
+def test_localServerAutoStartIfRequire_not_main_gui(local_server):
+
+    local_server._settings["auto_start"] = True
+    local_server._settings["host"] = "127.0.0.1"
+    callback = MagicMock()
+    with patch("gns3.local_server.LocalServer.checkLocalServerRunning") as check, \
+            patch("gns3.local_config.LocalConfig.isMainGui", return_value=False), \
+            patch("gns3.local_server.HTTPClient"), \
+            patch("gns3.local_server.Controller"):
+        localServerAutoStartIfRequire(local_server, callback)
+        # The startup continues from the answer of the probe
+        assert not callback.called
+        # A second call waits for the same startup
+        second = MagicMock()
+        localServerAutoStartIfRequire(local_server, second)
+        assert check.call_count == 1
+        check.call_args[0][0](False)
+    callback.assert_called_with(True)
+    second.assert_called_with(True)
+
+
+def test_localServerOutput(local_server):
+
+    assert local_server.localServerOutput() == ""
+    process_mock = MagicMock()
+    process_mock.stdout = io.BytesIO(b"Starting\nTraceback\n")
+    with patch("subprocess.Popen", return_value=process_mock):
+        local_server.startLocalServer()
+    local_server._output_reader.join()
+    assert local_server.localServerOutput() == "Starting\nTraceback"
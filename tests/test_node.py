@@ -172,3 +172,24 @@ def test_updatePorts_PortChange(vpcs_device):
     ])
     assert port == vpcs_device._ports[0]
     assert port.status() == Port.started
+
+
+def test_setGraphics(vpcs_device):
+    vpcs_device.setPos(0, 0)
+    vpcs_device.setSymbol(":/symbols/computer.svg")
+    node_item = MagicMock()
+    node_item.pos.return_value.x.return_value = 10
+    node_item.pos.return_value.y.return_value = 20
+    node_item.zValue.return_value = 1
+    node_item.symbol.return_value = ":/symbols/computer.svg"
+    node_item.label.return_value = None
+
+    with patch('gns3.graphics_sync.GraphicsSync.push') as mock:
+        vpcs_device.setGraphics(node_item)
+        mock.assert_called_with(vpcs_device, {"x": 10, "y": 20, "z": 1, "symbol": ":/symbols/computer.svg"})
+
+    with patch('gns3.base_node.BaseNode.controllerHttpPut') as mock:
+        vpcs_device.updateGraphics({"x": 10}, None)
+        args, kwargs = mock.call_args
+        assert args[0] == "/nodes/{node_id}".format(node_id=vpcs_device.node_id())
+        assert kwargs["body"]["x"] == 10
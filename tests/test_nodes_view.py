@@ -0,0 +1,146 @@
+#!/usr/bin/env python
+#
+# Copyright (C) 2017 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from unittest.mock import MagicMock, patch
+
+from gns3.qt import QtCore
+from gns3.node import Node
+from gns3.nodes_view import NodesView, NodesModel, NodesFilterProxyModel, SymbolIconCache
+
+
+TEMPLATES = [
+    {"name": "VPCS", "symbol": ":/symbols/vpcs_guest.svg", "categories": [Node.end_devices]},
+    {"name": "Ethernet switch", "symbol": ":/symbols/ethernet_switch.svg", "categories": [Node.switches]},
+    {"name": "c7200", "symbol": ":/symbols/router.svg", "categories": [Node.routers]},
+    {"name": "c3725", "symbol": ":/symbols/router.svg", "categories": [Node.routers]},
+]
+
+
+def rows(model):
+
+    return [model.index(row, 0).data() for row in range(model.rowCount())]
+
+
+def test_symbol_icon_cache():
+
+    cache = SymbolIconCache(max_size=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    # b is the least recently used
+    assert "b" not in cache
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert len(cache) == 2
+
+
+def test_icons_requested_when_painted(controller):
+
+    model = NodesModel()
+    model.setTemplates(TEMPLATES)
+    with patch("gns3.controller.Controller.getSymbolIcon") as mock:
+        assert rows(model) == ["VPCS", "Ethernet switch", "c7200", "c3725"]
+        assert not mock.called
+
+        assert model.index(2, 0).data(QtCore.Qt.DecorationRole) is None
+        assert model.index(3, 0).data(QtCore.Qt.DecorationRole) is None
+        # One request for the two routers
+        assert mock.call_count == 1
+        symbol, callback = mock.call_args[0]
+        assert symbol == ":/symbols/router.svg"
+
+    changed = []
+    model.dataChanged.connect(lambda top_left, bottom_right, roles=[]: changed.append(top_left.row()))
+    icon = MagicMock()
+    callback(icon)
+    assert changed == [2, 3]
+    assert model.index(3, 0).data(QtCore.Qt.DecorationRole) is icon
+
+
+def test_icon_already_cached_by_controller(controller):
+
+    model = NodesModel()
+    model.setTemplates(TEMPLATES)
+    icon = MagicMock()
+    changed = []
+    model.dataChanged.connect(lambda top_left, bottom_right, roles=[]: changed.append(top_left.row()))
+    with patch("gns3.controller.Controller.getSymbolIcon", side_effect=lambda symbol, callback: callback(icon)):
+        assert model.index(0, 0).data(QtCore.Qt.DecorationRole) is icon
+    assert changed == []
+
+
+def test_filter_category_and_text():
+
+    model = NodesModel()
+    model.setTemplates(TEMPLATES)
+    proxy = NodesFilterProxyModel()
+    proxy.setSourceModel(model)
+    proxy.sort(0)
+    assert rows(proxy) == ["c3725", "c7200", "Ethernet switch", "VPCS"]
+
+    proxy.setCategory(Node.routers)
+    assert rows(proxy) == ["c3725", "c7200"]
+    proxy.setFilterText("7200")
+    assert rows(proxy) == ["c7200"]
+
+    proxy.setCategory(None)
+    proxy.setFilterText("Switch")
+    assert rows(proxy) == ["Ethernet switch"]
+    # The words can match the category
+    proxy.setFilterText("end dev")
+    assert rows(proxy) == ["VPCS"]
+    proxy.setFilterText("")
+    assert len(rows(proxy)) == 4
+
+
+def test_populate_rebuilds_templates(controller):
+
+    module = MagicMock()
+    module.instance.return_value.nodes.return_value = TEMPLATES[:1]
+    controller._connected = True
+    view = NodesView()
+    with patch("gns3.nodes_view.MODULES", [module]):
+        view.populateNodesView(None)
+        assert rows(view.model()) == ["VPCS"]
+
+        # A template added without a change notification of the settings
+        module.instance.return_value.nodes.return_value = TEMPLATES[:2]
+        view.populateNodesView(None)
+    assert rows(view.model()) == ["Ethernet switch", "VPCS"]
+
+
+def test_refresh_after_modules_reload(controller):
+
+    module = MagicMock()
+    module.instance.return_value.nodes.return_value = TEMPLATES[:1]
+    module.instance.return_value.settingsVersion.return_value = 1
+    controller._connected = True
+    view = NodesView()
+    with patch("gns3.nodes_view.MODULES", [module]):
+        view.refresh()
+        assert rows(view.model()) == ["VPCS"]
+
+        # Same settings, nothing to rebuild
+        module.instance.return_value.nodes.return_value = TEMPLATES[:2]
+        view.refresh()
+        assert rows(view.model()) == ["VPCS"]
+
+        # The module has reloaded its templates after the refresh of the view
+        module.instance.return_value.settingsVersion.return_value = 2
+        view.refresh()
+    assert rows(view.model()) == ["Ethernet switch", "VPCS"]
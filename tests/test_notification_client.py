@@ -0,0 +1,171 @@
+#!/usr/bin/env python
+#
+# Copyright (C) 2017 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+from gns3.notification_client import NotificationClient
+
+
+@pytest.fixture
+def client(controller):
+
+    controller._connected = True
+    handler = MagicMock()
+    client = NotificationClient("/projects/test/notifications", handler)
+    client._websocket_supported = False
+    return client
+
+
+def test_reconnect_delay(client):
+
+    for failures in range(20):
+        client._failures = failures
+        delay = min(NotificationClient.MAX_DELAY, NotificationClient.MIN_DELAY * 2 ** failures)
+        for _ in range(10):
+            assert delay / 2 <= client.reconnectDelay() <= delay
+
+
+def test_http_stream(client, controller):
+
+    client.start()
+    assert client.transport() == NotificationClient.HTTP
+    args, kwargs = controller._http_client.createHTTPQuery.call_args
+    assert args[0] == "GET"
+    assert args[1] == "/projects/test/notifications"
+    assert kwargs["timeout"] is None
+
+    event = {"action": "node.updated", "event": {"node_id": "1"}}
+    kwargs["downloadProgressCallback"](event)
+    assert client.connected()
+    client._handler.assert_called_with(event)
+    client.stop()
+
+
+def test_http_stream_reconnect_resync(client, controller):
+
+    resync = MagicMock()
+    client.resync_signal.connect(resync)
+    client.start()
+    args, kwargs = controller._http_client.createHTTPQuery.call_args
+    kwargs["downloadProgressCallback"]({"action": "ping", "event": {}})
+    assert not resync.called
+
+    # The stream ends, the client reconnects after a delay
+    args[2]({}, error=True)
+    assert not client.connected()
+    assert client._reconnect_timer.isActive()
+    assert client._failures == 0
+
+    client._reconnect_timer.stop()
+    client._connect()
+    args, kwargs = controller._http_client.createHTTPQuery.call_args
+    kwargs["downloadProgressCallback"]({"action": "ping", "event": {}})
+    assert resync.called
+    client.stop()
+
+
+def test_http_stream_failures_backoff(client, controller):
+
+    client.start()
+    args, kwargs = controller._http_client.createHTTPQuery.call_args
+    # The stream fails before receiving anything
+    args[2]({}, error=True)
+    assert client._failures == 1
+    client.stop()
+    assert not client._reconnect_timer.isActive()
+
+
+def test_controller_disconnected(client, controller):
+
+    controller._connected = False
+    client.start()
+    assert not controller._http_client.createHTTPQuery.called
+    assert client._reconnect_timer.isActive()
+    client.stop()
+
+
+def test_stop(client, controller):
+
+    client.start()
+    stream = client._stream
+    client.stop()
+    assert stream.abort.called
+    assert client.transport() is None
+
+
+def test_websocket_fallback(client, controller):
+
+    client._websocket_supported = True
+    websocket = MagicMock()
+    with patch("gns3.qt.QtWebSockets.QWebSocket", return_value=websocket):
+        client.start()
+    assert client.transport() == NotificationClient.WEBSOCKET
+    controller._http_client.webSocketRequest.assert_called_with("/projects/test/notifications/ws")
+    assert websocket.open.called
+
+    # The controller rejects the WebSocket handshake
+    websocket.errorString.return_value = "QWebSocketPrivate::processHandshake: Unhandled http status code: 404 (Not Found)."
+    client._webSocketDisconnectedSlot(websocket)
+    assert not client._websocket_supported
+    client._reconnect_timer.stop()
+    client._connect()
+    assert client.transport() == NotificationClient.HTTP
+    client.stop()
+
+
+def test_websocket_connection_refused(client, controller):
+
+    client._websocket_supported = True
+    websocket = MagicMock()
+    websocket.errorString.return_value = "Connection refused"
+    with patch("gns3.qt.QtWebSockets.QWebSocket", return_value=websocket):
+        client.start()
+
+        # The controller is not ready, the next connection uses HTTP
+        client._webSocketDisconnectedSlot(websocket)
+        assert client._websocket_supported
+        client._reconnect_timer.stop()
+        client._connect()
+        assert client.transport() == NotificationClient.HTTP
+
+        # And the WebSocket is tried again on the following one
+        args, kwargs = controller._http_client.createHTTPQuery.call_args
+        args[2]({}, error=True)
+        client._reconnect_timer.stop()
+        client._connect()
+        assert client.transport() == NotificationClient.WEBSOCKET
+    client.stop()
+
+
+def test_websocket_message(client, controller):
+
+    client._websocket_supported = True
+    websocket = MagicMock()
+    with patch("gns3.qt.QtWebSockets.QWebSocket", return_value=websocket):
+        client.start()
+    client._webSocketConnectedSlot(websocket)
+    assert client.connected()
+    client._webSocketMessageSlot(websocket, '{"action": "ping", "event": {}}')
+    client._handler.assert_called_with({"action": "ping", "event": {}})
+    client._webSocketMessageSlot(websocket, '{"action":')
+    assert client._handler.call_count == 1
+
+    # After a disconnection the client stays on the WebSocket
+    client._webSocketDisconnectedSlot(websocket)
+    assert client._websocket_supported
+    client.stop()
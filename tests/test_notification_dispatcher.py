@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+#
+# Copyright (C) 2017 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from unittest.mock import MagicMock
+
+from gns3.notification_dispatcher import NotificationDispatcher
+
+
+def test_push_and_flush():
+    handler = MagicMock()
+    dispatcher = NotificationDispatcher(handler)
+    dispatcher.push({"action": "node.created", "event": {"node_id": "a"}})
+    dispatcher.push({"action": "log.info", "event": {"message": "hello"}})
+    assert not handler.called
+    assert dispatcher.pending() == 2
+
+    dispatcher.flush()
+    assert [c[0][0]["action"] for c in handler.call_args_list] == ["node.created", "log.info"]
+    assert dispatcher.pending() == 0
+    assert dispatcher.stats()["dispatched"] == 2
+
+
+def test_merge_updates():
+    handler = MagicMock()
+    dispatcher = NotificationDispatcher(handler)
+    dispatcher.push({"action": "node.updated", "event": {"node_id": "a", "name": "R1"}})
+    dispatcher.push({"action": "node.updated", "event": {"node_id": "b", "name": "R2"}})
+    dispatcher.push({"action": "link.created", "event": {"link_id": "l"}})
+    dispatcher.push({"action": "node.updated", "event": {"node_id": "a", "name": "R3"}})
+    dispatcher.flush()
+
+    events = [c[0][0] for c in handler.call_args_list]
+    assert [e["event"].get("name") for e in events] == ["R2", None, "R3"]
+    assert dispatcher.stats()["merged"] == 1
+
+
+def test_drop_update_of_deleted_object():
+    handler = MagicMock()
+    dispatcher = NotificationDispatcher(handler)
+    dispatcher.push({"action": "link.updated", "event": {"link_id": "l"}})
+    dispatcher.push({"action": "link.deleted", "event": {"link_id": "l"}})
+    dispatcher.flush()
+
+    assert [c[0][0]["action"] for c in handler.call_args_list] == ["link.deleted"]
+    assert dispatcher.stats()["dropped"] == 1
+
+
+def test_clear_during_flush():
+    dispatcher = None
+
+    def handler(result):
+        if result["action"] == "project.closed":
+            dispatcher.clear()
+
+    dispatcher = NotificationDispatcher(MagicMock(side_effect=handler))
+    dispatcher.push({"action": "project.closed", "event": {}})
+    dispatcher.push({"action": "node.created", "event": {"node_id": "a"}})
+    dispatcher.flush()
+
+    assert dispatcher._handler.call_count == 1
+    assert dispatcher.stats()["dropped"] == 1
+
+
+def test_handler_error_does_not_drop_batch():
+    def handler(result):
+        if result["action"] == "node.created":
+            raise ValueError("bad event")
+
+    dispatcher = NotificationDispatcher(MagicMock(side_effect=handler))
+    dispatcher.push({"action": "node.created", "event": {"node_id": "a"}})
+    dispatcher.push({"action": "link.created", "event": {"link_id": "l"}})
+    dispatcher.flush()
+
+    assert [c[0][0]["action"] for c in dispatcher._handler.call_args_list] == ["node.created", "link.created"]
+    assert dispatcher.stats()["dispatched"] == 2
+    assert dispatcher.pending() == 0
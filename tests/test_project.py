@@ -139,3 +139,25 @@ def test_project_destroy(controller):
 
     assert args[0] == "DELETE"
     assert args[1] == "/projects/{project_id}".format(project_id=project.id())
+
+
+def test_project_resync(controller):
+
+    project = Project()
+    project.setId(str(uuid4()))
+    project._closed = False
+    project._notification_client = MagicMock()
+    project._notification_dispatcher = MagicMock()
+
+    project._resyncTopology()
+    mock = controller._http_client.createHTTPQuery
+    paths = [call[0][1] for call in mock.call_args_list]
+    assert paths == ["/projects/{}/{}".format(project.id(), name) for name in ("nodes", "links", "drawings")]
+
+    node = MagicMock()
+    node.node_id.return_value = "old"
+    with patch("gns3.topology.Topology.nodes", return_value=[node]):
+        args, kwargs = mock.call_args_list[0]
+        args[2]([{"node_id": "new", "name": "PC1"}])
+    project._notification_dispatcher.push.assert_any_call({"action": "node.created", "event": {"node_id": "new", "name": "PC1"}})
+    project._notification_dispatcher.push.assert_any_call({"action": "node.deleted", "event": {"node_id": "old"}})
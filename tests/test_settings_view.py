@@ -0,0 +1,55 @@
+#!/usr/bin/env python
+#
+# Copyright (C) 2017 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import pytest
+
+from gns3.settings_view import SettingsView, SettingsListView
+
+
+def test_settings_view():
+
+    data = {"a": 1, "b": {"c": 2}, "vms": [{"name": "R1"}]}
+    view = SettingsView(data, version=42)
+    assert view.version() == 42
+    assert view["a"] == 1
+    assert view == data
+    assert data == view
+    assert isinstance(view["b"], SettingsView)
+    assert isinstance(view["vms"], SettingsListView)
+    assert view["vms"] == [{"name": "R1"}]
+    assert view["vms"][0]["name"] == "R1"
+    assert view.get("d", 3) == 3
+    assert "b" in view
+    assert len(view) == 3
+
+    with pytest.raises(TypeError):
+        view["a"] = 2
+    with pytest.raises(TypeError):
+        view["vms"][0]["name"] = "R2"
+
+
+def test_settings_view_copy():
+
+    data = {"vms": [{"name": "R1"}]}
+    view = SettingsView(data)
+    snapshot = view.copy()
+    snapshot["vms"][0]["name"] = "R2"
+    assert data["vms"][0]["name"] == "R1"
+
+    vms = view["vms"].copy()
+    vms.append({"name": "R3"})
+    assert len(data["vms"]) == 1
@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+#
+# Copyright (C) 2017 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+
+from gns3.static_cache import StaticCache
+
+
+def test_store_and_reload(tmpdir):
+    cache = StaticCache(str(tmpdir))
+    path = cache.store("/symbols/router.svg/raw", b"<svg></svg>", etag="abc", extension=".svg")
+    with open(path, "rb") as f:
+        assert f.read() == b"<svg></svg>"
+    assert cache.get("/symbols/router.svg/raw") == path
+    assert cache.isValidated("/symbols/router.svg/raw")
+    cache.save()
+
+    # A new session need to check the file with the controller
+    cache = StaticCache(str(tmpdir))
+    assert cache.get("/symbols/router.svg/raw") == path
+    assert not cache.isValidated("/symbols/router.svg/raw")
+    assert cache.validators("/symbols/router.svg/raw") == {"If-None-Match": "abc"}
+    assert cache.validators("/symbols/unknown.svg/raw") == {}
+
+
+def test_same_content_share_file(tmpdir):
+    cache = StaticCache(str(tmpdir))
+    path1 = cache.store("/a", b"data")
+    path2 = cache.store("/b", b"data")
+    assert path1 == path2
+    assert cache.size() == 4
+
+    # The file is still used by /a
+    cache.store("/b", b"new data")
+    assert os.path.exists(path1)
+
+
+def test_lru_eviction(tmpdir):
+    cache = StaticCache(str(tmpdir), max_size=10)
+    path_a = cache.store("/a", b"aaaa")
+    cache.store("/b", b"bbbb")
+    # /a is now the most recently used
+    cache.get("/a")
+    cache.store("/c", b"cccc")
+
+    assert cache.get("/b") is None
+    assert cache.get("/a") == path_a
+    assert cache.get("/c") is not None
+    assert cache.size() == 8
+    assert len(os.listdir(str(tmpdir))) == 2
@@ -0,0 +1,43 @@
+#!/usr/bin/env python
+#
+# Copyright (C) 2017 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from gns3.symbol_renderer_pool import SymbolRendererPool
+
+
+def test_acquire_release():
+    pool = SymbolRendererPool()
+    renderer = pool.acquire(":/icons/cancel.svg")
+    assert pool.acquire(":/icons/cancel.svg") is renderer
+    assert pool.references(":/icons/cancel.svg") == 2
+    assert pool.alive() == 1
+
+    pool.release(renderer)
+    assert pool.alive() == 1
+    pool.release(renderer)
+    assert pool.alive() == 0
+    assert pool.references(":/icons/cancel.svg") == 0
+
+    # A released renderer is not released twice
+    pool.release(renderer)
+    assert pool.acquire(":/icons/cancel.svg") is not renderer
+    assert pool.references(":/icons/cancel.svg") == 1
+
+
+def test_placeholder():
+    pool = SymbolRendererPool()
+    assert pool.placeholder() is pool.placeholder()
+    assert pool.alive() == 0
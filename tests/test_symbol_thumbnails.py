@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+#
+# Copyright (C) 2017 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import time
+from unittest.mock import patch
+
+from gns3.qt import QtCore
+from gns3.symbol_thumbnails import renderThumbnail, SymbolThumbnails
+
+
+SVG = '<svg xmlns="http://www.w3.org/2000/svg" width="10" height="10"><rect width="10" height="10" fill="red"/></svg>'
+
+
+def write_symbol(tmpdir, name="router.svg", content=SVG):
+
+    path = str(tmpdir / name)
+    with open(path, "w") as f:
+        f.write(content)
+    return path
+
+
+def test_render_thumbnail(tmpdir):
+
+    path = write_symbol(tmpdir)
+    directory = str(tmpdir / "thumbnails")
+    image = renderThumbnail(path, 64, directory)
+    assert image.width() == 64
+    assert image.height() == 64
+    assert len(os.listdir(directory)) == 1
+
+    # The thumbnail is read from the disk
+    with patch("gns3.symbol_thumbnails.QImageSvgRenderer") as mock:
+        image = renderThumbnail(path, 64, directory)
+        assert not mock.called
+    assert image.width() == 64
+
+    # Same content, same thumbnail
+    renderThumbnail(write_symbol(tmpdir, "copy.svg"), 64, directory)
+    assert len(os.listdir(directory)) == 1
+
+
+def test_render_thumbnail_missing_file(tmpdir):
+
+    assert renderThumbnail(str(tmpdir / "missing.svg"), 64, str(tmpdir)) is None
+
+
+def test_symbol_thumbnails(tmpdir):
+
+    path = write_symbol(tmpdir)
+    thumbnails = SymbolThumbnails(str(tmpdir / "thumbnails"))
+    ready = []
+    thumbnails.thumbnail_ready_signal.connect(lambda path: ready.append(path))
+    assert thumbnails.request(path) is None
+    assert thumbnails.waitForDone(5000)
+    # The rendered signal is queued to the GUI thread
+    deadline = time.monotonic() + 5
+    while not ready and time.monotonic() < deadline:
+        QtCore.QCoreApplication.processEvents()
+    assert ready == [path]
+    assert thumbnails.thumbnail(path).width() == 64
+    # Already rendered
+    assert thumbnails.request(path) is thumbnails.thumbnail(path)
@@ -19,6 +19,8 @@ import uuid
 from unittest.mock import MagicMock
 
 from gns3.topology import Topology
+from gns3.link import Link
+from gns3.ports.ethernet_port import EthernetPort
 
 
 def test_topology_init():
@@ -34,6 +36,52 @@ def test_topology_node(vpcs_device):
     assert len(topology.nodes()) == 0
 
 
+def test_getNodeFromUuid(vpcs_device):
+    topology = Topology()
+    topology.addNode(vpcs_device)
+    assert topology.getNodeFromUuid(vpcs_device.node_id()) == vpcs_device
+    assert topology.getNodeFromUuid(str(uuid.uuid4())) is None
+    topology.removeNode(vpcs_device)
+    assert topology.getNodeFromUuid(vpcs_device.node_id()) is None
+    assert topology.getNode(vpcs_device.id()) is None
+
+
+def test_topology_link(vpcs_device, controller):
+    topology = Topology()
+    source_port = EthernetPort("E0")
+    destination_port = EthernetPort("E1")
+    destination_port.setPortNumber(1)
+    vpcs_device._ports = [source_port, destination_port]
+
+    link = Link(vpcs_device, source_port, vpcs_device, destination_port)
+    assert topology.addLink(link)
+    assert topology.getLink(link.id()) == link
+
+    # The controller gives us the final link identifier
+    link_id = str(uuid.uuid4())
+    link._linkCreatedCallback({"link_id": link_id, "capture_file_path": None})
+    assert topology.getLinkFromUuid(link_id) == link
+
+    # A second link on the same port is refused
+    duplicate = Link(vpcs_device, destination_port, vpcs_device, source_port)
+    assert not topology.addLink(duplicate)
+
+    topology.removeLink(link)
+    assert topology.getLink(link.id()) is None
+    assert topology.getLinkFromUuid(link_id) is None
+    assert topology.addLink(duplicate)
+
+
+def test_getDrawingFromUuid():
+    topology = Topology()
+    drawing = MagicMock()
+    drawing.drawing_id.return_value = str(uuid.uuid4())
+    topology.addDrawing(drawing)
+    assert topology.getDrawingFromUuid(drawing.drawing_id()) == drawing
+    topology.removeDrawing(drawing)
+    assert topology.getDrawingFromUuid(drawing.drawing_id()) is None
+
+
 def test_createDrawing_ellipse():
     topology = Topology()
     shape_data = {
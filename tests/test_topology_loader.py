@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+#
+# Copyright (C) 2017 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+from gns3.topology_loader import TopologyLoader
+
+
+@pytest.fixture
+def topology():
+    """
+    Fake topology keeping the created identifiers
+    """
+
+    topology = MagicMock()
+    topology.nodes = {}
+    topology.links = {}
+    topology.drawings = {}
+    topology.getNodeFromUuid.side_effect = lambda node_id: topology.nodes.get(node_id)
+    topology.getLinkFromUuid.side_effect = lambda link_id: topology.links.get(link_id)
+    topology.getDrawingFromUuid.side_effect = lambda drawing_id: topology.drawings.get(drawing_id)
+    topology.createNode.side_effect = lambda data: topology.nodes.__setitem__(data["node_id"], data)
+    topology.createLink.side_effect = lambda data: topology.links.__setitem__(data["link_id"], data)
+    topology.createDrawing.side_effect = lambda data: topology.drawings.__setitem__(data["drawing_id"], data)
+    with patch("gns3.topology.Topology.instance", return_value=topology):
+        yield topology
+
+
+def link(link_id, *node_ids):
+    return {"link_id": link_id, "nodes": [{"node_id": node_id} for node_id in node_ids]}
+
+
+def test_start():
+    project = MagicMock()
+    loader = TopologyLoader(project)
+    loader.start()
+    assert loader.isRunning()
+    assert [c[0][0] for c in project.get.call_args_list] == ["/nodes", "/links", "/drawings"]
+
+
+def test_load_by_chunks(topology):
+    loader = TopologyLoader(MagicMock(), chunk_size=2)
+    loader.start()
+    progress = []
+    loader.progress_signal.connect(lambda created, total: progress.append((created, total)))
+    finished = MagicMock()
+    loader.finished_signal.connect(finished)
+
+    loader._listCallback("nodes", [{"node_id": "n1"}, {"node_id": "n2"}, {"node_id": "n3"}])
+    loader._listCallback("drawings", [{"drawing_id": "d1"}])
+    loader._processChunk()
+    assert list(topology.nodes) == ["n1", "n2"]
+
+    loader._listCallback("links", [link("l1", "n1", "n3")])
+    loader._processChunk()
+    loader._processChunk()
+    assert list(topology.drawings) == ["d1"]
+    assert list(topology.links) == ["l1"]
+    assert loader.isRunning() is False
+    assert finished.called
+    assert progress[-1] == (5, 5)
+
+
+def test_link_waits_for_its_nodes(topology):
+    loader = TopologyLoader(MagicMock())
+    loader.start()
+    loader._listCallback("drawings", [])
+    loader._listCallback("links", [link("l1", "n1", "n2")])
+    loader._processChunk()
+    assert not topology.createLink.called
+
+    loader._listCallback("nodes", [{"node_id": "n1"}, {"node_id": "n2"}])
+    loader._processChunk()
+    assert list(topology.links) == ["l1"]
+    assert loader.isRunning() is False
+
+
+def test_existing_items_are_not_created_again(topology):
+    topology.nodes["n1"] = {"node_id": "n1"}
+    loader = TopologyLoader(MagicMock())
+    loader.start()
+    loader._listCallback("nodes", [{"node_id": "n1"}])
+    loader._listCallback("links", [])
+    loader._listCallback("drawings", [])
+    loader._processChunk()
+    assert not topology.createNode.called
+
+
+def test_cancel(topology):
+    loader = TopologyLoader(MagicMock())
+    loader.start()
+    loader._listCallback("nodes", [{"node_id": "n1"}])
+    loader.cancel()
+    loader._listCallback("links", [])
+    loader._processChunk()
+    assert not topology.createNode.called
+    assert loader.isRunning() is False
@@ -0,0 +1,151 @@
+#!/usr/bin/env python
+#
+# Copyright (C) 2017 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from unittest.mock import MagicMock
+
+from gns3.qt import QtCore, FakeQtSignal
+from gns3.node import Node
+from gns3.topology_summary_view import TopologySummaryModel, TopologySummaryProxyModel
+
+
+def fake_node(node_id, name):
+
+    node = MagicMock()
+    node.id.return_value = node_id
+    node.name.return_value = name
+    node.status.return_value = Node.stopped
+    node.links.return_value = set()
+    for signal in ("created_signal", "started_signal", "stopped_signal", "suspended_signal", "updated_signal", "deleted_signal"):
+        setattr(node, signal, FakeQtSignal())
+    return node
+
+
+def fake_link(source, destination, capturing=False):
+
+    link = MagicMock()
+    link.initialized.return_value = True
+    link.capturing.return_value = capturing
+    link.sourceNode.return_value = source
+    link.destinationNode.return_value = destination
+
+    def getNodePort(node):
+        peer = destination if node is source else source
+        port = MagicMock()
+        port.shortName.return_value = "e0"
+        port.description.return_value = "to {}".format(peer.name())
+        return port
+
+    link.getNodePort.side_effect = getNodePort
+    source.links.return_value.add(link)
+    destination.links.return_value.add(link)
+    return link
+
+
+def rows(model, parent=QtCore.QModelIndex()):
+
+    return [model.index(row, 0, parent).data() for row in range(model.rowCount(parent))]
+
+
+def test_add_node_and_link():
+
+    model = TopologySummaryModel()
+    pc1 = fake_node(1, "PC1")
+    pc2 = fake_node(2, "PC2")
+    model.addNode(pc1)
+    model.addNode(pc2)
+    # Ignored, already in the model
+    model.addNode(pc1)
+    assert rows(model) == ["PC1", "PC2"]
+
+    link = fake_link(pc1, pc2)
+    model.refreshLink(link)
+    assert rows(model, model.nodeIndex(pc1)) == ["e0 to PC2"]
+    assert rows(model, model.nodeIndex(pc2)) == ["e0 to PC1"]
+    index = model.index(0, 0, model.nodeIndex(pc1))
+    assert index.parent() == model.nodeIndex(pc1)
+    assert index.data(TopologySummaryModel.LinkRole) is link
+    assert index.data(TopologySummaryModel.NodeRole) is pc1
+
+    model.removeLink(link)
+    assert model.rowCount(model.nodeIndex(pc1)) == 0
+    assert model.rowCount(model.nodeIndex(pc2)) == 0
+
+
+def test_rename_node_updates_rows():
+
+    model = TopologySummaryModel()
+    pc1 = fake_node(1, "PC1")
+    pc2 = fake_node(2, "PC2")
+    model.addNode(pc1)
+    model.addNode(pc2)
+    model.refreshLink(fake_link(pc1, pc2))
+
+    changed = []
+    model.dataChanged.connect(lambda top_left, bottom_right, roles=[]: changed.append(top_left.data()))
+    pc1.name.return_value = "R1"
+    pc1.updated_signal.emit()
+    assert model.nodeIndex(pc1).data() == "R1"
+    assert rows(model, model.nodeIndex(pc2)) == ["e0 to R1"]
+    # Only the rows which have changed
+    assert changed == ["R1", "e0 to R1"]
+
+
+def test_status_and_remove_node():
+
+    model = TopologySummaryModel()
+    pc1 = fake_node(1, "PC1")
+    pc2 = fake_node(2, "PC2")
+    pc3 = fake_node(3, "PC3")
+    for node in (pc1, pc2, pc3):
+        model.addNode(node)
+
+    changed = []
+    model.dataChanged.connect(lambda top_left, bottom_right, roles=[]: changed.append((top_left.row(), roles)))
+    pc2.status.return_value = Node.started
+    pc2.started_signal.emit()
+    assert changed == [(1, [QtCore.Qt.DecorationRole])]
+
+    pc1.deleted_signal.emit(1)
+    assert rows(model) == ["PC2", "PC3"]
+    assert model.nodeIndex(pc3).row() == 1
+    assert not model.nodeIndex(pc1).isValid()
+
+
+def test_proxy_sort_and_capture_filter():
+
+    model = TopologySummaryModel()
+    proxy = TopologySummaryProxyModel()
+    proxy.setSourceModel(model)
+    proxy.sort(0)
+    nodes = [fake_node(node_id, name) for node_id, name in enumerate(["PC10", "PC2", "PC1"], start=1)]
+    for node in nodes:
+        model.addNode(node)
+    assert rows(proxy) == ["PC1", "PC2", "PC10"]
+
+    link = fake_link(nodes[0], nodes[1])
+    model.refreshLink(link)
+    proxy.setShowOnlyDevicesWithCapture(True)
+    assert rows(proxy) == []
+
+    link.capturing.return_value = True
+    model.refreshLink(link)
+    assert rows(proxy) == ["PC2", "PC10"]
+
+    model.removeLink(link)
+    assert rows(proxy) == []
+    proxy.setShowOnlyDevicesWithCapture(False)
+    assert rows(proxy) == ["PC1", "PC2", "PC10"]
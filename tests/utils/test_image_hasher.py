@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2017 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import os
+import hashlib
+import threading
+import pytest
+
+from gns3.utils.image_hasher import ImageHasher, HashCancelledError, md5sum_file, read_md5sum_file
+
+
+@pytest.fixture
+def images(tmpdir):
+    paths = []
+    for i in range(3):
+        path = str(tmpdir / "image{}.img".format(i))
+        with open(path, "wb") as f:
+            f.write(os.urandom(1024 * (i + 1)))
+        paths.append(path)
+    return paths
+
+
+def md5(path):
+    with open(path, "rb") as f:
+        return hashlib.md5(f.read()).hexdigest()
+
+
+def test_md5sum_file(images):
+    assert md5sum_file(images[2], block_size=100) == md5(images[2])
+
+
+def test_md5sum_file_cancelled(images):
+    cancel_event = threading.Event()
+    cancel_event.set()
+    with pytest.raises(HashCancelledError):
+        md5sum_file(images[0], cancel_event=cancel_event)
+
+
+def test_image_hasher(images):
+    hashed = []
+    progress = []
+    hasher = ImageHasher(images + ["/not/found"], max_workers=2)
+    hasher.file_hashed_signal.connect(lambda path, md5sum: hashed.append(path))
+    hasher.updated.connect(lambda value: progress.append(value))
+    results = hasher.run()
+
+    assert results == {path: md5(path) for path in images}
+    assert sorted(hashed) == sorted(images)
+    assert progress[-1] == 100
+    for path in images:
+        assert read_md5sum_file(path) == md5(path)
+
+
+def test_image_hasher_cancel(images):
+    hasher = ImageHasher(images)
+    hasher.cancel()
+    assert hasher.run() == {}
+    assert not os.path.exists(images[0] + ".md5sum")
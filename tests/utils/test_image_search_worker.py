@@ -0,0 +1,43 @@
+#!/usr/bin/env python
+#
+# Copyright (C) 2017 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from unittest.mock import MagicMock
+
+from gns3.utils.image_search_worker import ImageSearchWorker
+
+
+def test_image_search_worker():
+    registry = MagicMock()
+    registry.search_image_file.side_effect = lambda emulator, filename, md5sum, size, **kwargs: filename if filename == "a" else None
+    images = [{"filename": "a", "md5sum": None}, {"filename": "b", "md5sum": None}]
+    worker = ImageSearchWorker(registry, "qemu", images)
+    finished = MagicMock()
+    worker.finished.connect(finished)
+    worker.run()
+
+    assert worker.results() == {0: "a", 1: None}
+    assert finished.called
+
+
+def test_image_search_worker_cancel():
+    registry = MagicMock()
+    worker = ImageSearchWorker(registry, "qemu", [{"filename": "a"}])
+    worker.cancel()
+    worker.run()
+
+    assert worker.results() == {}
+    assert not registry.search_image_file.called
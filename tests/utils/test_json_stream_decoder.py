@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2017 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import json
+import random
+
+from gns3.utils.json_stream_decoder import JSONStreamDecoder
+
+
+def test_feed_complete_objects():
+    decoder = JSONStreamDecoder()
+    assert decoder.feed(b'{"action": "ping"}\n{"action": "node.updated", "event": {"a": [1, 2]}}') == [
+        {"action": "ping"},
+        {"action": "node.updated", "event": {"a": [1, 2]}}
+    ]
+    assert decoder.pending() == 0
+
+
+def test_feed_partial_object():
+    decoder = JSONStreamDecoder()
+    assert decoder.feed(b'{"action": "pi') == []
+    assert decoder.feed(b'ng"}\n{"a": "b"') == [{"action": "ping"}]
+    assert decoder.pending() == len(b'{"a": "b"')
+    assert decoder.feed(b'}') == [{"a": "b"}]
+
+
+def test_feed_strings_with_structure_characters():
+    decoder = JSONStreamDecoder()
+    data = json.dumps({"message": "a } b { \" \\ ]["}).encode()
+    assert decoder.feed(data[:12]) == []
+    assert decoder.feed(data[12:]) == [{"message": "a } b { \" \\ ]["}]
+
+
+def test_feed_escape_split_between_chunks():
+    decoder = JSONStreamDecoder()
+    assert decoder.feed(b'{"a": "\\') == []
+    assert decoder.feed(b'"}"}') == [{"a": '"}'}]
+
+
+def test_feed_utf8_split_between_chunks():
+    decoder = JSONStreamDecoder()
+    data = json.dumps({"name": "Routeur é"}, ensure_ascii=False).encode("utf-8")
+    index = data.index(b"\xc3") + 1
+    assert decoder.feed(data[:index]) == []
+    assert decoder.feed(data[index:]) == [{"name": "Routeur é"}]
+
+
+def test_feed_invalid_object():
+    decoder = JSONStreamDecoder()
+    assert decoder.feed(b'{"a": b}{"c": 1}') == [{"c": 1}]
+
+
+def test_feed_random_chunks():
+    objects = [{"action": "node.updated", "event": {"node_id": str(i), "name": "R{}".format(i), "ports": list(range(i % 10))}} for i in range(200)]
+    data = "\n".join(json.dumps(o) for o in objects).encode()
+
+    decoder = JSONStreamDecoder(compact_size=128)
+    decoded = []
+    position = 0
+    while position < len(data):
+        size = random.randint(1, 200)
+        decoded.extend(decoder.feed(data[position:position + size]))
+        position += size
+    assert decoded == objects
+    assert decoder.pending() == 0
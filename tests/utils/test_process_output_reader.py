@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+#
+# Copyright (C) 2017 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import io
+from unittest.mock import patch
+
+from gns3.utils.process_output_reader import ProcessOutputReader
+
+
+def test_ring_buffer():
+
+    stream = io.BytesIO("".join("line {}\n".format(i) for i in range(100)).encode())
+    reader = ProcessOutputReader(stream, "test", max_lines=10, log_rate=0)
+    reader.start()
+    reader.join()
+    assert reader.received() == 100
+    assert reader.lines() == ["line {}".format(i) for i in range(90, 100)]
+    assert reader.text().startswith("line 90\nline 91")
+
+
+def test_invalid_utf8():
+
+    reader = ProcessOutputReader(io.BytesIO(b"caf\xe9\r\n"), "test", log_rate=0)
+    reader.start()
+    reader.join()
+    assert reader.lines() == ["caf�"]
+
+
+def test_log_rate_limit():
+
+    stream = io.BytesIO("".join("line {}\n".format(i) for i in range(100)).encode())
+    reader = ProcessOutputReader(stream, "Local server", log_rate=4)
+    reader._thread.start()
+    reader._thread.join()
+
+    with patch("gns3.utils.process_output_reader.log") as log:
+        reader.flushLog()
+    messages = [call[0][0] for call in log.info.call_args_list]
+    # 2 lines by interval of 500 ms, the lines older than 5 seconds are not logged
+    assert messages == ["Local server: line 80",
+                        "Local server: line 81",
+                        "Local server: 80 lines not logged, export the debug information to get them"]
+
+    with patch("gns3.utils.process_output_reader.log") as log:
+        reader.join()
+    # The remaining lines are logged when the process stops
+    assert log.info.call_count == 18
+    assert reader.lines()[-1] == "line 99"
@@ -0,0 +1,144 @@
+#!/usr/bin/env python
+#
+# Copyright (C) 2017 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import pytest
+from unittest.mock import MagicMock
+
+from gns3.qt import QtNetwork, QtCore
+from gns3.utils.server_probe import ServerProbe
+
+
+def reply(status=200, data=b'{"version": "2.0.0", "local": true}', content_type="application/json"):
+
+    mock = MagicMock()
+    mock.attribute.return_value = status
+    mock.header.return_value = content_type
+    mock.readAll.return_value = QtCore.QByteArray(data)
+    mock.errorString.return_value = "Connection refused"
+    return mock
+
+
+@pytest.fixture
+def network_manager():
+
+    return MagicMock()
+
+
+def test_probe_ready(network_manager):
+
+    probe = ServerProbe("http", "127.0.0.1", 3080, network_manager=network_manager)
+    finished = MagicMock()
+    probe.finished.connect(finished)
+    network_manager.get.return_value = reply()
+    probe.run()
+
+    request = network_manager.get.call_args[0][0]
+    assert request.url() == QtCore.QUrl("http://127.0.0.1:3080/v2/version")
+    probe._replyFinishedSlot(network_manager.get.return_value)
+    assert finished.called
+    assert probe.done()
+    assert probe.isGNS3Server()
+    assert probe.result() == (200, {"version": "2.0.0", "local": True})
+
+
+def test_probe_auth(network_manager):
+
+    probe = ServerProbe("http", "::1", 3080, user="admin", password="secret", network_manager=network_manager)
+    network_manager.get.return_value = reply(status=401, data=b"")
+    probe.run()
+    request = network_manager.get.call_args[0][0]
+    assert request.url() == QtCore.QUrl("http://[::1]:3080/v2/version")
+    assert bytes(request.rawHeader(b"Authorization")) == b"Basic YWRtaW46c2VjcmV0"
+    probe._replyFinishedSlot(network_manager.get.return_value)
+    # An authentication issue is solved later
+    assert probe.isGNS3Server()
+
+
+def test_probe_single_attempt(network_manager):
+
+    probe = ServerProbe("http", "127.0.0.1", 3080, max_attempts=1, network_manager=network_manager)
+    error = MagicMock()
+    probe.error.connect(error)
+    network_manager.get.return_value = reply(status=None)
+    probe.run()
+    probe._replyFinishedSlot(network_manager.get.return_value)
+    assert probe.done()
+    assert not probe.isGNS3Server()
+    assert probe.result() == (0, None)
+    error.assert_called_with("Could not connect to 127.0.0.1 on port 3080: Connection refused", True)
+
+
+def test_probe_backoff(network_manager):
+
+    probe = ServerProbe("http", "127.0.0.1", 3080, network_manager=network_manager)
+    network_manager.get.return_value = reply(status=200, data=b'{"hello": "world"}')
+    probe.run()
+    intervals = []
+    for _ in range(8):
+        probe._replyFinishedSlot(network_manager.get.return_value)
+        assert not probe.done()
+        assert probe._retry_timer.isActive()
+        intervals.append(probe._retry_timer.interval())
+        probe._retry_timer.stop()
+        probe._attempt()
+    assert intervals == [25, 50, 100, 200, 400, 800, 1000, 1000]
+    assert probe.attempts() == 9
+    probe.cancel()
+    assert network_manager.get.return_value.abort.called
+
+
+def test_probe_pid_file(network_manager, tmpdir):
+
+    pid_path = str(tmpdir / "gns3_server.pid")
+    probe = ServerProbe("http", "127.0.0.1", 3080, pid_path=pid_path, network_manager=network_manager)
+    network_manager.get.return_value = reply(status=None)
+    probe.run()
+    for _ in range(4):
+        probe._replyFinishedSlot(network_manager.get.return_value)
+        probe._retry_timer.stop()
+        probe._attempt()
+    with open(pid_path, "w+") as f:
+        f.write("42")
+    probe._replyFinishedSlot(network_manager.get.return_value)
+    # The server is starting, the backoff starts again
+    assert probe._retry_timer.interval() == 25
+    probe.cancel()
+
+
+def test_probe_process_stopped(network_manager):
+
+    process = MagicMock()
+    process.poll.return_value = 1
+    process.returncode = 1
+    probe = ServerProbe("http", "127.0.0.1", 3080, process=process, network_manager=network_manager)
+    error = MagicMock()
+    probe.error.connect(error)
+    probe.run()
+    assert not network_manager.get.called
+    error.assert_called_with("Could not connect to 127.0.0.1 on port 3080: The local server process has stopped (exit code 1)", True)
+
+
+def test_probe_timeout(network_manager):
+
+    probe = ServerProbe("http", "127.0.0.1", 3080, timeout=0, network_manager=network_manager)
+    error = MagicMock()
+    probe.error.connect(error)
+    network_manager.get.return_value = reply(status=None)
+    probe.run()
+    probe._replyFinishedSlot(network_manager.get.return_value)
+    assert probe.done()
+    assert error.called
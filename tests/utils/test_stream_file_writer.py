@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+#
+# Copyright (C) 2017 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import hashlib
+import pytest
+from unittest.mock import MagicMock
+
+from gns3.utils.stream_file_writer import StreamFileWriter
+from gns3.utils.export_project_worker import ExportProjectWorker
+
+
+def test_write(tmpdir):
+    path = str(tmpdir / "test.gns3project")
+    with open(path, "wb") as f:
+        f.write(b"old content which is longer")
+
+    writer = StreamFileWriter(path, block_size=4, max_blocks=2)
+    for chunk in (b"hello", b" ", b"world"):
+        writer.write(chunk)
+    writer.close()
+
+    with open(path, "rb") as f:
+        assert f.read() == b"hello world"
+    assert writer.bytesWritten() == 11
+    assert writer.md5sum() == hashlib.md5(b"hello world").hexdigest()
+
+
+def test_write_error(tmpdir):
+    path = str(tmpdir / "test.gns3project")
+    writer = StreamFileWriter(path, block_size=1)
+    writer._file.close()
+    writer._file = MagicMock()
+    writer._file.write.side_effect = OSError("No space left on device")
+    writer.write(b"a")
+    with pytest.raises(OSError):
+        writer.close()
+
+
+def test_abort(tmpdir):
+    path = str(tmpdir / "test.gns3project")
+    writer = StreamFileWriter(path)
+    writer.write(b"hello")
+    writer.abort()
+    assert not os.path.exists(path)
+
+
+def test_export_project_worker(tmpdir):
+    path = str(tmpdir / "test.gns3project")
+    project = MagicMock()
+    worker = ExportProjectWorker(project, path, False)
+    finished = MagicMock()
+    worker.finished.connect(finished)
+    worker.run()
+
+    args, kwargs = project.get.call_args
+    assert args[0] == "/export?include_images=False"
+    kwargs["downloadProgressCallback"](b"hello")
+    kwargs["downloadProgressCallback"](b" world")
+    args[1]({})
+
+    assert finished.called
+    with open(path, "rb") as f:
+        assert f.read() == b"hello world"
+
+
+def test_export_project_worker_error(tmpdir):
+    path = str(tmpdir / "test.gns3project")
+    project = MagicMock()
+    worker = ExportProjectWorker(project, path, False)
+    error = MagicMock()
+    worker.error.connect(error)
+    worker.run()
+
+    args, kwargs = project.get.call_args
+    kwargs["downloadProgressCallback"](b"hello")
+    args[1]({"message": "Export failed"}, error=True)
+
+    error.assert_called_with("Export failed", True)
+    assert not os.path.exists(path)